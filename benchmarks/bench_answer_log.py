@@ -0,0 +1,91 @@
+# Exercises the answer log against the local stub endpoint:
+#
+#   record()   cost per call on the calling (UI) thread
+#   batching   how many POSTs a burst of answers turns into
+#   outage     uploads failing for a while, then recovering (backoff + retry)
+#   restart    answers logged by a run that never reached the server are
+#              uploaded by the next run
+#
+# Run from the repo root:
+#   python benchmarks/bench_answer_log.py [answers]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import answer_log  # noqa: E402
+from mcq.stub_server import StubBankServer  # noqa: E402
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def _record(log, n, start=0):
+    for i in range(start, start + n):
+        log.record("Fungi", i + 1, "ABCD"[i % 4], i % 3 == 0, 1234.5)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    answer_log.BACKOFF_BASE = 0.05  # keep the outage short
+
+    with tempfile.TemporaryDirectory() as tmp, StubBankServer() as server, \
+            contextlib.redirect_stdout(io.StringIO()):
+        path = os.path.join(tmp, "answers.jsonl")
+
+        # record() cost: nothing runs in the background here
+        log = answer_log.AnswerLog(path, "device-1", server.url, flush_seconds=3600)
+        t0 = time.perf_counter()
+        _record(log, n)
+        per_call_us = (time.perf_counter() - t0) / n * 1e6
+        log.flush()
+        log_bytes = os.path.getsize(path)
+
+        # batching: the whole burst goes up in batch_size chunks
+        log.start()
+        log._wake.set()
+        batched = _wait_for(lambda: len(server.answers) == n)
+        posts = sum(1 for r in server.requests if r["params"].get("action") == "answers")
+        log.stop()
+        drained = os.path.getsize(path)
+
+        # outage: three failed uploads, then recovery
+        log = answer_log.AnswerLog(path, "device-1", server.url, flush_seconds=0.02).start()
+        server.fail_posts = 3
+        _record(log, 100, start=n)
+        recovered = _wait_for(lambda: len(server.answers) == n + 100)
+        failures = log.stats["upload_failures"]
+        log.stop()
+
+        # restart: a run that can't reach the server, then one that can
+        offline = answer_log.AnswerLog(path, "device-1", "http://127.0.0.1:9/exec",
+                                       flush_seconds=0.02, timeout=(0.2, 0.2)).start()
+        _record(offline, 50, start=n + 100)
+        offline.stop()
+        left_on_disk = offline.pending()[0]
+        resumed = answer_log.AnswerLog(path, "device-1", server.url, flush_seconds=0.02).start()
+        restarted = _wait_for(lambda: len(server.answers) == n + 150)
+        resumed.stop()
+
+        ids = [a["id"] for a in server.answers]
+
+    print(f"record():        {per_call_us:.2f} us per answer ({log_bytes / n:.0f} bytes on disk)")
+    print(f"batching:        {n} answers -> {posts} POSTs, all received: {batched}, "
+          f"log after drain: {drained} bytes")
+    print(f"outage:          {failures} failed uploads, all received after recovery: {recovered}")
+    print(f"restart:         {len(left_on_disk)} answers left by the offline run, "
+          f"all received after restart: {restarted}")
+    print(f"duplicates:      {len(ids) - len(set(ids))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Compares cold .ods parsing (pandas + odfpy, and the streaming reader) with a
+# compiled-cache hit.
+#
+# Run from the repo root:
+#   python benchmarks/bench_bank_cache.py [path/to/bank.ods] [repeats]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import bank_cache, loaders  # noqa: E402
+
+FILE_PATH = "src/MCQ_files/mcq_algae.ods"
+
+
+def _time(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else FILE_PATH
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = _time(lambda: loaders.parse_spreadsheet_pandas(filepath), repeats)
+        stream = _time(lambda: loaders.parse_spreadsheet(filepath), repeats)
+
+        # first call compiles the cache, the timed calls are all hits
+        n = len(bank_cache.load_cached_bank(filepath, loaders.parse_spreadsheet, cache_dir))
+        hit = _time(
+            lambda: bank_cache.load_cached_bank(filepath, loaders.parse_spreadsheet, cache_dir),
+            repeats,
+        )
+        size = os.path.getsize(bank_cache.cache_path_for(filepath, cache_dir))
+
+    print(f"bank:          {filepath} ({n} questions)")
+    print(f"cold parse:    {cold * 1000:9.2f} ms  (pandas)")
+    print(f"stream parse:  {stream * 1000:9.2f} ms")
+    print(f"cache hit:     {hit * 1000:9.2f} ms")
+    print(f"speedup:       {cold / hit:9.1f}x over pandas")
+    print(f"cache size:    {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Bulk import of a folder of spreadsheets: wall time with 1 process against
+# one per core, the summed per-file time, and the re-run where every
+# compiled bank is already fresh. Half the files are .ods, half .xlsx, in a
+# few sizes; every 50th row has a bad answer key and one file lacks a column.
+#
+# Run from the repo root:
+#   python benchmarks/bench_bulk_import.py [files] [rows per file]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows, write_ods, write_xlsx  # noqa: E402
+from mcq import bulk_import  # noqa: E402
+
+
+def _run(folder, jobs, cache_dir, force=True):
+    t0 = time.perf_counter()
+    results = bulk_import.import_all([folder], jobs, cache_dir, force)
+    return time.perf_counter() - t0, bulk_import.report(results, 0, jobs)["summary"], results
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n_files = args[0] if args else 24
+    rows_per_file = args[1] if len(args) > 1 else 5_000
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "banks")
+        os.makedirs(os.path.join(folder, "nested"))
+        for i in range(n_files):
+            rows = make_rows(rows_per_file * (1 + i % 3) // 2, seed=i, invalid_every=50)
+            write = write_ods if i % 2 else write_xlsx
+            sub = "nested" if i % 4 == 0 else ""
+            write(os.path.join(folder, sub, f"bank{i}.{'ods' if i % 2 else 'xlsx'}"), rows)
+        write_ods(os.path.join(folder, "broken.ods"), [r[:5] for r in make_rows(100)])
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, fs in os.walk(folder) for f in fs)
+
+        print(f"{n_files + 1} files, {size / 1e6:.1f} MB; {cores} core(s)")
+        for jobs in sorted({1, 2, cores}):
+            cache_dir = os.path.join(tmp, f"cache-{jobs}")
+            seconds, summary, results = _run(folder, jobs, cache_dir)
+            per_file = sum(r["seconds"] for r in results)
+            print(f"jobs={jobs}: {seconds:6.2f} s wall, {per_file:6.2f} s summed per file, "
+                  f"{summary['questions'] / seconds:8.0f} questions/s; "
+                  f"{summary['imported']} imported, {summary['failed']} failed, "
+                  f"{summary['rejected_rows']} rows rejected")
+        seconds, summary, _ = _run(folder, cores, os.path.join(tmp, f"cache-{cores}"), force=False)
+        print(f"re-run, all fresh: {seconds:6.2f} s ({summary['skipped']} skipped)")
+
+
+if __name__ == "__main__":
+    main()
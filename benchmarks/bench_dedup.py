@@ -0,0 +1,100 @@
+# Near-duplicate detection on a large synthetic bank: ~90% unique questions
+# drawn from a Zipf-distributed vocabulary plus ~10% planted near-duplicates
+# of earlier questions (options shuffled, one word changed or added, case
+# changed). Reports the time per stage, the recall of the planted pairs,
+# clusters that aren't planted, and what checking every pair would cost.
+#
+# Run from the repo root:
+#   python benchmarks/bench_dedup.py [bank size]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_search import _zipf_rows  # noqa: E402
+from mcq import dedup, loaders  # noqa: E402
+
+
+def _mutate(row, rng, vocab):
+    text = row[1].split()
+    change = rng.randrange(3)
+    if change == 0:
+        text[rng.randrange(len(text))] = f"w{rng.randrange(vocab)}"
+    elif change == 1:
+        text.insert(rng.randrange(len(text) + 1), f"w{rng.randrange(vocab)}")
+    else:
+        text = [w.upper() if rng.random() < 0.5 else w for w in text]
+    options = row[2:6]
+    rng.shuffle(options)
+    return [row[0], " ".join(text), *options, row[6]]
+
+
+def _planted_rows(n, dup_share=0.1, seed=1):
+    rng = random.Random(seed)
+    unique = n - int(n * dup_share)
+    rows = _zipf_rows(unique, vocab=50_000)
+    planted = []
+    for _ in range(n - unique):
+        original = rng.randrange(1, unique + 1)
+        rows.append(_mutate(list(rows[original]), rng, 50_000))
+        planted.append((original - 1, len(rows) - 2))
+    for qn, row in enumerate(rows[1:], start=1):
+        row[0] = qn
+    return rows, planted
+
+
+def _ms(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rows, planted = _planted_rows(n)
+    bank = loaders.questions_from_payload(rows)
+    qns, texts, options, _, _ = bank.compact()
+
+    shingle_ms, sets = _ms(lambda: [dedup.shingles(texts[i], options[i * 4:i * 4 + 4])
+                                    for i in range(len(qns))])
+    sig_ms, sig = _ms(lambda: dedup.signatures(sets))
+    lsh_ms, pairs = _ms(lambda: dedup.candidate_pairs(sig))
+    verify_ms, _ = _ms(lambda: sum(1 for x, y in pairs
+                                   if dedup.jaccard(sets[x], sets[y]) >= dedup.THRESHOLD))
+    total_ms, clusters = _ms(lambda: dedup.find_duplicates([("bank", bank)]))
+
+    cluster_of = {}
+    for c, cluster in enumerate(clusters):
+        for _, pos, _ in cluster["members"]:
+            cluster_of[pos] = c
+    above = [(a, b) for a, b in planted if dedup.jaccard(sets[a], sets[b]) >= dedup.THRESHOLD]
+    found = sum(1 for a, b in above if a in cluster_of and cluster_of.get(a) == cluster_of.get(b))
+    planted_positions = {p for pair in planted for p in pair}
+    spurious = sum(1 for cluster in clusters
+                   if not any(pos in planted_positions for _, pos, _ in cluster["members"]))
+
+    # naive all-pairs Jaccard, estimated from a sample
+    sample = 200_000
+    rng = random.Random(2)
+    sample_pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(sample)]
+    pair_ms, _ = _ms(lambda: [dedup.jaccard(sets[a], sets[b]) for a, b in sample_pairs])
+    naive_s = pair_ms / sample * (n * (n - 1) / 2) / 1000
+
+    print(f"{n} questions, {len(planted)} planted near-duplicates "
+          f"({len(above)} at or above the {dedup.THRESHOLD} threshold)")
+    print(f"shingling:     {shingle_ms:8.0f} ms")
+    print(f"signatures:    {sig_ms:8.0f} ms ({dedup.NUM_PERM} hashes)")
+    print(f"LSH buckets:   {lsh_ms:8.0f} ms ({len(pairs)} candidate pairs, {dedup.BANDS} bands)")
+    print(f"verification:  {verify_ms:8.0f} ms")
+    print(f"find_duplicates end to end: {total_ms:.0f} ms, {len(clusters)} clusters")
+    print(f"recall:        {found}/{len(above)} planted pairs above the threshold "
+          f"({found / max(len(above), 1):.1%})")
+    print(f"spurious:      {spurious} clusters without a planted question")
+    print(f"all pairs:     ~{naive_s / 3600:.1f} h estimated for {n * (n - 1) // 2:,} Jaccard comparisons")
+
+
+if __name__ == "__main__":
+    main()
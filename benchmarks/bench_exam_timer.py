@@ -0,0 +1,158 @@
+# Exam countdowns for a classroom of sessions, each on its own headless
+# ft.Page: the shared exam clock (one asyncio loop, redraws only the timer
+# Text when its second changes) against the naive way (a thread per
+# session calling page.update() every 100 ms). Reports messages sent to the
+# client per session per second, CPU used, how late the display changes
+# and the expiry callbacks fire, and then plays one timed app session
+# through main.main() where every question of a 5-question quiz times out.
+#
+# Run from the repo root:
+#   python benchmarks/bench_exam_timer.py [sessions] [seconds]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAIVE_TICK = 0.1
+
+
+def _pages(n):
+    import flet as ft
+
+    from mcq import ui_metrics
+
+    pages = []
+    for _ in range(n):
+        page = ui_metrics.headless_page()
+        text = ft.Text("")
+        page.add(text)
+        pages.append((page, text))
+    return pages
+
+
+def _messages(pages):
+    return sum(page.connection.messages for page, _ in pages)
+
+
+def _shared_clock(pages, seconds):
+    from mcq import exam_timer
+
+    clock = exam_timer.ExamClock()
+    lags, late = [], []
+    done = threading.Semaphore(0)
+    start = time.monotonic()
+    for i, (page, text) in enumerate(pages):
+        # sessions start at different moments within a second, like a real class
+        deadline = start + seconds + i / len(pages)
+
+        def tick(shown, text=text, deadline=deadline):
+            now = time.monotonic()
+            text.value = shown
+            text.update()
+            if shown:
+                m, s = shown[2:].split(":")
+                lags.append(now - (deadline - int(m) * 60 - int(s)))
+
+        def expire(kind, deadline=deadline):
+            late.append(time.monotonic() - deadline)
+            done.release()
+
+        countdown = clock.countdown(tick, expire)
+        text.value = countdown.start_exam(deadline - time.monotonic())
+        text.update()
+    before = _messages(pages)
+    cpu = time.process_time()
+    for _ in pages:
+        done.acquire()
+    cpu = time.process_time() - cpu
+    return _messages(pages) - before, cpu, lags, late, clock.stats
+
+
+def _naive(pages, seconds):
+    from mcq.exam_timer import format_seconds
+
+    late = []
+    stop = threading.Event()
+    start = time.monotonic()
+
+    def run(page, text, deadline):
+        while not stop.is_set():
+            left = deadline - time.monotonic()
+            text.value = "⏱ " + format_seconds(left)
+            page.update()
+            if left <= 0:
+                late.append(-left)
+                return
+            time.sleep(NAIVE_TICK)
+
+    threads = [threading.Thread(target=run, args=(page, text, start + seconds + i / len(pages)), daemon=True)
+               for i, (page, text) in enumerate(pages)]
+    before = _messages(pages)
+    cpu = time.process_time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cpu = time.process_time() - cpu
+    return _messages(pages) - before, cpu, late
+
+
+def _timed_app_session():
+    import main as app
+    from mcq import exam_timer, ui_metrics
+    from mcq.registry import REGISTRY
+
+    exam_timer.FEEDBACK_SECONDS = 0.2
+    REGISTRY.refresh_in_background = lambda *args, **kwargs: None
+    REGISTRY.schedule_refresh = lambda *args, **kwargs: None
+
+    page = ui_metrics.headless_page()
+    meter = ui_metrics.UpdateMeter().attach(page)
+    ui_metrics.meter_from_env = lambda page: meter
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.main(page)
+        actions = page.controls[0].content.controls[5]
+        t0 = time.monotonic()
+        while actions.controls[0].text != "Start Over" and time.monotonic() - t0 < 30:
+            time.sleep(0.05)
+    return actions.controls[0].text == "Start Over", time.monotonic() - t0, meter.summary()
+
+
+def main():
+    os.environ.setdefault("MCQ_CACHE_DIR", tempfile.mkdtemp(prefix="mcq-bench-"))
+    os.environ["MCQ_ANSWER_LOG"] = "0"
+    # the app session: a 5-question quiz, 1 s per question, 60 s in all
+    os.environ["MCQ_QUIZ_SIZE"] = "5"
+    os.environ["MCQ_QUESTION_SECONDS"] = "1"
+    os.environ["MCQ_EXAM_SECONDS"] = "60"
+    args = [int(a) for a in sys.argv[1:]]
+    n = args[0] if args else 300
+    seconds = args[1] if len(args) > 1 else 5
+
+    sent, cpu, lags, late, stats = _shared_clock(_pages(n), seconds)
+    naive_sent, naive_cpu, naive_late = _naive(_pages(n), seconds)
+    rate = sent / n / seconds
+    naive_rate = naive_sent / n / seconds
+    lags.sort()
+    print(f"{n} sessions, {seconds} s exams")
+    print(f"shared clock: {rate:5.2f} messages/session/s, CPU {cpu:5.2f} s, {stats['wakeups']} wakeups; "
+          f"display change late by median {statistics.median(lags) * 1000:.1f} ms, "
+          f"max {lags[-1] * 1000:.1f} ms; expiry late by max {max(late) * 1000:.1f} ms")
+    print(f"naive 100 ms: {naive_rate:5.2f} messages/session/s, CPU {naive_cpu:5.2f} s; "
+          f"expiry late by max {max(naive_late) * 1000:.1f} ms")
+
+    finished, took, summary = _timed_app_session()
+    batches = ", ".join(f"{label} {s['batches']}" for label, s in summary.items())
+    print(f"app, 1 s per question: {'finished' if finished else 'NOT finished'} by timeouts alone "
+          f"in {took:.1f} s; batches per label: {batches}")
+
+
+if __name__ == "__main__":
+    main()
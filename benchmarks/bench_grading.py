@@ -0,0 +1,98 @@
+# Batch grading of a class's answer sheets: encoding CSV and JSON sheets
+# into the response matrix, and grading it (plain, negative marking and
+# partial credit) against grading one answer at a time the way the app's
+# check button does ("option X" == q.answer).
+#
+# Run from the repo root:
+#   python benchmarks/bench_grading.py [students] [questions]
+
+import csv
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import grading, loaders  # noqa: E402
+
+
+def _median_ms(fn, repeats=5):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _sheets(bank, n_students, seed=0):
+    """Letters per student in bank order: ~70% right, some blanks and a few invalid marks."""
+    rng = random.Random(seed)
+    key = [q.answer[-1] for q in bank]
+    sheets = []
+    for _ in range(n_students):
+        skill = rng.uniform(0.4, 0.95)
+        row = []
+        for right in key:
+            r = rng.random()
+            row.append(right if r < skill else "" if r > 0.97 else "AB" if r > 0.965 else rng.choice("ABCD"))
+        sheets.append(row)
+    return sheets
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n_students = args[0] if args else 1_000
+    n_questions = args[1] if len(args) > 1 else 500
+    rows = make_rows(n_questions)
+    bank = loaders.questions_from_rows(rows[0], rows[1:])
+    letters = _sheets(bank, n_students)
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Student", *bank.qns()])
+    writer.writerows([f"s{i}", *row] for i, row in enumerate(letters))
+    csv_text = out.getvalue()
+    json_data = json.loads(json.dumps({f"s{i}": dict(zip(map(str, bank.qns()), row))
+                                       for i, row in enumerate(letters)}))
+
+    csv_ms = _median_ms(lambda: grading.AnswerSheets.from_csv(bank, csv_text))
+    json_ms = _median_ms(lambda: grading.AnswerSheets.from_json(bank, json_data))
+    sheets = grading.AnswerSheets.from_csv(bank, csv_text)
+    partial = {str(qn): {"ABCD"[(q.answer_index + 1) % 4]: 0.5} for qn, q in zip(bank.qns()[::10], bank[::10])}
+
+    plain_ms = _median_ms(lambda: grading.grade(bank, sheets))
+    negative_ms = _median_ms(lambda: grading.grade(bank, sheets, wrong=-1 / 3))
+    partial_ms = _median_ms(lambda: grading.grade(bank, sheets, wrong=-1 / 3, partial=partial))
+    results = grading.grade(bank, sheets)
+
+    def one_at_a_time():
+        scores = []
+        for row in letters:
+            score = 0
+            for q, given in zip(bank, row):
+                if f"option {given}" == q.answer:
+                    score += 1
+            scores.append(score)
+        return scores
+
+    loop_ms = _median_ms(one_at_a_time, repeats=3)
+    assert one_at_a_time() == results["raw"].tolist()
+
+    print(f"{n_students} students x {n_questions} questions "
+          f"(CSV {len(csv_text) / 1e6:.1f} MB), mean raw score {results['raw'].mean():.1f}")
+    print(f"encode CSV sheets:        {csv_ms:8.1f} ms")
+    print(f"encode JSON sheets:       {json_ms:8.1f} ms")
+    print(f"grade, right/wrong:       {plain_ms:8.1f} ms")
+    print(f"grade, negative marking:  {negative_ms:8.1f} ms")
+    print(f"grade, + partial credit:  {partial_ms:8.1f} ms ({len(partial)} questions)")
+    print(f"one answer at a time:     {loop_ms:8.1f} ms ({loop_ms / plain_ms:.0f}x the batch grade)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Question images served over (slow) HTTP: how long moving to the next
+# question waits for its image, with and without prefetching the next one,
+# on a cold cache and on a warm one, and what the cache size bound does.
+#
+# Images are random-pixel PNGs (incompressible, like photos) from a local
+# server that adds a fixed latency per request. The walk spends THINK_SECONDS
+# on every question, the time a user takes to answer.
+#
+# Run from the repo root:
+#   python benchmarks/bench_images.py [questions] [latency ms]
+
+import http.server
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import images  # noqa: E402
+
+THINK_SECONDS = 0.15
+IMAGE_SIZE = (640, 480)
+
+
+def _png(width, height):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\x00" + os.urandom(width * 3) for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1))
+            + chunk(b"IEND", b""))
+
+
+def _serve(directory, latency):
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def do_GET(self):
+            time.sleep(latency)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _walk(cache, sources, prefetch):
+    """Waits per question (ms) for a walk through `sources` in order."""
+    waits = []
+    for i, source in enumerate(sources):
+        t0 = time.perf_counter()
+        data = cache.get(source)
+        if data is None:
+            data = cache.fetch(source).result()
+        waits.append((time.perf_counter() - t0) * 1000)
+        assert data
+        if prefetch and i + 1 < len(sources):
+            cache.prefetch(sources[i + 1])
+        time.sleep(THINK_SECONDS)
+    return waits
+
+
+def _report(label, waits):
+    waits = sorted(waits)
+    p95 = waits[max(0, -(-len(waits) * 95 // 100) - 1)]
+    print(f"{label:<28} median {statistics.median(waits):7.1f} ms   p95 {p95:7.1f} ms   "
+          f"max {waits[-1]:7.1f} ms")
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n = args[0] if args else 40
+    latency = (args[1] if len(args) > 1 else 120) / 1000
+
+    try:
+        import PIL  # noqa: F401
+        pillow = "Pillow installed: thumbnails are downscaled"
+    except ImportError:
+        pillow = "Pillow not installed: originals are cached as they are"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        served = os.path.join(tmp, "served")
+        os.makedirs(served)
+        for i in range(n):
+            with open(os.path.join(served, f"{i}.png"), "wb") as f:
+                f.write(_png(*IMAGE_SIZE))
+        image_bytes = os.path.getsize(os.path.join(served, "0.png"))
+        server = _serve(served, latency)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        sources = [f"{base}/{i}.png" for i in range(n)]
+
+        print(f"{n} questions with {image_bytes // 1024} kB images, {latency * 1000:.0f} ms server latency, "
+              f"{THINK_SECONDS * 1000:.0f} ms per question; {pillow}")
+        results = {}
+        for prefetch in (False, True):
+            thumbs = os.path.join(tmp, f"thumbs-{prefetch}")
+            cold = _walk(images.ThumbnailCache(thumbs), sources, prefetch)
+            # a new cache object over the same folder: what the next launch sees
+            warm = _walk(images.ThumbnailCache(thumbs), sources, prefetch)
+            results[prefetch] = (cold, warm)
+        _report("cold, no prefetch", results[False][0])
+        _report("cold, prefetch next", results[True][0])
+        _report("warm (disk cache)", results[True][1])
+
+        bound = image_bytes * 10
+        small = images.ThumbnailCache(os.path.join(tmp, "small"), max_bytes=bound)
+        _walk(small, sources, prefetch=True)
+        on_disk = sum(e.stat().st_size for e in os.scandir(small.directory))
+        print(f"bounded to {bound // 1024} kB: {len(small)} thumbnails kept, {on_disk // 1024} kB on disk, "
+              f"{small.stats['evictions']} evicted")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Streaming item analysis: simulated quiz sessions answer a bank through
+# item_stats.Session, with a few questions planted as too easy, too hard or
+# with a distractor that strong students fall for. Measures the cost of one
+# observe(), the memory per question, a full report and merging two
+# devices' stats, checks the streamed p-values and point-biserials against
+# a batch computation over the same answers, and counts how many planted
+# questions get flagged.
+#
+# Run from the repo root:
+#   python benchmarks/bench_item_stats.py [sessions] [questions]
+
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import item_stats  # noqa: E402
+
+SESSION_LENGTH = 40
+PLANTED = 10  # of each kind
+
+
+def _simulate(n_sessions, n_questions, seed):
+    """(qn, choice, correct, session) answers; the key is always A."""
+    rng = random.Random(seed)
+    difficulty = [rng.uniform(-1.5, 1.5) for _ in range(n_questions)]
+    easy, hard, tricky = (set(range(k * PLANTED, (k + 1) * PLANTED)) for k in range(3))
+    for q in easy:
+        difficulty[q] = -5
+    for q in hard:
+        difficulty[q] = 4
+    answers = []
+    for session in range(n_sessions):
+        skill = rng.gauss(0, 1)
+        for q in rng.sample(range(n_questions), SESSION_LENGTH):
+            if q in tricky and skill > 0 and rng.random() < 0.6:
+                choice = "B"  # strong students misread this one
+            elif rng.random() < 1 / (1 + math.exp(difficulty[q] - skill)):
+                choice = "A"
+            else:
+                choice = rng.choice("BCD")
+            answers.append((q, choice, choice == "A", session))
+    return answers, easy, hard, tricky
+
+
+def _feed(stats, answers):
+    abilities = []
+    session = None
+    current = None
+    for qn, choice, correct, s in answers:
+        if s != current:
+            session, current = stats.session(), s
+        abilities.append((session.correct + 1) / (session.answered + 2))
+        session.observe(qn, choice, correct)
+    return abilities
+
+
+def _batch_point_biserial(answers, abilities, qn):
+    xs = [x for (q, _, _, _), x in zip(answers, abilities) if q == qn]
+    ys = [c for (q, _, c, _) in answers if q == qn]
+    n = len(xs)
+    mean = sum(xs) / n
+    sd = math.sqrt(sum((x - mean) ** 2 for x in xs) / n)
+    right = [x for x, y in zip(xs, ys) if y]
+    wrong = [x for x, y in zip(xs, ys) if not y]
+    p = len(right) / n
+    return (sum(right) / len(right) - sum(wrong) / len(wrong)) / sd * math.sqrt(p * (1 - p))
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n_sessions = args[0] if args else 20_000
+    n_questions = args[1] if len(args) > 1 else 2_000
+    answers, easy, hard, tricky = _simulate(n_sessions, n_questions, seed=1)
+
+    stats = item_stats.ItemStats("bench")
+    t0 = time.perf_counter()
+    abilities = _feed(stats, answers)
+    observe_us = (time.perf_counter() - t0) / len(answers) * 1e6
+
+    tracemalloc.start()
+    sized = item_stats.ItemStats("bench")
+    _feed(sized, answers[:len(answers) // 10])
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    report = {item["qn"]: item for item in stats.report()}
+    report_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    item = stats.item(n_questions - 1)
+    item_us = (time.perf_counter() - t0) * 1e6
+
+    # two devices, each with half the sessions, merged
+    half = len(answers) // 2
+    while answers[half][3] == answers[half - 1][3]:
+        half += 1
+    device_a, device_b = item_stats.ItemStats("bench"), item_stats.ItemStats("bench")
+    _feed(device_a, answers[:half])
+    _feed(device_b, answers[half:])
+    t0 = time.perf_counter()
+    merged = device_a.merge(device_b)
+    merge_ms = (time.perf_counter() - t0) * 1000
+    merged_report = {item["qn"]: item for item in merged.report()}
+
+    worst = 0.0
+    for qn in (0, PLANTED * 3, n_questions // 2, n_questions - 1):
+        expected = _batch_point_biserial(answers, abilities, qn)
+        worst = max(worst, abs(expected - report[qn]["discrimination"]),
+                    abs(expected - merged_report[qn]["discrimination"]))
+
+    def found(kind, planted):
+        return sum(1 for qn in planted if any(f.startswith(kind) for f in report[qn]["flags"]))
+
+    flagged = sum(1 for item in report.values() if item["flags"])
+    false_distractors = sum(1 for qn, item in report.items() if qn not in tricky
+                            and any(f.startswith("misleading") for f in item["flags"]))
+    print(f"{len(answers)} answers from {n_sessions} sessions over {n_questions} questions "
+          f"(~{len(answers) / n_questions:.0f} per question)")
+    print(f"observe():           {observe_us:6.2f} us per answer")
+    print(f"memory:              {memory / len(sized):6.0f} B per question")
+    print(f"full report:         {report_ms:6.1f} ms; one question: {item_us:.0f} us")
+    print(f"merge two devices:   {merge_ms:6.1f} ms; max |r_pb| difference vs batch: {worst:.1e}")
+    print(f"planted found:       too easy {found('too easy', easy)}/{PLANTED}, "
+          f"too hard {found('too hard', hard)}/{PLANTED}, "
+          f"misleading distractor {found('misleading distractor B', tricky)}/{PLANTED}; "
+          f"{flagged} questions flagged in all, {false_distractors} misleading distractors not planted")
+    print(f"example:             QN {item['qn']}: p={item['p_value']:.2f} r_pb={item['discrimination']:+.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Memory per 10k questions: the old list of nested dicts vs QuestionBank.
+#
+# Both forms are built from the same synthetic rows; tracemalloc counts every
+# allocation made while building them (strings included), so the numbers are
+# what a loaded bank really costs.
+#
+# Run from the repo root:
+#   python benchmarks/bench_memory.py [n_questions]
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq.question_bank import QuestionBank  # noqa: E402
+
+
+def as_dicts(rows):
+    """The list-of-dicts form the app used before QuestionBank."""
+    return [
+        {
+            "qn": int(qn.strip()),
+            "question": q.strip(),
+            "options": {
+                "option A": a.strip(),
+                "option B": b.strip(),
+                "option C": c.strip(),
+                "option D": d.strip(),
+            },
+            "answer": "option " + ans.strip().upper(),
+        }
+        for qn, q, a, b, c, d, ans in rows[1:]
+    ]
+
+
+def as_bank(rows):
+    cols = list(zip(*rows[1:]))
+    qns = [int(s.strip()) for s in cols[0]]
+    text, a, b, c, d = ([s.strip() for s in col] for col in cols[1:6])
+    answers = [s.strip().upper() for s in cols[6]]
+    return QuestionBank.from_columns(qns, text, a, b, c, d, answers)
+
+
+def measure(build, rows):
+    gc.collect()
+    tracemalloc.start()
+    obj = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, obj
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = make_rows(n)
+
+    text_bytes = sum(len(s.strip().encode("utf-8")) for row in rows[1:] for s in row[1:6])
+    dict_size, dicts = measure(as_dicts, rows)
+    bank_size, bank = measure(as_bank, rows)
+    assert bank.to_dicts() == dicts
+
+    per = 10_000 / n
+    print(f"questions:         {n}")
+    print(f"raw text:          {text_bytes * per / 1024:10.1f} KiB per 10k")
+    print(f"list of dicts:     {dict_size * per / 1024:10.1f} KiB per 10k")
+    print(f"QuestionBank:      {bank_size * per / 1024:10.1f} KiB per 10k")
+    print(f"reduction:         {dict_size / bank_size:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
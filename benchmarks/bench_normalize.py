@@ -0,0 +1,70 @@
+# Compares the old row-by-row df.iterrows() normalization with the columnar
+# one in mcq/loaders.py, on synthetic banks of 1k/10k/100k rows.
+#
+# Run from the repo root:
+#   python benchmarks/bench_normalize.py [sizes...]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import loaders  # noqa: E402
+
+
+def legacy_iterrows(df):
+    """The normalization loop main.py used to run, kept here as the baseline."""
+    questions = []
+    for index, row in df.iterrows():
+        answer_key = str(row['Answer']).strip().upper()
+        if answer_key in ['A', 'B', 'C', 'D']:
+            formatted_answer = "option " + answer_key
+        else:
+            print(f"Warning: Skipping question {row.get('SN', index+1)} due to invalid answer key.")
+            continue
+        questions.append({
+            "qn": int(str(row['QN']).strip()),
+            "question": str(row['Question']).strip(),
+            "options": {
+                "option A": str(row['A']).strip(),
+                "option B": str(row['B']).strip(),
+                "option C": str(row['C']).strip(),
+                "option D": str(row['D']).strip(),
+            },
+            "answer": formatted_answer,
+        })
+    return questions
+
+
+def _time(fn):
+    # warnings go to a buffer so printing doesn't dominate the numbers
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+    return elapsed, result
+
+
+def main():
+    import pandas as pd
+
+    sizes = [int(s) for s in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'rows':>8} {'iterrows':>12} {'columnar(df)':>14} {'columnar(rows)':>16} {'speedup':>8}")
+    for n in sizes:
+        rows = make_rows(n, invalid_every=500)
+        df = pd.DataFrame(rows[1:], columns=rows[0])
+
+        t_old, old = _time(lambda: legacy_iterrows(df))
+        t_df, new_df = _time(lambda: loaders.questions_from_dataframe(df))
+        t_rows, new_rows = _time(lambda: loaders.questions_from_payload(rows))
+        assert old == new_df.to_dicts() == new_rows.to_dicts(), "columnar output differs from iterrows"
+
+        print(f"{n:>8} {t_old * 1000:>10.1f}ms {t_df * 1000:>12.1f}ms {t_rows * 1000:>14.1f}ms {t_old / t_df:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Quiz generation on a large synthetic bank: time and memory per quiz for
+# many sessions, plain and stratified, against copying the questions out as
+# dicts (the old way of making a per-session quiz).
+#
+# Run from the repo root:
+#   python benchmarks/bench_quiz.py [bank size] [questions per quiz] [sessions]
+
+import copy
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import loaders, quiz  # noqa: E402
+
+
+def _per_quiz(fn, sessions):
+    """(µs per call, bytes retained per result) over `sessions` calls."""
+    t0 = time.perf_counter()
+    for seed in range(sessions):
+        fn(seed)
+    elapsed = time.perf_counter() - t0
+    # memory is measured on a second run: tracemalloc slows allocation down
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [fn(seed) for seed in range(sessions)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return elapsed / sessions * 1e6, retained / sessions
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n = args[0] if args else 200_000
+    k = args[1] if len(args) > 1 else 50
+    sessions = args[2] if len(args) > 2 else 10_000
+    bank = loaders.questions_from_payload(make_rows(n))
+    dicts = bank.to_dicts()
+
+    t0 = time.perf_counter()
+    strata = quiz.strata_by(bank, lambda q: q.qn % 20)  # 20 made-up topics
+    strata_ms = (time.perf_counter() - t0) * 1000
+
+    plain = _per_quiz(lambda seed: quiz.generate(bank, k, seed), sessions)
+    stratified = _per_quiz(lambda seed: quiz.generate(bank, k, seed, strata=strata), sessions)
+
+    def copied(seed):
+        rng = random.Random(seed)
+        questions = copy.deepcopy(rng.sample(dicts, k))
+        for q in questions:
+            q["options"] = dict(zip(q["options"], rng.sample(list(q["options"].values()), 4)))
+        return questions
+
+    copies = _per_quiz(copied, max(sessions // 10, 1))
+
+    same = quiz.generate(bank, k, 1234).rows() == quiz.generate(bank, k, 1234).rows()
+    key = quiz.answer_key(quiz.generate(bank, k, 1234))
+    print(f"bank of {n} questions, quizzes of {k}, {sessions} sessions")
+    print(f"generate():          {plain[0]:8.1f} us, {plain[1]:8.0f} bytes per quiz")
+    print(f"stratified (20):     {stratified[0]:8.1f} us, {stratified[1]:8.0f} bytes per quiz "
+          f"(grouping once: {strata_ms:.0f} ms)")
+    print(f"deepcopy of dicts:   {copies[0]:8.1f} us, {copies[1]:8.0f} bytes per quiz")
+    print(f"same seed, same quiz: {same}; grading the answer key scores "
+          f"{quiz.grade(bank, k, 1234, key)}/{k}")
+
+
+if __name__ == "__main__":
+    main()
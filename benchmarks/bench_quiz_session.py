@@ -0,0 +1,103 @@
+# The UI-free QuizSession engine: cost of each transition (start, select,
+# check, next) with the answer key passed in, with the answer read per check
+# (as the app does) and with an event subscriber, against the grading the
+# handlers did before (a Question accessor and an "option X" comparison per
+# check), memory per live session and per saved state(), and simulator
+# throughput with one process and with all cores. The score digest must be
+# the same for both runs.
+#
+# Run from the repo root:
+#   python benchmarks/bench_quiz_session.py [sessions] [questions]
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import quiz, simulator  # noqa: E402
+from mcq.question_bank import OPTION_KEYS  # noqa: E402
+from mcq.quiz_session import QUESTION, QuizSession  # noqa: E402
+
+ROUNDS = 20_000
+
+
+def _engine_round(questions, key, listener=None):
+    session = QuizSession(questions, key=key)
+    if listener is not None:
+        session.subscribe(listener)
+    session.start()
+    while session.phase == QUESTION:
+        session.select((session.pos * 7) & 3)
+        session.check()
+        session.next()
+    return session.score
+
+
+def _old_round(questions):
+    # what main.py's handlers did per click, without the UI
+    current_q_index = score = 0
+    while current_q_index < len(questions):
+        current_q = questions[current_q_index]
+        selected_key = OPTION_KEYS[(current_q_index * 7) & 3]
+        if selected_key == current_q.answer:
+            score += 1
+        current_q_index += 1
+    return score
+
+
+def _per_answer_us(fn, answers):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - t0) / (ROUNDS * answers) * 1e6
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    sessions = args[0] if args else 500_000
+    size = args[1] if len(args) > 1 else 20
+    bank = simulator.synthetic_bank(2000)
+    questions = quiz.generate(bank, size, 7)
+    key = questions.answer_indices()
+
+    events = []
+    old = _per_answer_us(lambda: _old_round(questions), size)
+    engine = _per_answer_us(lambda: _engine_round(questions, key), size)
+    keyless = _per_answer_us(lambda: _engine_round(questions, None), size)
+    listened = _per_answer_us(lambda: _engine_round(questions, key, lambda e, s: events.append(e)), size)
+    assert _old_round(questions) == _engine_round(questions, key) == _engine_round(questions, None)
+
+    tracemalloc.start()
+    live = []
+    for i in range(10_000):
+        s = QuizSession(questions, key=key)
+        s.start()
+        for _ in range(size // 2):
+            s.select(i & 3)
+            s.check()
+            s.next()
+        live.append(s)
+    memory = tracemalloc.get_traced_memory()[0] / len(live)
+    tracemalloc.stop()
+    state = live[0].state()
+    state_bytes = sys.getsizeof(state) + sum(sys.getsizeof(x) for x in state)
+
+    print(f"{size}-question rounds, per answer (select + check + next):")
+    print(f"  handler logic before:   {old:5.2f} us (Question accessor + option string per check)")
+    print(f"  QuizSession, key given: {engine:5.2f} us")
+    print(f"  QuizSession, no key:    {keyless:5.2f} us (answer read from the question on each check)")
+    print(f"  QuizSession + listener: {listened:5.2f} us")
+    print(f"memory: {memory:.0f} B per live session mid-round, {state_bytes} B per state()")
+
+    single = simulator.simulate(sessions, size, bank, jobs=1)
+    pooled = simulator.simulate(sessions, size, bank, jobs=os.cpu_count() or 1)
+    for r in (single, pooled):
+        print(f"simulator, {r['jobs']} process(es): {r['sessions']} sessions in {r['seconds']:.2f} s = "
+              f"{r['sessions_per_minute']:,} sessions/min; mean score {r['mean_score']:.2f}, digest {r['digest']}")
+    print("digests match" if single["digest"] == pooled["digest"] else "DIGESTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Coalesced rendering against a page.update() per handler (MCQ_RENDER=0):
+# plays a quiz through main.main() on a headless ft.Page and times the
+# check / next clicks (server CPU per click, batches and bytes sent), first
+# on the bare quiz and then with the search panel and the review list in the
+# tree, where diffing the whole page costs more. Then double-clicks "Check
+# Answer" on every question and counts how often the second click also hit
+# "Next Question".
+#
+# Run from the repo root:
+#   python benchmarks/bench_render.py [questions]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _session(app, render, ui_metrics, enabled):
+    render.ENABLED = enabled
+    page = ui_metrics.headless_page()
+    meter = ui_metrics.UpdateMeter().attach(page)
+    ui_metrics.meter_from_env = lambda page: meter
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.main(page)
+    column = page.controls[0].content
+    return page, meter, column
+
+
+def _play(column, meter, debounce_wait=0.0):
+    """Check + next on every question; returns {label: [seconds per click]}."""
+    radio_group, actions = column.controls[3], column.controls[5]
+    times = {"check": [], "next": []}
+    while actions.controls[0].text != "Start Over":
+        for label in ("check", "next"):
+            radio_group.value = "option A"
+            t0 = time.process_time()
+            actions.controls[0].on_click(None)
+            times[label].append(time.process_time() - t0)
+            time.sleep(debounce_wait)
+    return times
+
+
+def _per_click(meter, labels=("check", "next")):
+    summary = meter.summary()
+    return {label: summary.get(label, {"batches": 0, "bytes": 0}) for label in labels}
+
+
+def main():
+    os.environ.setdefault("MCQ_CACHE_DIR", tempfile.mkdtemp(prefix="mcq-bench-"))
+    os.environ["MCQ_ANSWER_LOG"] = "0"
+    os.environ["MCQ_ITEM_STATS"] = "0"
+    args = [int(a) for a in sys.argv[1:]]
+    os.environ["MCQ_QUIZ_SIZE"] = str(args[0] if args else 100)
+    import main as app
+    from mcq import render, ui_metrics
+    from mcq.registry import REGISTRY
+
+    REGISTRY.refresh_in_background = lambda *args, **kwargs: None
+    REGISTRY.schedule_refresh = lambda *args, **kwargs: None
+    render.DEBOUNCE_SECONDS = 0.0
+
+    print(f"{'mode':<38} {'check us':>9} {'next us':>9} {'batches/click':>14} {'bytes/click':>12}")
+    for busy in (False, True):
+        for enabled, name in ((False, "page.update() per handler"), (True, "coalesced")):
+            page, meter, column = _session(app, render, ui_metrics, enabled)
+            if busy:
+                # search panel and review list in the tree (hidden again, as after using them)
+                column.controls[0].content.controls[0].on_click(None)
+                _play(column, meter)
+                column.controls[5].controls[1].on_click(None)
+                column.controls[5].controls[0].on_click(None)
+                column.controls[-2].visible = False
+                meter.batches.clear()
+            times = _play(column, meter)
+            clicks = _per_click(meter)
+            n = len(times["check"]) + len(times["next"])
+            batches = sum(c["batches"] for c in clicks.values()) / n
+            size = sum(c["bytes"] for c in clicks.values()) / n
+            print(f"{name + (', busy page' if busy else ''):<38} "
+                  f"{statistics.median(times['check']) * 1e6:9.0f} {statistics.median(times['next']) * 1e6:9.0f} "
+                  f"{batches:14.2f} {size:12.0f}")
+
+    render.DEBOUNCE_SECONDS = 0.3
+    for enabled, name in ((False, "page.update() per handler"), (True, "coalesced")):
+        page, meter, column = _session(app, render, ui_metrics, enabled)
+        radio_group, actions = column.controls[3], column.controls[5]
+        questions = skipped = 0
+        while actions.controls[0].text != "Start Over":
+            radio_group.value = "option A"
+            before = column.controls[1].controls[0].value
+            button = actions.controls[0]
+            click = types.SimpleNamespace(control=button)
+            button.on_click(click)   # double click on "Check Answer"
+            button.on_click(click)
+            questions += 1
+            if column.controls[1].controls[0].value != before:
+                skipped += 1  # the second click moved on before the feedback could be read
+            else:
+                time.sleep(0.31)
+                actions.controls[0].on_click(None)   # next
+            time.sleep(0.31)
+        print(f"double-click on Check, {name}: feedback skipped on {skipped}/{questions} questions")
+
+
+if __name__ == "__main__":
+    main()
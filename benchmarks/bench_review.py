@@ -0,0 +1,85 @@
+# Review screen on growing banks: what opening it and turning a page send to
+# the Flet client, how long a page turn takes and how much memory the screen
+# holds, against building one row per question up front.
+#
+# Run from the repo root:
+#   python benchmarks/bench_review.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flet as ft  # noqa: E402
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import loaders, ui_metrics  # noqa: E402
+from mcq.question_bank import OPTION_KEYS  # noqa: E402
+from mcq.review_list import ReviewList, _Row  # noqa: E402
+
+SIZES = (100, 1_000, 10_000, 200_000)
+TURNS = 50
+# building every row gets slow quickly; only done up to this size
+NAIVE_MAX = 2_000
+
+
+def _metered_page():
+    page = ui_metrics.headless_page()
+    return page, ui_metrics.UpdateMeter().attach(page)
+
+
+def _review(bank, choices):
+    page, meter = _metered_page()
+    tracemalloc.start()
+    screen = ReviewList()
+    screen.control.visible = True
+    page.add(screen.control)
+    meter.begin("show")
+    screen.show(bank, choices)
+    page.update()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    meter.begin("turn")
+    turns = min(TURNS, screen.pages - 1)
+    t0 = time.perf_counter()
+    for _ in range(turns):
+        screen.turn(1)
+    turn_ms = (time.perf_counter() - t0) / turns * 1000
+    s = meter.summary()
+    opened = s["init"]["bytes"] + s["show"]["bytes"]
+    return opened, s["turn"]["bytes"] / turns, turn_ms, memory
+
+
+def _naive(bank, choices):
+    page, meter = _metered_page()
+    tracemalloc.start()
+    rows = []
+    for pos, question in enumerate(bank):
+        row = _Row()
+        row.show(pos + 1, question, choices.get(question.qn))
+        rows.append(row.control)
+    page.add(ft.ListView(rows, height=400))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return meter.summary()["init"]["bytes"], memory
+
+
+def main():
+    print(f"{'questions':>10} {'open bytes':>11} {'turn bytes':>11} {'turn ms':>8} {'memory kB':>10}"
+          f" | {'all rows bytes':>15} {'memory kB':>10}")
+    for n in SIZES:
+        bank = loaders.questions_from_payload(make_rows(n))
+        choices = {q.qn: OPTION_KEYS[i % 4] for i, q in enumerate(bank)}
+        opened, turn_bytes, turn_ms, memory = _review(bank, choices)
+        naive = f"{'-':>15} {'-':>10}"
+        if n <= NAIVE_MAX:
+            naive_bytes, naive_memory = _naive(bank, choices)
+            naive = f"{naive_bytes:>15} {naive_memory / 1024:>10.0f}"
+        print(f"{n:>10} {opened:>11} {turn_bytes:>11.0f} {turn_ms:>8.2f} {memory / 1024:>10.0f} | {naive}")
+
+
+if __name__ == "__main__":
+    main()
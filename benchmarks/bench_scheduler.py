@@ -0,0 +1,90 @@
+# Spaced-repetition picker on a large bank: building the heap, picking and
+# grading (compared with rescanning every due time per pick), and saving /
+# loading the review state.
+#
+# Run from the repo root:
+#   python benchmarks/bench_scheduler.py [bank size] [answers]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcq import scheduler  # noqa: E402
+from mcq.question_bank import QuestionBank  # noqa: E402
+
+
+def _bank(n):
+    return QuestionBank.from_columns(
+        range(1, n + 1), [f"q{i}" for i in range(n)],
+        ["a"] * n, ["b"] * n, ["c"] * n, ["d"] * n, ["A"] * n,
+    )
+
+
+def _rescan_pick(sched, now):
+    """What picking costs without the heap: look at every question."""
+    due, rows = sched.state.due, sched._rows
+    best = None
+    for pos, row in enumerate(rows):
+        d = due[row]
+        if d and d <= now and (best is None or d < due[rows[best]]):
+            best = pos
+    return best
+
+
+def _simulate(sched, answers, rng, now):
+    for _ in range(answers):
+        pos = sched.next_position(now)
+        sched.grade(pos, rng.random() < 0.7, now)
+        now += 20.0  # one answer every 20 s
+    return now
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    answers = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    bank = _bank(n)
+    scheduler.SAVE_DELAY = 3600  # save explicitly below
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "review.bank")
+        state = scheduler.ReviewState("bench", path)
+
+        t0 = time.perf_counter()
+        sched = scheduler.Scheduler(state, bank)
+        build = time.perf_counter() - t0
+
+        rng = random.Random(0)
+        t0 = time.perf_counter()
+        now = _simulate(sched, answers, rng, 1_000_000.0)
+        per_answer = (time.perf_counter() - t0) / answers
+
+        t0 = time.perf_counter()
+        for _ in range(20):
+            _rescan_pick(sched, now)
+        rescan = (time.perf_counter() - t0) / 20
+
+        t0 = time.perf_counter()
+        saved = state.save()
+        save = time.perf_counter() - t0
+        size = os.path.getsize(path)
+
+        t0 = time.perf_counter()
+        loaded = scheduler.ReviewState.load("bench", path)
+        reload = scheduler.Scheduler(loaded, bank)
+        load = time.perf_counter() - t0
+        same = reload.next_position(now) == sched.next_position(now)
+
+    print(f"bank: {n} questions, {answers} answers simulated")
+    print(f"build scheduler:        {build * 1000:.1f} ms")
+    print(f"pick + grade (heap):    {per_answer * 1e6:.1f} us per answer")
+    print(f"pick by rescanning:     {rescan * 1e6:.1f} us per pick")
+    print(f"save state:             {save * 1000:.1f} ms, {saved} answered questions, {size / 1024:.0f} KiB")
+    print(f"load state + rebuild:   {load * 1000:.1f} ms (same next question: {same})")
+
+
+if __name__ == "__main__":
+    main()
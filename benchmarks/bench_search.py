@@ -0,0 +1,93 @@
+# Search index on a large synthetic bank: building, saving / loading,
+# an incremental update after a refresh, and query latency (exact words,
+# prefixes, multi-word).
+#
+# make_rows() draws from ~30 words, so every word is in about a third of the
+# questions: the worst case for query time. --zipf uses a 20k-word vocabulary
+# with Zipf-distributed frequencies instead, closer to a real bank.
+#
+# Run from the repo root:
+#   python benchmarks/bench_search.py [bank size] [--zipf]
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import loaders, search  # noqa: E402
+
+QUERIES = ["chlorophyll", "chlor", "fungi spore", "cell wall pig", "zygote gamete flagella", "xyz"]
+ZIPF_QUERIES = ["w1", "w12", "w123", "w123 w45", "w7 w1234", "w2 w3 w4", "w9876"]
+
+
+def _zipf_rows(n, vocab=20_000, seed=0):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    cum, total = [], 0.0
+    for i in range(vocab):
+        total += 1 / (i + 1)
+        cum.append(total)
+
+    def text(k):
+        return " ".join(rng.choices(words, cum_weights=cum, k=k))
+
+    rows = [["QN", "Question", "A", "B", "C", "D", "Answer"]]
+    for qn in range(1, n + 1):
+        rows.append([qn, text(rng.randint(6, 14)), text(2), text(2), text(2), text(2), "ABCD"[qn % 4]])
+    return rows
+
+
+def _ms(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else 100_000
+    zipf = "--zipf" in sys.argv
+    rows = _zipf_rows(n) if zipf else make_rows(n)
+    queries = ZIPF_QUERIES if zipf else QUERIES
+    bank = loaders.questions_from_payload(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.bank")
+        index = search.SearchIndex()
+        build, _ = _ms(lambda: index.update(bank))
+        save, _ = _ms(lambda: index.save(path))
+        size = os.path.getsize(path)
+        load, loaded = _ms(lambda: search.SearchIndex.load(path))
+        unchanged, _ = _ms(lambda: loaded.update(bank))
+
+        # a refresh that edits 1% of the questions
+        edited = [list(r) for r in rows]
+        for r in edited[1::100]:
+            r[1] = r[1] + " lichen"
+        refreshed = loaders.questions_from_payload(edited)
+        incremental, counts = _ms(lambda: loaded.update(refreshed))
+
+        latencies = {}
+        for q in queries:
+            samples = []
+            for _ in range(5):
+                ms, hits = _ms(lambda: loaded.search(q))
+                samples.append(ms)
+            latencies[q] = (statistics.median(samples), len(hits))
+
+    print(f"bank: {n} questions ({'zipf vocabulary' if zipf else 'make_rows vocabulary'})")
+    print(f"build index:            {build:.0f} ms")
+    print(f"save / load:            {save:.0f} ms / {load:.0f} ms ({size / 2**20:.1f} MiB)")
+    print(f"update, bank unchanged: {unchanged:.0f} ms")
+    print(f"update, 1% edited:      {incremental:.0f} ms (re-indexed {counts[0]}, removed {counts[1]})")
+    for q, (ms, hits) in latencies.items():
+        print(f"search {q!r:<26} {ms:7.2f} ms, {hits} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Load test: N browser sessions start main(page) at the same moment.
+#
+# Sessions run on headless ft.Pages against a local stand-in for the Apps
+# Script endpoint (with some latency). Reported: how many times the bank was
+# fetched and loaded, memory allocated per session and time to first
+# question. --no-share gives every session its own registry, which is how
+# the app behaved before banks were shared.
+#
+# Run from the repo root:
+#   python benchmarks/bench_sessions.py [sessions] [bank rows] [--no-share]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class _PerSessionRegistry(threading.local):
+    """Gives each session thread a private BankRegistry (no sharing)."""
+
+    def __init__(self):
+        from mcq.registry import BankRegistry
+
+        self.registry = BankRegistry()
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__["registry"], name)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    shared = "--no-share" not in sys.argv
+    n_sessions = int(args[0]) if args else 40
+    n_rows = int(args[1]) if len(args) > 1 else 2_000
+
+    from benchmarks.synthetic import make_rows
+    from mcq.stub_server import StubBankServer
+
+    server = StubBankServer({"Fungi": make_rows(n_rows)}, delay=0.3).start()
+    os.environ["MCQ_BANK_URL"] = server.url
+    os.environ["MCQ_CACHE_DIR"] = tempfile.mkdtemp(prefix="mcq-bench-")
+    os.chdir(ROOT)
+
+    import main as app
+    from mcq import registry, ui_metrics
+
+    if not shared:
+        app.REGISTRY = _PerSessionRegistry()
+
+    loads = []
+    load_local = app.load_local_questions
+
+    def counting_load(*a, **kw):
+        loads.append(1)
+        return load_local(*a, **kw)
+
+    app.load_local_questions = counting_load
+
+    pages = [ui_metrics.headless_page() for _ in range(n_sessions)]
+    ttfq = [None] * n_sessions
+    barrier = threading.Barrier(n_sessions)
+
+    def session(i):
+        barrier.wait()
+        t0 = time.perf_counter()
+        app.main(pages[i])
+        ttfq[i] = time.perf_counter() - t0
+        # keep per-session registries alive until their refresh has finished
+        deadline = time.time() + 10
+        while not shared and app.REGISTRY.is_stale("Fungi", 60) and time.time() < deadline:
+            time.sleep(0.05)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # wait for the background refresh(es) to land
+        deadline = time.time() + 10
+        while shared and registry.REGISTRY.is_stale("Fungi", 60) and time.time() < deadline:
+            time.sleep(0.05)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    server.stop()
+
+    ttfq_ms = sorted(t * 1000 for t in ttfq)
+    print(f"sessions:              {n_sessions} ({'shared registry' if shared else 'no sharing'})")
+    print(f"bank rows:             {n_rows}")
+    print(f"remote fetches:        {len(server.requests)}")
+    print(f"local loads:           {len(loads)}")
+    print(f"memory per session:    {allocated / n_sessions / 1024:.1f} KiB")
+    print(f"time to 1st question:  p50 {statistics.median(ttfq_ms):.1f} ms, "
+          f"p95 {ttfq_ms[int(len(ttfq_ms) * 0.95) - 1]:.1f} ms, max {ttfq_ms[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Startup / import-time benchmark, in the style of `python -X importtime`.
+#
+# Each scenario runs in a fresh interpreter with -X importtime, so the numbers
+# include every module the scenario pulls in. The report lists the total
+# import time, the heaviest imports (two levels deep) and whether pandas was loaded.
+#
+# Run from the repo root:
+#   python benchmarks/bench_startup.py [repeats]
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    # what a launch costs before any question is loaded
+    "import main": "import main",
+    # mock CSV bank: should not import pandas
+    "csv bank": (
+        "import main\n"
+        "from mcq import loaders\n"
+        "loaders.questions_from_csv(main.MOCK_EXCEL_DATA)\n"
+    ),
+    # remote list-of-lists payload: should not import pandas
+    "remote payload": (
+        "from mcq import loaders\n"
+        "loaders.questions_from_payload([['QN','Question','A','B','C','D','Answer'],"
+        "[1,'q','a','b','c','d','A']])\n"
+    ),
+    # .ods bank through the streaming reader
+    "ods parse": (
+        "from mcq import loaders\n"
+        "loaders.parse_spreadsheet('src/MCQ_files/mcq_algae.ods')\n"
+    ),
+    # .ods bank through pandas (the slow path, for comparison)
+    "ods parse (pandas)": (
+        "from mcq import loaders\n"
+        "loaders.parse_spreadsheet_pandas('src/MCQ_files/mcq_algae.ods')\n"
+    ),
+}
+
+_CHECK = "\nimport sys\nprint('PANDAS_LOADED', 'pandas' in sys.modules)\n"
+
+
+def run_scenario(code):
+    """Runs `code` under -X importtime; returns (total_us, top-level imports, pandas loaded)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + _CHECK],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name[1:].rstrip()
+        # nesting is shown by two spaces per level; keep the first two levels
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            top_level[name.strip()] = (depth, int(cumulative))
+    pandas_loaded = "PANDAS_LOADED True" in proc.stdout
+    total = sum(us for depth, us in top_level.values() if depth == 0)
+    return total, top_level, pandas_loaded
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    for label, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(repeats)]
+        total, top_level, pandas_loaded = min(runs, key=lambda r: r[0])
+        heaviest = sorted(top_level.items(), key=lambda kv: -kv[1][1])[:8]
+
+        print(f"{label}: {total / 1000:.1f} ms of imports, pandas loaded: {pandas_loaded}")
+        for name, (depth, us) in heaviest:
+            print(f"    {us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+
+if __name__ == "__main__":
+    main()
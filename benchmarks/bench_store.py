@@ -0,0 +1,98 @@
+# SQLite question store on a large synthetic bank with topics and
+# difficulties: bulk import and refresh upserts, opening a StoredBank
+# against loading the bank into memory, random access, "k random unseen
+# questions" queries and paged iteration.
+#
+# Run from the repo root:
+#   python benchmarks/bench_store.py [bank size]
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from mcq import loaders, store  # noqa: E402
+
+TOPICS = 40
+
+
+def _ms(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def _median_ms(fn, repeats=20):
+    return statistics.median(_ms(fn)[0] for _ in range(repeats))
+
+
+def _memory(fn):
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rows = make_rows(n)
+    rows[0] += ["Topic", "Difficulty"]
+    for i, row in enumerate(rows[1:]):
+        row += [f"topic {i % TOPICS}", str(1 + i % 5)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = store.QuestionStore(os.path.join(tmp, "questions.db"))
+        import_ms, _ = _ms(lambda: db.import_rows("Fungi", rows[0], rows[1:]))
+        unchanged_ms, unchanged = _ms(lambda: db.import_rows("Fungi", rows[0], rows[1:]))
+        edited = [list(r) for r in rows]
+        for r in edited[1::100]:
+            r[1] = r[1] + " (revised)"
+        refresh_ms, refreshed = _ms(lambda: db.import_rows("Fungi", edited[0], edited[1:]))
+        db_size = os.path.getsize(db.path)
+
+        in_memory, _ = _memory(lambda: loaders.questions_from_payload([r[:7] for r in rows]))
+        stored_memory, bank = _memory(lambda: db.bank("Fungi"))
+        open_ms = _median_ms(lambda: db.bank("Fungi"), repeats=5)
+
+        rng = random.Random(1)
+        positions = [rng.randrange(n) for _ in range(2_000)]
+        t0 = time.perf_counter()
+        for p in positions:
+            bank[p].text
+        random_us = (time.perf_counter() - t0) / len(positions) * 1e6
+        t0 = time.perf_counter()
+        for p in range(0, min(n, 20_000)):
+            bank[p].options
+        sequential_us = (time.perf_counter() - t0) / min(n, 20_000) * 1e6
+
+        unseen_ms = _median_ms(lambda: db.random_unseen(bank, 20))
+        topic_ms = _median_ms(lambda: db.random_unseen(bank, 20, topic="topic 7", difficulty=3))
+        # mark 95% as seen: probing mostly misses and falls back to the index
+        db.mark_seen("Fungi", [q for i, q in enumerate(bank.qns()) if i % 20])
+        sparse_ms = _median_ms(lambda: db.random_unseen(bank, 20))
+        sparse = db.random_unseen(bank, 20)
+        assert len(sparse) == 20 and all(i % 20 == 0 for i in map(bank.index_of, sparse.qns()))
+
+        pages_ms, pages = _ms(lambda: sum(1 for _ in db.pages("Fungi", 1_000)))
+
+    print(f"{n} questions, {TOPICS} topics, 5 difficulties; database {db_size / 1e6:.1f} MB")
+    print(f"import:               {import_ms:8.0f} ms")
+    print(f"re-import, unchanged: {unchanged_ms:8.0f} ms ({unchanged[0]} rows written)")
+    print(f"refresh, 1% edited:   {refresh_ms:8.0f} ms ({refreshed[0]} rows written)")
+    print(f"open StoredBank:      {open_ms:8.1f} ms, {stored_memory / 1e6:.1f} MB "
+          f"(in-memory QuestionBank: {in_memory / 1e6:.1f} MB)")
+    print(f"bank[i].text:         {random_us:8.1f} us random, {sequential_us:.2f} us sequential")
+    print(f"20 random unseen:     {unseen_ms:8.2f} ms; one topic + difficulty: {topic_ms:.2f} ms; "
+          f"with 95% seen: {sparse_ms:.2f} ms")
+    print(f"paged iteration:      {pages_ms:8.0f} ms for {pages} pages of 1000")
+
+
+if __name__ == "__main__":
+    main()
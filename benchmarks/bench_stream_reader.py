@@ -0,0 +1,76 @@
+# Streaming reader vs pd.read_excel on a generated 50k-row .ods (and .xlsx).
+#
+# Each measurement runs in a fresh interpreter so peak RSS is not polluted by
+# the other runs. Reported per reader:
+#   first question   time from start of the load until question 1 is available
+#   total            time until the whole bank is loaded
+#   peak RSS         ru_maxrss of the child process
+#
+# Run from the repo root:
+#   python benchmarks/bench_stream_reader.py [rows]
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def child(reader, path):
+    """Runs one load in this process and prints a JSON result line."""
+    import contextlib
+    import io
+
+    from mcq import loaders, stream_reader
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        if reader == "stream":
+            batches = stream_reader.iter_question_batches(path)
+            first_batch = next(batches)
+            first = time.perf_counter() - t0
+            n = len(first_batch) + sum(len(b) for b in batches)
+        else:
+            bank = loaders.parse_spreadsheet_pandas(path)
+            first = time.perf_counter() - t0
+            n = len(bank)
+        total = time.perf_counter() - t0
+
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"first": first, "total": total, "peak_kib": peak_kib, "n": n}))
+
+
+def main():
+    from benchmarks.synthetic import make_rows, write_ods, write_xlsx
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rows = make_rows(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {"ods": os.path.join(tmp, "bank.ods"), "xlsx": os.path.join(tmp, "bank.xlsx")}
+        write_ods(files["ods"], rows)
+        write_xlsx(files["xlsx"], rows)
+
+        print(f"{n} rows")
+        print(f"{'file':<6} {'reader':<8} {'first question':>15} {'total':>10} {'peak RSS':>10}")
+        for kind, path in files.items():
+            for reader in ("pandas", "stream"):
+                out = subprocess.check_output(
+                    [sys.executable, __file__, "--child", reader, path], cwd=ROOT, text=True
+                )
+                r = json.loads(out.strip().splitlines()[-1])
+                assert r["n"] == n, r
+                print(f"{kind:<6} {reader:<8} {r['first'] * 1000:>13.1f}ms {r['total']:>9.2f}s "
+                      f"{r['peak_kib'] / 1024:>7.0f} MiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
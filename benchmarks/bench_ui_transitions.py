@@ -0,0 +1,54 @@
+# Plays a whole quiz through main.main() on a headless ft.Page and reports
+# what each kind of transition sends to the Flet client (controls added /
+# removed, properties set, bytes), averaged per click.
+#
+# Run from the repo root:
+#   python benchmarks/bench_ui_transitions.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    os.environ.setdefault("MCQ_CACHE_DIR", tempfile.mkdtemp(prefix="mcq-bench-"))
+    os.environ["MCQ_ANSWER_LOG"] = "0"
+    # scripted clicks come faster than any user: no debouncing
+    os.environ["MCQ_DEBOUNCE_MS"] = "0"
+    import main as app
+    from mcq import ui_metrics
+    from mcq.registry import REGISTRY
+
+    # stay offline: no background refresh
+    REGISTRY.refresh_in_background = lambda *args, **kwargs: None
+    REGISTRY.schedule_refresh = lambda *args, **kwargs: None
+
+    page = ui_metrics.headless_page()
+    meter = ui_metrics.UpdateMeter().attach(page)
+    ui_metrics.meter_from_env = lambda page: meter
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.main(page)
+
+    column = page.controls[0].content
+    radio_group, actions = column.controls[3], column.controls[5]
+    while actions.controls[0].text != "Start Over":
+        radio_group.value = "option A"
+        actions.controls[0].on_click(None)  # check
+        actions.controls[0].on_click(None)  # next
+    actions.controls[0].on_click(None)  # restart
+
+    print(f"{'transition':<10} {'clicks':>6} {'added':>7} {'removed':>8} {'props':>7} {'bytes':>8}")
+    for label, s in meter.summary().items():
+        n = s["batches"]
+        print(f"{label:<10} {n:>6} {s['added'] / n:>7.1f} {s['removed'] / n:>8.1f} "
+              f"{s['props'] / n:>7.1f} {s['bytes'] / n:>8.1f}")
+    print(f"total bytes sent: {page.connection.bytes_sent}")
+
+
+if __name__ == "__main__":
+    main()
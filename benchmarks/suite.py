@@ -0,0 +1,240 @@
+# Offline benchmark suite: bank loading and quiz click handling.
+#
+# Everything runs against local data: synthetic banks written as mock CSV,
+# .ods, .xlsx and served as JSON by mcq.stub_server, so no network access is
+# needed and runs are comparable between machines and commits.
+#
+#   load   load_questions_from_excel() for every format and size. The remote
+#          bank is tried first, as in the app; for the file formats the stub
+#          answers 404 so the call falls through to the file. "cold" starts
+#          from an empty cache dir, "warm" is the next call (compiled-cache
+#          hit for spreadsheets, "not modified" for JSON).
+#   click  main.main() on a headless ft.Page; a whole quiz is played through
+#          the real check / next / restart handlers, timing every click and
+#          counting what its page.update() sends.
+#
+# Results are written as JSON (one record per benchmark/case/size). Pass
+# --compare with an earlier file to print the change in median time.
+#
+# Run from the repo root:
+#   python benchmarks/suite.py [--sizes 100,1000,10000] [--repeats 5]
+#                              [--quiz-size 200] [--out bench_results.json]
+#                              [--compare old.json]
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_rows, write_ods, write_xlsx  # noqa: E402
+from mcq.stub_server import StubBankServer  # noqa: E402
+
+FORMATS = ("csv", "ods", "xlsx", "json")
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _stats(samples_s):
+    ms = sorted(s * 1000 for s in samples_s)
+    return {
+        "median_ms": round(statistics.median(ms), 4),
+        "min_ms": round(ms[0], 4),
+        "p95_ms": round(ms[math.ceil(len(ms) * 0.95) - 1], 4),
+    }
+
+
+def _csv_text(rows):
+    out = io.StringIO()
+    csv.writer(out).writerows(rows)
+    return out.getvalue()
+
+
+def bench_load(app, server, sizes, repeats, workdir):
+    """Times load_questions_from_excel for every format/size, cold and warm."""
+    from mcq import bank_cache
+
+    # warm-up: the first call pays for importing requests
+    with _quiet():
+        app.load_questions_from_excel(None)
+
+    results = []
+    for size in sizes:
+        rows = make_rows(size, seed=size)
+        paths = {"ods": os.path.join(workdir, f"bank{size}.ods"),
+                 "xlsx": os.path.join(workdir, f"bank{size}.xlsx")}
+        write_ods(paths["ods"], rows)
+        write_xlsx(paths["xlsx"], rows)
+
+        for fmt in FORMATS:
+            if fmt == "json":
+                server.set_rows("Fungi", rows)
+            else:
+                server.banks.pop("Fungi", None)  # 404: fall through to the file
+            if fmt == "csv":
+                app.MOCK_EXCEL_DATA = _csv_text(rows)
+            filepath = paths.get(fmt)
+
+            cold, warm = [], []
+            n = 0
+            for _ in range(repeats):
+                bank_cache.CACHE_DIR = tempfile.mkdtemp(dir=workdir)
+                with _quiet():
+                    t0 = time.perf_counter()
+                    n = len(app.load_questions_from_excel(filepath))
+                    t1 = time.perf_counter()
+                    app.load_questions_from_excel(filepath)
+                    t2 = time.perf_counter()
+                cold.append(t1 - t0)
+                warm.append(t2 - t1)
+
+            for case, samples in (("cold", cold), ("warm", warm)):
+                if fmt == "csv" and case == "warm":
+                    continue  # the mock CSV isn't cached; warm == cold
+                results.append({"benchmark": "load", "case": f"{fmt}-{case}", "size": size,
+                                "questions": n, **_stats(samples)})
+    return results
+
+
+def bench_clicks(app, quiz_size, repeats):
+    """Plays whole quizzes through main.main() and times each handler call."""
+    from mcq import loaders, remote, ui_metrics
+    from mcq.registry import BankRegistry
+
+    bank = loaders.questions_from_payload(make_rows(quiz_size, seed=1))
+    timings = {}
+    meter = ui_metrics.UpdateMeter()
+    ui_metrics.meter_from_env = lambda page: meter
+
+    for _ in range(repeats):
+        # a private, already-fresh registry: no load, no fetch, no timer
+        app.REGISTRY = BankRegistry()
+        app.REGISTRY.publish(remote.BANK_NAME, bank)
+        app.REGISTRY.schedule_refresh = lambda *args, **kwargs: None
+
+        page = ui_metrics.headless_page()
+        meter.attach(page)
+        meter.begin("init")
+        with _quiet():
+            app.main(page)
+
+        column = page.controls[0].content
+        radio_group, actions = column.controls[3], column.controls[5]
+
+        def click(label):
+            t0 = time.perf_counter()
+            actions.controls[0].on_click(None)
+            timings.setdefault(label, []).append(time.perf_counter() - t0)
+
+        i = 0
+        while actions.controls[0].text != "Start Over":
+            # alternate right and wrong answers so both feedback paths run
+            q = bank[i]
+            radio_group.value = q.answer if i % 2 else "option A" if q.answer != "option A" else "option B"
+            click("check")
+            click("next")
+            i += 1
+        click("restart")
+
+    summary = meter.summary()
+    results = []
+    for label, samples in timings.items():
+        s = summary[label]
+        n = s["batches"]
+        results.append({
+            "benchmark": "click", "case": label, "size": quiz_size, "clicks": len(samples),
+            **_stats(samples),
+            "bytes": round(s["bytes"] / n, 1), "props": round(s["props"] / n, 1),
+            "added": round(s["added"] / n, 1), "removed": round(s["removed"] / n, 1),
+        })
+    return results
+
+
+def _meta(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": args.sizes,
+        "repeats": args.repeats,
+        "quiz_size": args.quiz_size,
+    }
+
+
+def _key(r):
+    return r["benchmark"], r["case"], r["size"]
+
+
+def print_results(results, baseline=None):
+    old = {_key(r): r for r in (baseline or [])}
+    print(f"{'benchmark':<8} {'case':<12} {'size':>6} {'median ms':>10} {'p95 ms':>9} {'bytes':>8}"
+          + (f" {'vs base':>8}" if baseline else ""))
+    for r in results:
+        line = (f"{r['benchmark']:<8} {r['case']:<12} {r['size']:>6} {r['median_ms']:>10.3f} "
+                f"{r['p95_ms']:>9.3f} {r.get('bytes', ''):>8}")
+        if baseline:
+            prev = old.get(_key(r))
+            if prev and prev["median_ms"]:
+                line += f" {r['median_ms'] / prev['median_ms']:>7.2f}x"
+            else:
+                line += f" {'new':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite: bank loading and quiz click handling.")
+    parser.add_argument("--sizes", default="100,1000,10000",
+                        type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quiz-size", type=int, default=200)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+    out = os.path.abspath(args.out)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    with tempfile.TemporaryDirectory(prefix="mcq-bench-") as workdir, \
+            StubBankServer() as server:
+        # remote.BANK_URL and the cache dir are read at import time
+        os.environ["MCQ_BANK_URL"] = server.url
+        os.environ["MCQ_CACHE_DIR"] = workdir
+        # scripted clicks come faster than any user: no debouncing
+        os.environ["MCQ_DEBOUNCE_MS"] = "0"
+        os.chdir(workdir)  # device_id.txt lands here, not in the repo
+        import main as app
+
+        results = bench_load(app, server, args.sizes, args.repeats, workdir)
+        results += bench_clicks(app, args.quiz_size, args.repeats)
+
+        os.chdir(ROOT)
+
+    print_results(results, baseline)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"meta": _meta(args), "results": results}, f, indent=1)
+    print(f"results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
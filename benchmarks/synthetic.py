@@ -0,0 +1,122 @@
+# Synthetic question banks for the benchmarks.
+
+import random
+
+HEADER = ["QN", "Question", "A", "B", "C", "D", "Answer"]
+
+_WORDS = (
+    "algae fungi spore hypha chitin thallus mycelium lichen cell wall pigment "
+    "chlorophyll diatom kelp yeast mould zygote gamete flagella cyst plankton "
+    "nucleus vacuole plastid starch agar carrageenan symbiosis parasite host"
+).split()
+
+
+def make_rows(n, seed=0, invalid_every=0):
+    """
+    Returns a list-of-lists bank (header row first) with `n` data rows.
+
+    Every `invalid_every`-th row gets a bad answer key, to exercise the skip path.
+    """
+    rng = random.Random(seed)
+    rows = [list(HEADER)]
+    for qn in range(1, n + 1):
+        question = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 14))) + "?"
+        options = [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4))) for _ in range(4)]
+        answer = rng.choice("ABCD")
+        if invalid_every and qn % invalid_every == 0:
+            answer = "E"
+        rows.append([str(qn), f" {question} ", *options, answer.lower() if qn % 3 else answer])
+    return rows
+
+
+def _xml_escape(value):
+    return (str(value).replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def write_ods(path, rows):
+    """Writes rows as a minimal single-sheet .ods file (QN as numbers, the rest as text)."""
+    import zipfile
+
+    def cell(value):
+        if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+            n = int(value)
+            return (f'<table:table-cell office:value-type="float" office:value="{n}">'
+                    f'<text:p>{n}</text:p></table:table-cell>')
+        return (f'<table:table-cell office:value-type="string">'
+                f'<text:p>{_xml_escape(value)}</text:p></table:table-cell>')
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo("mimetype"), "application/vnd.oasis.opendocument.spreadsheet")
+        zf.writestr("META-INF/manifest.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+            '<manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+            '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+            '</manifest:manifest>'
+        ))
+        with zf.open("content.xml", "w") as f:
+            f.write((
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<office:document-content'
+                ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+                ' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"'
+                ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+                '<office:body><office:spreadsheet><table:table table:name="Question">'
+            ).encode("utf-8"))
+            for row in rows:
+                f.write(("<table:table-row>" + "".join(cell(v) for v in row)
+                         + "</table:table-row>").encode("utf-8"))
+            f.write(b"</table:table></office:spreadsheet></office:body></office:document-content>")
+
+
+def write_xlsx(path, rows):
+    """Writes rows as a minimal single-sheet .xlsx file with inline strings."""
+    import zipfile
+
+    def col_name(i):
+        name = ""
+        i += 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            name = chr(65 + r) + name
+        return name
+
+    def cell(ref, value):
+        if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+            return f'<c r="{ref}"><v>{int(value)}</v></c>'
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{_xml_escape(value)}</t></is></c>'
+
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    rel_ns = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+    pkg_ns = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'
+        ))
+        zf.writestr("_rels/.rels", (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships {pkg_ns}>'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+        zf.writestr("xl/workbook.xml", (
+            f'<?xml version="1.0" encoding="UTF-8"?><workbook {ns} {rel_ns}>'
+            '<sheets><sheet name="Question" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships {pkg_ns}>'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ))
+        with zf.open("xl/worksheets/sheet1.xml", "w") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?><worksheet {ns}><sheetData>'.encode("utf-8"))
+            for r, row in enumerate(rows, start=1):
+                cells = "".join(cell(f"{col_name(c)}{r}", v) for c, v in enumerate(row))
+                f.write(f'<row r="{r}">{cells}</row>'.encode("utf-8"))
+            f.write(b"</sheetData></worksheet>")
@@ -1,13 +1,23 @@
 # To run this file, you must have flet and pandas installed:
 # pip install flet pandas openpyxl
+#
+# pandas and requests are imported lazily (see mcq/loaders.py) so app startup
+# doesn't pay for them unless a spreadsheet has to be parsed or fetched. The
+# optional parts of the app (SQLite store, dedup, answer log, item stats,
+# spaced order, search, images, review screen) are imported where they are
+# first used, so importing main only loads what the first question needs.
 
+import base64
 import flet as ft
-import pandas as pd
-import io
 import os
-import requests
-import uuid
+import threading
+import time
+from mcq import exam_timer, instrument, loaders, quiz, quiz_session, remote, render, sync, ui_metrics
+from mcq.question_bank import OPTION_KEYS
+from mcq.quiz_session import QuizSession
+from mcq.registry import REGISTRY
 FILE_PATH = "src/MCQ_files/mcq_algae.ods"
+SEARCH_RESULTS = 8
 
 # --- 1. MOCK DATA & DATA LOADING ---
 
@@ -20,6 +30,7 @@ QN,Question,A,B,C,D,Answer
 3,Which planet is known as the Red Planet?,Venus,Mars,Jupiter,Saturn,B
 4,Who wrote 'To Kill a Mockingbird'?,J.K. Rowling,Ernest Hemingway,Harper Lee,F. Scott Fitzgerald,C
 """
+@instrument.timed("device_id")
 def get_system_uuid():
    # Define a file path for storing the device ID
     # The actual path might differ slightly on a real Android device
@@ -32,6 +43,7 @@ def get_system_uuid():
             device_id = f.read()
     else:
         # Generate a new unique ID and save it
+        import uuid
         device_id = str(uuid.uuid4())
         with open(id_file, "w") as f:
             f.write(device_id)
@@ -43,90 +55,125 @@ def load_questions_from_excel(filepath=None):
     Loads questions from an Excel file or uses the mock data if no filepath is provided.
     
     Loads data using the specified column headers: SN, Question, A, B, C, D, Answer.
+    The remote bank is tried first (with timeouts); this call blocks until it answers,
+    so the app itself renders from the shared local bank and refreshes it in the
+    background (see main()).
     """
-    
-    try:
-        url = "https://script.google.com/macros/s/AKfycbxoqcO6l-xxXvvgvSYGzQ5fwkLoTXFqnIr2Xp4-x152crVv9wvSUeNUSUdSnT_Gd_Xd/exec" #Replace with your actual URL
-        params = {
-                "userId": f"{get_system_uuid()}",
-                "filename": 'Fungi'
-            }
-        print(get_system_uuid())
-        response = requests.get(url, params=params)
-
-        print(f"Status Code: {response.status_code} {response.status_code == 200}")
-    except requests.ConnectionError:
-        is_connected = False
-        
+    from mcq import dedup
 
-    if response.status_code == 200:
-        # print(response.json())
-        questions= response.json()['questions']
-        columns = questions[0]
-        data = questions[1:]
-        df = pd.DataFrame(data, columns=columns)
-        
-    
-    elif filepath and filepath.endswith(('.xlsx', '.ods')):
+    questions = remote.fetch_remote_questions(get_system_uuid())
+    if questions:
+        return dedup.dedup_on_load(questions)
+    return dedup.dedup_on_load(_load_file_questions(filepath))
+
+
+def load_local_questions(filepath=None, on_complete=None):
+    """
+    Loads a bank without touching the network, for the first render.
+
+    Prefers the local synced copy of the remote bank, then the spreadsheet,
+    then the mock data. With `on_complete` a spreadsheet that isn't cached
+    yet returns its first questions at once and on_complete(bank) gets the
+    whole bank when the rest is read (not with MCQ_STORE, where a partial
+    bank would replace the stored one).
+    """
+    from mcq import dedup, store
+
+    if store.ENABLED:
+        # with MCQ_STORE the database is the bank; rows are read as they're shown
+        stored = store.shared_store().bank(remote.BANK_NAME)
+        if stored:
+            return stored
+    questions = sync.load_local_questions(remote.BANK_NAME)
+    if questions:
+        return _stored(dedup.dedup_on_load(questions))
+    if on_complete is not None and not store.ENABLED:
+        def rest(bank):
+            on_complete(dedup.dedup_on_load(bank))
+
+        return dedup.dedup_on_load(_load_file_questions(filepath, rest))
+    return _stored(dedup.dedup_on_load(_load_file_questions(filepath)))
+
+
+def _stored(questions):
+    """With MCQ_STORE set, upserts `questions` into the store and returns the stored bank."""
+    from mcq import store
+
+    if not store.ENABLED or not questions:
+        return questions
+    shared = store.shared_store()
+    shared.upsert_bank(remote.BANK_NAME, questions)
+    return shared.bank(remote.BANK_NAME)
+
+
+def _load_file_questions(filepath=None, on_complete=None):
+    if filepath and filepath.endswith(('.xlsx', '.ods')):
         try:
-            # Assuming the user is running this locally and can access an actual file
-            df = pd.read_excel(filepath, dtype=str)
+            # Assuming the user is running this locally and can access an actual file.
+            # The parsed bank is cached on disk so later launches skip pandas.
+            if on_complete is not None:
+                return loaders.load_spreadsheet_progressively(filepath, on_complete)
+            return loaders.load_spreadsheet(filepath)
         except Exception as e:
             print(f"Error reading Excel file: {e}. Using mock data instead.")
-            df = pd.read_csv(io.StringIO(MOCK_EXCEL_DATA))
+            return loaders.questions_from_csv(MOCK_EXCEL_DATA)
     else:
         # Use mock data (CSV in memory) for guaranteed runnability
-        df = pd.read_csv(io.StringIO(MOCK_EXCEL_DATA))
-    
-    # Ensure mandatory columns exist
-    required_cols = ['Question', 'A', 'B', 'C', 'D', 'Answer']
-    if not all(col in df.columns for col in required_cols):
-        print("Error: DataFrame missing required columns (Question, A, B, C, D, Answer).")
-        return []
-        
-    questions = []
-    
-    for index, row in df.iterrows():
-        # Map user's column names to internal structure keys
-        answer_key = str(row['Answer']).strip().upper()
-        
-        # We map the single letter answer (A, B, C, D) to the full string 
-        # ('option A', 'option B', etc.) that the RadioGroup uses for its value.
-        if answer_key in ['A', 'B', 'C', 'D']:
-            formatted_answer = "option " + answer_key
-        else:
-            print(f"Warning: Skipping question {row.get('SN', index+1)} due to invalid answer key.")
-            continue
-
-        q = {
-            "qn": int(str(row['QN']).strip()),
-            "question": str(row['Question']).strip(),
-            "options": {
-                "option A": str(row['A']).strip(),
-                "option B": str(row['B']).strip(),
-                "option C": str(row['C']).strip(),
-                "option D": str(row['D']).strip(),
-            },
-            "answer": formatted_answer,
-        }
-        questions.append(q)
-        
-    return questions
+        return loaders.questions_from_csv(MOCK_EXCEL_DATA)
+
+def _fetch_remote_bank():
+    from mcq import dedup
+
+    return _stored(dedup.dedup_on_load(remote.fetch_remote_questions(get_system_uuid())))
+
+
+def _complete_bank(questions):
+    """The rest of a progressively loaded sheet: swapped in for every session."""
+    REGISTRY.complete(remote.BANK_NAME, questions)
 
 # --- 2. MAIN APPLICATION FUNCTION (Functional Style) ---
 
 def main(page: ft.Page):
+    from mcq import answer_log, item_stats, scheduler, search, store
+
+    started = time.perf_counter()
+
     # --- State Management (local variables) ---
-    questions = load_questions_from_excel(filepath=FILE_PATH) 
+    # Render from the local bank right away; the remote bank is fetched in the
+    # background and swapped in when it arrives (see _swap_bank). The bank is
+    # loaded once per process and shared read-only by every session. An
+    # uncached sheet shows its first questions while the rest is read (not
+    # for a sampled quiz, which should draw from the whole bank).
+    questions = REGISTRY.get(remote.BANK_NAME, lambda: load_local_questions(
+        filepath=FILE_PATH, on_complete=None if quiz.ENABLED else _complete_bank))
     if not questions:
         page.add(ft.Text("Could not load any questions. Check your Excel file format."))
         page.update()
         return
 
-    # Using lists to make variables mutable within nested functions (if needed), 
-    # but for simple values, we'll just modify them directly in the scope.
-    current_q_index = 0
-    score = 0
+    # With MCQ_QUIZ_SIZE=k the session asks its own seeded sample of k questions
+    # (options shuffled), a view over the shared bank. A refreshed bank is
+    # used from the next round (Start Over) on, not swapped in mid-quiz.
+    quiz_bank = questions
+    if quiz.ENABLED:
+        quiz_seed = quiz.new_seed()
+        print(f"Quiz seed: {quiz_seed}")
+        questions = quiz.generate(quiz_bank, quiz.QUIZ_SIZE, quiz_seed)
+
+    # A downloaded bank waiting for the next question transition
+    pending_bank = None
+    bank_lock = threading.Lock()
+
+    # With MCQ_ORDER=spaced the next question comes from the spaced-repetition
+    # scheduler instead of file order; a round still asks len(questions) questions.
+    review = None
+    if scheduler.ENABLED:
+        review = scheduler.Scheduler(scheduler.state_for(remote.BANK_NAME), questions)
+
+    # Position, score and the answers given live in a UI-free QuizSession;
+    # the handlers below drive it and redraw from it.
+    session = QuizSession(questions, order=review)
+    session.start()
     
     # --- UI References ---
     question_text = ft.Ref[ft.Text]()
@@ -134,80 +181,294 @@ def main(page: ft.Page):
     feedback_message = ft.Ref[ft.Text]()
     check_button = ft.Ref[ft.ElevatedButton]()
     
+    # The four option radios are created once and reused for every question.
+    # Only their labels change (and the group's disabled flag), so page.update()
+    # sends a small property patch instead of a new subtree on each transition.
+    # The key (e.g., 'option A') is the `value` of the Radio button.
+    option_radios = [
+        ft.Radio(value=key, label="", fill_color=ft.Colors.INDIGO_ACCENT_700)
+        for key in OPTION_KEYS
+    ]
+
     # RadioGroup instance (needs to be directly accessible, not just a Ref)
-    radio_options = ft.RadioGroup(content=ft.Column())
+    radio_options = ft.RadioGroup(content=ft.Column(list(option_radios)), disabled=False)
     
     # Actions Row (needs to be directly accessible to change buttons)
     actions = ft.Row(alignment=ft.MainAxisAlignment.CENTER)
 
+    # Counts controls/bytes sent per transition when MCQ_UI_METRICS=1
+    meter = ui_metrics.meter_from_env(page)
+    # Handlers touch() the controls they change; each click is sent as one
+    # page.update() of just those controls, and double clicks are dropped
+    renderer = render.renderer_for(page)
+    # Times every page.update() (and shows the debug overlay) when MCQ_TIMINGS is set
+    instrument.attach(page)
+    # Every checked answer is logged locally and uploaded in batches off the UI thread
+    if answer_log.ENABLED:
+        answers = answer_log.shared_log(get_system_uuid(), remote.BANK_URL)
+    else:
+        answers = answer_log.NullLog()
+    # Per-question p-value / discrimination / distractor sums, updated on every check
+    item_session = item_stats.new_session(remote.BANK_NAME)
+    shown_at = time.perf_counter()
+
+    # Search panel: one index per bank for the whole process, cached on disk and
+    # updated in the background whenever a bank loads or refreshes. The panel is
+    # only sent to the client the first time it's opened; the result buttons
+    # are pooled like the radios.
+    search_index = search.shared_index(remote.BANK_NAME)
+    search_status = ft.Text("", size=12, color=ft.Colors.GREY_600)
+    result_buttons = [
+        ft.TextButton("", visible=False, on_click=lambda e: _open_result(e.control.data))
+        for _ in range(SEARCH_RESULTS)
+    ]
+    search_panel = ft.Column(
+        [
+            ft.TextField(
+                hint_text="Search questions and options",
+                dense=True,
+                on_change=lambda e: _search_changed(e.control.value),
+            ),
+            search_status,
+            *result_buttons,
+        ],
+        visible=False,
+    )
+
+    # Question images are loaded (and downscaled into a disk cache) only when a
+    # question that has one is shown; the image of the question that comes next
+    # is prefetched as soon as that is known (see QuizSession.upcoming).
+    # The cache (and Pillow behind it) is set up for the first image.
+    thumbs = None
+    question_image = ft.Image(
+        src_base64="", visible=False, height=220, fit=ft.ImageFit.CONTAIN, border_radius=8
+    )
+
+    # Review screen after the final score: the radio value given per qn this
+    # round, shown in a paged list of recycled rows built on first use.
+    review_screen = None
+
+    # Exam mode (MCQ_EXAM_SECONDS / MCQ_QUESTION_SECONDS): countdowns next to the
+    # score, driven by the process-wide exam clock. It redraws only timer_text,
+    # at most once a second, and submits / moves on when time runs out.
+    timer_text = ft.Text("", color=ft.Colors.RED_700, visible=exam_timer.ENABLED)
+    countdown = None
+    if exam_timer.ENABLED:
+        countdown = exam_timer.shared_clock().countdown(lambda text: _timer_tick(text), lambda kind: _time_up(kind))
+
     # --- Helper Functions ---
 
     def _update_score_display():
         """Updates the score text in the top corner."""
-        score_display.current.value = f"Question: {current_q_index + 1 if current_q_index < len(questions) else len(questions)} / {len(questions)} | Score: {score}"
+        progress, n = session.progress, len(session.questions)
+        score_display.current.value = f"Question: {progress + 1 if progress < n else n} / {n} | Score: {session.score}"
     
     def _update_options_content():
         """Updates the radio buttons based on the current question."""
-        current_q = questions[current_q_index]
-        option_widgets = []
-        
-        # The key (e.g., 'option A') is the `value` of the Radio button
-        for key, text in current_q["options"].items():
-            option_widgets.append(
-                ft.Radio(
-                    value=key, 
-                    label=text,
-                    fill_color=ft.Colors.INDIGO_ACCENT_700
-                )
-            )
-        
-        radio_options.content.controls = option_widgets
+        current_q = session.current
+
+        for radio, text in zip(option_radios, current_q.options):
+            radio.label = text
+        radio_options.disabled = False
+
+        # Put the radios back if the final score replaced them
+        if radio_options.content.controls != option_radios:
+            radio_options.content.controls = list(option_radios)
         radio_options.value = None # Reset the selection
 
+    def _thumbs():
+        nonlocal thumbs
+        if thumbs is None:
+            from mcq import images
+
+            thumbs = images.shared_cache()
+        return thumbs
+
+    def _update_image():
+        """Shows the current question's image if it's cached, else loads it and shows it when ready."""
+        current = session.current
+        source = current.image if current is not None else ""
+        data = _thumbs().get(source) if source else None
+        if data is not None:
+            question_image.src_base64 = base64.b64encode(data).decode("ascii")
+        question_image.visible = data is not None
+        if source and data is None:
+            _thumbs().fetch(source, lambda data: _image_loaded(source, data))
+        _prefetch_upcoming()
+
+    def _prefetch_upcoming():
+        """Starts loading the image of the question next() will show, once that is known."""
+        upcoming = session.upcoming()
+        if upcoming is not None:
+            source = session.questions[upcoming].image
+            if source:
+                _thumbs().prefetch(source)
+
+    def _image_loaded(source, data):
+        """Worker-thread callback: shows the image if its question is still on screen."""
+        with bank_lock:
+            current = session.current
+            showing = current is not None and current.image == source
+        if showing and data:
+            question_image.src_base64 = base64.b64encode(data).decode("ascii")
+            question_image.visible = True
+            renderer.touch(question_image)
+
+    def _timer_tick(text):
+        """Exam clock callback: redraws just the countdown."""
+        timer_text.value = text
+        try:
+            renderer.touch(timer_text)
+        except Exception:
+            pass  # the session is going away
+
+    def _time_up(kind):
+        """Exam clock callback: submits the question on screen, or ends the exam."""
+        if kind == "exam":
+            meter.begin("timeout")
+            with bank_lock:
+                session.finish()
+            with renderer.action("timeout"):
+                _update_ui()
+            return
+        with bank_lock:
+            pos = session.pos
+            unanswered = session.phase == quiz_session.QUESTION
+        if unanswered:
+            meter.begin("timeout")
+            with renderer.action("timeout"):
+                _submit(radio_options.value, timed_out=True)
+            exam_timer.shared_clock().call_later(exam_timer.FEEDBACK_SECONDS, lambda: _move_on(pos))
+
+    def _move_on(pos):
+        """Goes to the next question after a timed-out one, unless the user already did."""
+        if session.pos == pos and session.phase == quiz_session.ANSWERED:
+            # not through the click handler: its debounce would drop this
+            # when the user clicked anything in the last DEBOUNCE_SECONDS
+            meter.begin("next")
+            with renderer.action("next"):
+                _advance(pos)
+
     def _disable_options():
         """Disables all radio buttons after checking the answer."""
-        for radio in radio_options.content.controls:
-            radio.disabled = True
+        # disabled is inherited, so one flag on the group covers all four radios
+        radio_options.disabled = True
+
+    def _swap_bank(new_questions):
+        """Swaps in a freshly downloaded bank without moving the user off their current question."""
+        nonlocal pending_bank
+        search.update_in_background(search_index, new_questions)
+        with bank_lock:
+            current = session.current
+            if not quiz.ENABLED and current is not None:
+                new_index = remote.locate_question(new_questions, current.qn)
+                if new_index is not None and new_questions[new_index] == current:
+                    session.replace_bank(new_questions, new_index)
+                    pending_bank = None
+                    _update_score_display()
+                    renderer.touch(score_display.current)
+                    return
+            # The question on screen changed or the quiz is over:
+            # keep it and pick the new bank up at the next transition.
+            pending_bank = new_questions
 
+    @renderer.click("next")
+    @instrument.timed("ui.next")
     def _next_question_clicked(e):
-        nonlocal current_q_index
-        current_q_index += 1
+        meter.begin("next")
+        _advance()
+
+    def _advance(pos=None):
+        """
+        Moves on from the answered question (to the refreshed bank if one is
+        waiting); with `pos`, only if that is still the question on screen.
+        """
+        nonlocal pending_bank
+        with bank_lock:
+            if session.phase != quiz_session.ANSWERED or pos not in (None, session.pos):
+                return
+            if pending_bank is not None and not quiz.ENABLED:
+                # Continue the new bank after the question that was just answered
+                session.next(pending_bank, remote.index_after(pending_bank, session.current.qn))
+                pending_bank = None
+            else:
+                session.next()
         _update_ui()
 
+    @renderer.click("check")
+    @instrument.timed("ui.check")
     def _check_answer_clicked(e):
-        nonlocal score
+        meter.begin("check")
         
         if not radio_options.value:
             feedback_message.current.value = "Please select an option first."
             feedback_message.current.color = ft.Colors.AMBER_600
-            page.update()
+            renderer.touch(feedback_message.current)
             return
             
-        selected_key = radio_options.value
-        correct_answer_key = questions[current_q_index]["answer"]
-        
-        is_correct = selected_key == correct_answer_key
-        
+        _submit(radio_options.value)
+
+    def _submit(selected_key, timed_out=False):
+        """Grades the question on screen; `selected_key` is None if time ran out with nothing chosen."""
+        with bank_lock:
+            current_q = session.current
+            session.select(selected_key)
+            is_correct = session.check(timed_out)
+            if is_correct is not None and session.order is not None:
+                _prefetch_upcoming()  # the spaced order picks the next question only now
+        if is_correct is None:
+            return  # already checked, e.g. the time ran out during the click
+        if countdown is not None:
+            timer_text.value = countdown.stop_question()
+
         if is_correct:
-            score += 1
             feedback_message.current.value = "✅ Correct! Well done."
             feedback_message.current.color = ft.Colors.GREEN_700
         else:
-            correct_option_text = questions[current_q_index]["options"][correct_answer_key]
+            correct_option_text = current_q.correct_text
             feedback_message.current.value = f"❌ Incorrect. The correct answer was: {correct_option_text}"
             feedback_message.current.color = ft.Colors.RED_700
+        if timed_out:
+            feedback_message.current.value = "⏰ Time's up! " + feedback_message.current.value
             
         # Change button to 'Next Question'
         check_button.current.text = "Next Question >>"
         check_button.current.icon = ft.Icons.ARROW_FORWARD
         check_button.current.on_click = _next_question_clicked
         _disable_options() # Prevent changing the answer after checking
-        page.update()
+        renderer.touch(feedback_message.current, check_button.current, radio_options, timer_text)
+
+    def _record(event, s):
+        """QuizSession listener: logs every checked answer (answer log, item stats, store)."""
+        if event != quiz_session.CHECKED:
+            return
+        current_q = s.current
+        source_letter = current_q.source_key(OPTION_KEYS[s.selected])[-1] if s.selected >= 0 else ""
+        if store.ENABLED:
+            store.shared_store().mark_seen(remote.BANK_NAME, [current_q.qn])
+        answers.record(remote.BANK_NAME, current_q.qn, source_letter, s.correct,
+                       (time.perf_counter() - shown_at) * 1000)
+        item_session.observe(current_q.qn, source_letter, s.correct)
 
+    @renderer.click("restart")
+    @instrument.timed("ui.restart")
     def _restart_quiz(e):
-        nonlocal current_q_index, score
-        current_q_index = 0
-        score = 0
+        nonlocal quiz_bank, pending_bank, item_session
+        meter.begin("restart")
+        with bank_lock:
+            questions = None
+            if pending_bank is not None:
+                quiz_bank = questions = pending_bank
+                pending_bank = None
+            if quiz.ENABLED:
+                # a new round is a new quiz
+                quiz_seed = quiz.new_seed()
+                print(f"Quiz seed: {quiz_seed}")
+                questions = quiz.generate(quiz_bank, quiz.QUIZ_SIZE, quiz_seed)
+            session.restart(questions)
+        item_session = item_stats.new_session(remote.BANK_NAME)
+        if countdown is not None and exam_timer.EXAM_SECONDS:
+            timer_text.value = countdown.start_exam(exam_timer.EXAM_SECONDS)
         actions.controls = [
             ft.ElevatedButton(
                 "Check Answer", 
@@ -218,36 +479,128 @@ def main(page: ft.Page):
         ]
         _update_ui()
 
+    @renderer.click("search")
+    def _toggle_search(e):
+        column = quiz_container.content
+        if search_panel not in column.controls:
+            column.controls.append(search_panel)
+        search_panel.visible = not search_panel.visible
+        renderer.touch(column)
+
+    def _search_changed(query):
+        """Shows the best matches for `query` in the pooled result buttons."""
+        meter.begin("search")
+        with bank_lock:
+            bank = session.questions
+        hits = []
+        for qn, _ in search_index.search(query, limit=SEARCH_RESULTS * 2):
+            pos = bank.index_of(qn)
+            if pos is not None:  # the index may already hold a newer bank
+                hits.append((qn, bank[pos].text))
+            if len(hits) == SEARCH_RESULTS:
+                break
+
+        for button, hit in zip(result_buttons, hits + [None] * SEARCH_RESULTS):
+            button.visible = hit is not None
+            if hit is not None:
+                button.data = hit[0]
+                button.text = f"{hit[0]}. {hit[1][:80]}"
+        if not query.strip():
+            search_status.value = ""
+        elif not len(search_index):
+            search_status.value = "Indexing questions..."
+        else:
+            search_status.value = f"{len(hits)} result{'s' if len(hits) != 1 else ''}" if hits else "No matches"
+        renderer.touch(search_panel)
+
+    @renderer.click("search")
+    def _open_result(qn):
+        """Jumps the quiz to the question numbered `qn`."""
+        meter.begin("search")
+        with bank_lock:
+            pos = session.questions.index_of(qn)
+            if pos is None:
+                return
+            session.jump(pos)
+        if check_button.current not in actions.controls:
+            # the quiz was over: bring the check button back
+            actions.controls = [
+                ft.ElevatedButton(
+                    "Check Answer",
+                    icon=ft.Icons.CHECK_CIRCLE,
+                    on_click=_check_answer_clicked,
+                    ref=check_button
+                ),
+            ]
+        search_panel.visible = False
+        _update_ui()
+
+    @renderer.click("review")
+    def _review_answers(e):
+        """Shows every question of the round with the answer given and the right one."""
+        nonlocal review_screen
+        meter.begin("review")
+        if review_screen is None:
+            from mcq.review_list import ReviewList
+
+            review_screen = ReviewList(renderer=renderer)
+            quiz_container.content.controls.append(review_screen.control)
+        with bank_lock:
+            review_screen.show(session.questions, session.chosen())
+        review_screen.control.visible = True
+        renderer.touch(quiz_container.content)
+
     def _update_ui():
         """Updates all displayed elements for the current question or finishes the quiz."""
-        if current_q_index < len(questions):
-            question_text.current.value = questions[current_q_index]["question"]
+        nonlocal shown_at
+        if not session.finished:
+            shown_at = time.perf_counter()
+            question_text.current.value = session.current.text
+            _update_image()
             _update_options_content()
             feedback_message.current.value = ""
+            hide_review = review_screen is not None and review_screen.control.visible
+            if hide_review:
+                review_screen.control.visible = False
             
             # Ensure the button is set back to Check Answer for the new question
             if check_button.current: # Check if the button exists (it will after the first update)
                 check_button.current.text = "Check Answer"
                 check_button.current.on_click = _check_answer_clicked
                 check_button.current.icon = ft.Icons.CHECK_CIRCLE
+            if countdown is not None and exam_timer.QUESTION_SECONDS:
+                timer_text.value = countdown.start_question(exam_timer.QUESTION_SECONDS)
+            changed = [question_text.current, question_image, radio_options, feedback_message.current,
+                       check_button.current, timer_text, score_display.current]
+            if hide_review:
+                changed.append(review_screen.control)
 
         else:
             # Quiz finished
+            if countdown is not None:
+                timer_text.value = countdown.stop()
             question_text.current.value = "Quiz Complete! 🎉"
+            question_image.visible = False
             radio_options.content.controls = [
-                ft.Text(f"Final Score: {score} out of {len(questions)}", size=24)
+                ft.Text(f"Final Score: {session.score} out of {len(session.questions)}", size=24)
             ]
             actions.controls = [
                 ft.ElevatedButton(
                     "Start Over", 
                     icon=ft.Icons.RESTART_ALT, 
                     on_click=_restart_quiz
-                )
+                ),
+                ft.OutlinedButton(
+                    "Review Answers",
+                    icon=ft.Icons.LIST_ALT,
+                    on_click=_review_answers
+                ),
             ]
             feedback_message.current.value = ""
-            
+            changed = [quiz_container]
+
         _update_score_display()
-        page.update()
+        renderer.touch(*[c for c in changed if c is not None])
 
 
     # --- 3. UI Initialization ---
@@ -260,7 +613,7 @@ def main(page: ft.Page):
     
     # Initial control creation
     initial_question_text = ft.Text(
-        questions[0]["question"], 
+        session.current.text,
         size=20, 
         weight=ft.FontWeight.BOLD,
         text_align=ft.TextAlign.CENTER,
@@ -281,11 +634,20 @@ def main(page: ft.Page):
         content=ft.Column(
             [
                 ft.Container(
-                    content=ft.Text(ref=score_display),
+                    content=ft.Row(
+                        [
+                            ft.IconButton(ft.Icons.SEARCH, tooltip="Search", on_click=_toggle_search),
+                            ft.Row([timer_text, ft.Text(ref=score_display)]),
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN
+                    ),
                     padding=10,
                     alignment=ft.alignment.center_right
                 ),
-                initial_question_text,
+                ft.Column(
+                    [initial_question_text, question_image],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
                 ft.Divider(height=20),
                 radio_options,
                 ft.Divider(height=20),
@@ -294,7 +656,7 @@ def main(page: ft.Page):
                     ref=feedback_message, 
                     size=18, 
                     weight=ft.FontWeight.BOLD
-                )
+                ),
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=15
@@ -313,10 +675,38 @@ def main(page: ft.Page):
     )
 
     # Initial setup for options and score display
+    session.subscribe(_record)
+    _update_image()
     _update_options_content()
     _update_score_display()
+    if countdown is not None:
+        if exam_timer.EXAM_SECONDS:
+            timer_text.value = countdown.start_exam(exam_timer.EXAM_SECONDS)
+        if exam_timer.QUESTION_SECONDS:
+            timer_text.value = countdown.start_question(exam_timer.QUESTION_SECONDS)
     
     page.add(quiz_container)
+    first_render = time.perf_counter() - started
+    instrument.record("ui.first_render", int(first_render * 1e9))
+    print(f"Time to first question: {first_render * 1000:.1f} ms")
+
+    # One fetch per process however many sessions start at once, then every
+    # REFRESH_SECONDS; refreshed banks are pushed to each session's _swap_bank.
+    unsubscribe = REGISTRY.subscribe(remote.BANK_NAME, _swap_bank)
+    def _closed(e):
+        unsubscribe()
+        if countdown is not None:
+            countdown.cancel()
+
+    page.on_close = _closed
+    REGISTRY.refresh_in_background(remote.BANK_NAME, _fetch_remote_bank)
+    REGISTRY.schedule_refresh(remote.BANK_NAME, _fetch_remote_bank)
+    latest = REGISTRY.peek(remote.BANK_NAME)
+    if latest is not None and latest is not quiz_bank:
+        # the rest of the sheet arrived before this session subscribed
+        _swap_bank(latest)
+    else:
+        search.update_in_background(search_index, quiz_bank)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+# Helper modules for the MCQ quiz app (loading, caching and quiz logic).
+# main.py and the scripts in src/ import from here.
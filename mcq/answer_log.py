@@ -0,0 +1,268 @@
+# Append-only log of answered questions, uploaded in batches.
+#
+# Every checked answer becomes one JSON line. record() only appends to an
+# in-memory buffer, so the UI thread never waits on disk or network; a
+# single daemon worker per log
+#
+#   - appends the buffer to the log file (one write per flush interval)
+#   - uploads the lines past the upload cursor as one gzip-compressed POST
+#     to the bank endpoint, at most `batch_size` records per request
+#   - backs off exponentially (with jitter) while uploads fail
+#
+# The cursor (byte offset of the first line not yet accepted by the server)
+# is kept next to the log and replaced atomically, so a restart resumes
+# where the last run stopped. A batch can be re-sent if the app dies between
+# the server's answer and the cursor write; every record has a unique "id"
+# for the server to drop duplicates. Once everything is uploaded the log is
+# truncated; appends and the truncation share a lock, so a flush can't land
+# between the "drained?" check and the truncate.
+#
+# POST <url>?action=answers&userId=<device>
+#   Content-Encoding: gzip
+#   {"userId": ..., "answers": [{"id", "ts", "device", "bank", "qn",
+#                                "selected", "correct", "latency_ms"}, ...]}
+# A batch counts as accepted only on a 2xx whose JSON body has "ok": true
+# (Apps Script reports its errors as 200 HTML pages). The log is off unless
+# MCQ_ANSWER_LOG=1.
+
+import atexit
+import gzip
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+from mcq import bank_cache
+
+ENABLED = os.environ.get("MCQ_ANSWER_LOG", "") not in ("", "0")
+
+FLUSH_SECONDS = 2.0
+BATCH_SIZE = 200
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+
+# (connect, read) in seconds
+UPLOAD_TIMEOUT = (5, 20)
+
+
+def log_path_for(device_id, cache_dir=None):
+    safe = bank_cache.safe_name(device_id)
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, f"answers.{safe}.jsonl")
+
+
+class AnswerLog:
+    """Buffered, append-only answer log with a background uploader."""
+
+    def __init__(self, path, device_id, url, flush_seconds=FLUSH_SECONDS,
+                 batch_size=BATCH_SIZE, timeout=UPLOAD_TIMEOUT):
+        self.path = path
+        self.cursor_path = path + ".cursor"
+        self.device_id = device_id
+        self.url = url
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()  # appends vs. truncating the drained log
+        self._buffer = []           # encoded lines not yet written to the file
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._prefix = uuid.uuid4().hex[:12]
+        self._seq = 0
+
+        self._failures = 0
+        self._retry_at = 0.0
+        # uploads / upload_failures / records_uploaded, for benchmarks and debugging
+        self.stats = {"uploads": 0, "upload_failures": 0, "records_uploaded": 0}
+
+    # --- UI thread ---
+
+    def record(self, bank, qn, selected, correct, latency_ms):
+        """Queues one answer. Cheap: no I/O happens on the calling thread."""
+        with self._lock:
+            self._seq += 1
+            entry = {
+                "id": f"{self._prefix}-{self._seq}",
+                "ts": round(time.time(), 3),
+                "device": self.device_id,
+                "bank": bank,
+                "qn": qn,
+                "selected": selected,
+                "correct": bool(correct),
+                "latency_ms": round(latency_ms, 1),
+            }
+            self._buffer.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            if len(self._buffer) >= self.batch_size:
+                self._wake.set()
+
+    # --- worker ---
+
+    def start(self):
+        """Starts the worker (once); it also uploads anything left from earlier runs."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="answer-log", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, upload=False):
+        """Stops the worker and writes the buffer out; optionally tries one last upload."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        if upload:
+            self.upload_pending()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            if self._stopped:
+                break
+            try:
+                self.flush()
+                if time.monotonic() >= self._retry_at:
+                    self.upload_pending()
+            except Exception as e:
+                print(f"Answer log: {e}")
+
+    def flush(self):
+        """Appends the buffered lines to the log file in one write."""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._file_lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    def _read_cursor(self):
+        try:
+            with open(self.cursor_path, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_cursor(self, offset):
+        tmp = f"{self.cursor_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+        os.replace(tmp, self.cursor_path)
+
+    def pending(self):
+        """(records, start, end) of the next batch past the cursor; only complete lines."""
+        offset = start = self._read_cursor()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return [], start, start
+        if offset > size:
+            # the log was truncated after the cursor was last written
+            offset = start = 0
+            self._write_cursor(0)
+        records = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a line still being written
+                offset += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # a damaged line can't be fixed by retrying
+                if len(records) >= self.batch_size:
+                    break
+        return records, start, offset
+
+    def upload_pending(self):
+        """Uploads batches until the log is drained or a request fails. Returns records sent."""
+        sent = 0
+        while True:
+            records, start, end = self.pending()
+            if not records:
+                if end != start:
+                    self._write_cursor(end)  # skip damaged lines
+                self._truncate_if_drained()
+                return sent
+            if not self._post(records):
+                self._failures += 1
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self._failures - 1))
+                self._retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                return sent
+            self._failures = 0
+            self._retry_at = 0.0
+            self._write_cursor(end)
+            sent += len(records)
+            self.stats["records_uploaded"] += len(records)
+
+    def _post(self, records):
+        import requests
+
+        body = json.dumps({"userId": self.device_id, "answers": records},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            response = requests.post(
+                self.url,
+                params={"action": "answers", "userId": self.device_id},
+                data=gzip.compress(body),
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+                timeout=self.timeout,
+            )
+            ok = 200 <= response.status_code < 300 and _accepted(response)
+        except requests.RequestException as e:
+            print(f"Answer log: upload failed: {e}")
+            ok = False
+        self.stats["uploads" if ok else "upload_failures"] += 1
+        return ok
+
+    def _truncate_if_drained(self):
+        """Empties the log once the cursor has reached its end."""
+        with self._file_lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return
+            if size and self._read_cursor() == size:
+                # truncate first: a crash in between leaves cursor > size, read as 0
+                with open(self.path, "w", encoding="utf-8"):
+                    pass
+                self._write_cursor(0)
+
+
+def _accepted(response):
+    """True if the endpoint's answer is the JSON {"ok": true, ...}."""
+    try:
+        body = response.json()
+    except ValueError:
+        print(f"Answer log: upload not accepted: {response.text[:80]!r}")
+        return False
+    return isinstance(body, dict) and body.get("ok") is True
+
+
+class NullLog:
+    """Stand-in used when the answer log is off."""
+
+    def record(self, bank, qn, selected, correct, latency_ms):
+        pass
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_log(device_id, url, cache_dir=None):
+    """The process-wide AnswerLog for a device (started, stopped and flushed at exit)."""
+    path = log_path_for(device_id, cache_dir)
+    with _shared_lock:
+        log = _shared.get(path)
+        if log is None:
+            log = _shared[path] = AnswerLog(path, device_id, url).start()
+            atexit.register(log.stop)
+    return log
@@ -0,0 +1,185 @@
+# Compiled on-disk cache for question banks.
+#
+# Parsing an .ods/.xlsx file through pandas takes seconds on a phone, so the
+# first load writes the normalized questions to a small binary file. Later
+# launches read that file back directly and never touch pandas. The same file
+# format holds the app's other state (review order, item stats, search index),
+# named with safe_name() and saved through DebouncedSaver.
+
+import hashlib
+import marshal
+import os
+import struct
+import threading
+import zlib
+
+from mcq import instrument
+from mcq.question_bank import QuestionBank
+
+CACHE_DIR = os.environ.get("MCQ_CACHE_DIR", ".mcq_cache")
+
+# File layout: MAGIC | crc32(payload) | len(payload) | payload
+# payload = marshal.dumps((key, data)); for spreadsheet banks data is
+# QuestionBank.compact()
+_MAGIC = b"MCQBANK\x02"
+_HEADER = struct.Struct("<II")
+
+def file_digest(filepath):
+    """Returns the sha256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def safe_name(name):
+    """`name` with everything but letters, digits, "-" and "_" replaced by "_", for file names."""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(name))
+
+
+def cache_path_for(filepath, cache_dir=None):
+    """Returns where the compiled cache for `filepath` lives."""
+    abs_path = os.path.abspath(filepath)
+    name = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+    base = os.path.basename(filepath)
+    return os.path.join(cache_dir or CACHE_DIR, f"{base}.{name}.bank")
+
+
+def _source_key(filepath, digest=None):
+    st = os.stat(filepath)
+    return (
+        os.path.abspath(filepath),
+        st.st_mtime_ns,
+        st.st_size,
+        digest,
+        marshal.version,
+    )
+
+
+def read_cache(cache_file):
+    """
+    Reads a compiled cache file.
+
+    Returns (key, data), or None if the file is missing, truncated or corrupt.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    start = len(_MAGIC) + _HEADER.size
+    if len(blob) < start or not blob.startswith(_MAGIC):
+        return None
+    crc, length = _HEADER.unpack_from(blob, len(_MAGIC))
+    payload = blob[start:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        return None
+    try:
+        key, data = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    return tuple(key), data
+
+
+def write_cache(cache_file, key, data):
+    """Writes (key, data) atomically so a crash never leaves a half-written cache."""
+    payload = marshal.dumps((tuple(key), data))
+    blob = _MAGIC + _HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, cache_file)
+
+
+def is_fresh(filepath, cache_dir=None):
+    """True if the compiled cache of `filepath` matches the file's current stat."""
+    cached = read_cache(cache_path_for(filepath, cache_dir))
+    return cached is not None and cached[0] == _source_key(filepath, cached[0][3])
+
+
+def write_compiled(filepath, questions, cache_dir=None):
+    """Writes `questions` as the compiled cache of `filepath`; returns the cache file."""
+    cache_file = cache_path_for(filepath, cache_dir)
+    write_cache(cache_file, _source_key(filepath, file_digest(filepath)), questions.compact())
+    return cache_file
+
+
+def read_cached_bank(filepath, cache_dir=None):
+    """
+    Returns the cached QuestionBank for `filepath` if the cache is fresh, else None.
+
+    The cache is keyed by path, mtime, size and content hash: if only the
+    mtime changed (e.g. the file was touched or copied) but the contents
+    hash the same, the cached rows are reused and the key refreshed.
+    """
+    cache_file = cache_path_for(filepath, cache_dir)
+    with instrument.span("cache.read"):
+        cached = read_cache(cache_file)
+        if cached is None:
+            return None
+        key, data = cached
+        current = _source_key(filepath, key[3])
+        if key == current:
+            instrument.count("cache.hit")
+            return QuestionBank.from_compact(*data)
+        # stat changed - only rebuild if the contents really changed
+        digest = file_digest(filepath)
+        if digest == key[3] and key[4] == marshal.version:
+            try:
+                write_cache(cache_file, _source_key(filepath, digest), data)
+            except OSError:
+                pass
+            instrument.count("cache.hit")
+            return QuestionBank.from_compact(*data)
+    return None
+
+
+def save_compiled(filepath, questions, cache_dir=None):
+    """write_compiled() that only warns if the cache can't be written."""
+    try:
+        write_compiled(filepath, questions, cache_dir)
+    except OSError as e:
+        print(f"Warning: could not write question cache {cache_path_for(filepath, cache_dir)}: {e}")
+
+
+def load_cached_bank(filepath, parse, cache_dir=None):
+    """
+    Loads the QuestionBank for `filepath`, using the compiled cache when it is fresh.
+
+    `parse(filepath)` is only called on a cache miss and must return a
+    QuestionBank. Stale or corrupt caches are rebuilt (see read_cached_bank).
+    """
+    questions = read_cached_bank(filepath, cache_dir)
+    if questions is not None:
+        return questions
+    instrument.count("cache.miss")
+    questions = parse(filepath)
+    if questions:
+        save_compiled(filepath, questions, cache_dir)
+    return questions
+
+
+class DebouncedSaver:
+    """Runs save() on a timer thread a little after a change, once per burst of changes."""
+
+    def __init__(self, save):
+        self._save = save
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def soon(self, delay):
+        """Schedules save() in `delay` seconds unless one is already scheduled."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self):
+        with self._lock:
+            self._timer = None
+        self._save()
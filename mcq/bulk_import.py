@@ -0,0 +1,158 @@
+# Bulk import of spreadsheet banks.
+#
+# Parses and validates every .ods/.xlsx/.csv file under the given folders in
+# a pool of worker processes (one per core by default), with the same checks
+# the app applies (required columns, answer keys A-D, numeric QN). Each
+# worker writes its file's compiled bank to the cache folder, where
+# loaders.load_spreadsheet() picks it up without parsing again, and sends
+# back only a small result; the parent collects them into one report.
+# Files whose compiled bank is still fresh are skipped unless --force is given.
+# The biggest files are started first so one large sheet doesn't finish last
+# on an otherwise idle pool.
+#
+#   python -m mcq.bulk_import src/MCQ_files [more folders or files]
+#          [--jobs N] [--cache-dir DIR] [--report import_report.json] [--force]
+#
+# The exit status is 1 if any file couldn't be imported.
+
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mcq import bank_cache, loaders
+
+EXTENSIONS = (".ods", ".xlsx", ".csv")
+
+
+def find_sheets(paths):
+    """Every spreadsheet under `paths` (files or folders), sorted."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in names
+                             if name.endswith(EXTENSIONS) and not name.startswith((".", "~$")))
+        elif path.endswith(EXTENSIONS):
+            found.append(path)
+    return sorted(set(found))
+
+
+def _read_columns(path):
+    """({column: values}, row count) of a sheet: streaming reader first, pandas if it fails."""
+    if path.endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = [r for r in csv.reader(f) if r]
+    else:
+        from mcq import stream_reader
+
+        try:
+            rows = list(stream_reader.iter_rows(path))
+        except Exception:
+            import pandas as pd
+
+            df = pd.read_excel(path, dtype=str)
+            return loaders.columns_from_dataframe(df), len(df)
+    if not rows:
+        return {}, 0
+    return loaders.columns_from_rows(rows[0], rows[1:]), len(rows) - 1
+
+
+def import_sheet(path, cache_dir=None, force=False):
+    """
+    Validates one sheet and writes its compiled bank. Runs in a worker
+    process; returns a small dict for the report.
+    """
+    started = time.perf_counter()
+    result = {"file": path, "questions": 0, "rejected": [], "error": None, "skipped": False}
+    try:
+        if not force and bank_cache.is_fresh(path, cache_dir):
+            result["skipped"] = True
+        else:
+            columns, n_rows = _read_columns(path)
+            missing = [c for c in loaders.REQUIRED_COLS if c not in columns]
+            if missing:
+                result["error"] = f"missing required columns: {', '.join(missing)}"
+            else:
+                questions, rejected = loaders.normalize_columns(columns, n_rows)
+                result["questions"] = len(questions)
+                result["rejected"] = rejected
+                if questions:
+                    bank_cache.write_compiled(path, questions, cache_dir)
+                else:
+                    result["error"] = "no valid questions"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def import_all(paths, jobs=None, cache_dir=None, force=False):
+    """Imports every sheet under `paths` with `jobs` processes; returns the results in file order."""
+    files = find_sheets(paths)
+    # largest first, so the pool doesn't end waiting on one big file
+    files_by_size = sorted(files, key=os.path.getsize, reverse=True)
+    results = {}
+    if jobs == 1:
+        for path in files_by_size:
+            results[path] = import_sheet(path, cache_dir, force)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(import_sheet, path, cache_dir, force) for path in files_by_size]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["file"]] = result
+    return [results[path] for path in files]
+
+
+def report(results, seconds, jobs):
+    """The consolidated report: a summary plus every file's result."""
+    return {
+        "summary": {
+            "files": len(results),
+            "imported": sum(1 for r in results if not r["error"] and not r["skipped"]),
+            "skipped": sum(1 for r in results if r["skipped"]),
+            "failed": sum(1 for r in results if r["error"]),
+            "questions": sum(r["questions"] for r in results),
+            "rejected_rows": sum(len(r["rejected"]) for r in results),
+            "seconds": round(seconds, 3),
+            "jobs": jobs,
+        },
+        "files": results,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate and compile folders of spreadsheet banks in parallel.")
+    parser.add_argument("paths", nargs="+", help="folders and/or .ods/.xlsx/.csv files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache-dir", help=f"where compiled banks go (default {bank_cache.CACHE_DIR})")
+    parser.add_argument("--report", default="import_report.json")
+    parser.add_argument("--force", action="store_true", help="re-import files whose compiled bank is fresh")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    results = import_all(args.paths, args.jobs, args.cache_dir, args.force)
+    out = report(results, time.perf_counter() - t0, args.jobs)
+
+    for r in results:
+        if r["error"]:
+            print(f"FAILED  {r['file']}: {r['error']}")
+        for row in r["rejected"]:
+            print(f"skipped {r['file']} row {row['row']}: {row['reason']} ({row['value']!r})")
+    s = out["summary"]
+    print(f"{s['files']} files: {s['imported']} imported, {s['skipped']} up to date, {s['failed']} failed; "
+          f"{s['questions']} questions, {s['rejected_rows']} rows skipped in {s['seconds']:.2f} s "
+          f"with {s['jobs']} processes")
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=1, ensure_ascii=False)
+    print(f"Report: {args.report}")
+    return 1 if s["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# Near-duplicate question detection (shingling + MinHash + LSH).
+#
+# Each question becomes a set of shingles: word bigrams over the question
+# followed by its options in sorted order (so shuffled options don't hide a
+# duplicate), hashed with crc32. MinHash signatures for all questions are
+# computed in one vectorized pass with numpy (64 multiply-shift hash
+# functions), then cut into bands; questions sharing a band land in the
+# same bucket and become candidates. Candidates are confirmed with the
+# exact Jaccard similarity of their shingle sets and merged into clusters
+# with union-find. Apart from bucket sizes, everything is linear in the
+# number of questions.
+#
+# numpy is imported inside the functions, so importing this module stays cheap.
+#
+#   python -m mcq.dedup src/MCQ_files/mcq_algae.ods [more.xlsx ...]
+#                       [--remote Fungi] [--threshold 0.8] [--json out.json]
+#
+# MCQ_DEDUP=1 makes the app drop duplicates (keeping the first) when a bank loads.
+
+import os
+import zlib
+
+from mcq.search import tokenize
+
+ENABLED = os.environ.get("MCQ_DEDUP", "") not in ("", "0")
+
+THRESHOLD = 0.8
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 similarity usually collide
+# buckets bigger than this are checked against their first member only
+MAX_BUCKET_PAIRS = 64
+
+
+def shingles(text, options):
+    """crc32 hashes of the word bigrams of a question and its (sorted) options."""
+    words = tokenize(text)
+    for option in sorted(o.casefold().strip() for o in options):
+        words.append("|")
+        words.extend(tokenize(option))
+    if len(words) == 1:
+        return {zlib.crc32(words[0].encode("utf-8"))}
+    return {zlib.crc32(f"{a} {b}".encode("utf-8")) for a, b in zip(words, words[1:])}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def signatures(shingle_sets, num_perm=NUM_PERM, seed=1):
+    """MinHash signatures (n x num_perm uint32 array) for non-empty shingle sets."""
+    import numpy as np
+
+    lengths = np.fromiter((len(s) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    values = np.fromiter((h for s in shingle_sets for h in s), dtype=np.uint64, count=int(lengths.sum()))
+    offsets = np.zeros(len(shingle_sets), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+
+    rng = np.random.default_rng(seed)
+    # multiply-shift hashing: ((a * x + b) mod 2**64) >> 32, a odd
+    a = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    sig = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    hashed = np.empty_like(values)
+    for i in range(num_perm):
+        np.multiply(values, a[i], out=hashed)
+        hashed += b[i]
+        hashed >>= np.uint64(32)
+        sig[:, i] = np.minimum.reduceat(hashed, offsets)
+    return sig
+
+
+def candidate_pairs(sig, bands=BANDS):
+    """Pairs of row indices that share at least one LSH band."""
+    import numpy as np
+
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # starts of runs of equal keys with at least two members
+        change = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [n]))
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = order[start:end].tolist()
+            if len(members) * (len(members) - 1) // 2 <= MAX_BUCKET_PAIRS:
+                pairs.update((x, y) for i, x in enumerate(members) for y in members[i + 1:])
+            else:
+                first = members[0]
+                pairs.update((first, y) for y in members[1:])
+    return pairs
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x != y:
+            # the smaller index (the earlier question) stays the root
+            if y < x:
+                x, y = y, x
+            self.parent[y] = x
+
+
+def find_duplicates(banks, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Clusters of near-duplicate questions across one or more banks.
+
+    `banks` is a list of (source name, QuestionBank). Returns a list of
+    clusters, each a list of (source, position, qn) in input order, plus
+    the smallest similarity of any member to the cluster's first question:
+    [{"members": [...], "similarity": 0.93}, ...]. Questions count as
+    duplicates when the Jaccard similarity of their shingles is at least
+    `threshold`.
+    """
+    records, sets = [], []
+    for source, bank in banks:
+        qns, texts, options, _, _ = bank.compact()
+        for pos, qn in enumerate(qns):
+            s = shingles(texts[pos], options[pos * 4:pos * 4 + 4])
+            if s:
+                records.append((source, pos, qn))
+                sets.append(s)
+    if len(records) < 2:
+        return []
+
+    sig = signatures(sets, num_perm)
+    uf = _UnionFind(len(records))
+    for x, y in candidate_pairs(sig, bands):
+        if uf.find(x) != uf.find(y) and jaccard(sets[x], sets[y]) >= threshold:
+            uf.union(x, y)
+
+    groups = {}
+    for i in range(len(records)):
+        groups.setdefault(uf.find(i), []).append(i)
+    clusters = []
+    for root in sorted(groups):
+        members = groups[root]
+        if len(members) > 1:
+            clusters.append({
+                "members": [records[i] for i in members],
+                "similarity": round(min(jaccard(sets[root], sets[i]) for i in members[1:]), 3),
+            })
+    return clusters
+
+
+def drop_duplicates(bank, threshold=THRESHOLD):
+    """(bank without near-duplicates, clusters); the first question of each cluster is kept."""
+    clusters = find_duplicates([(None, bank)], threshold)
+    drop = {pos for c in clusters for _, pos, _ in c["members"][1:]}
+    if not drop:
+        return bank, clusters
+    return bank.take([pos for pos in range(len(bank)) if pos not in drop]), clusters
+
+
+def dedup_on_load(bank):
+    """Drops near-duplicates from a freshly loaded bank when MCQ_DEDUP is set."""
+    if not ENABLED or not bank:
+        return bank
+    kept, clusters = drop_duplicates(bank)
+    if clusters:
+        print(f"Dropped {len(bank) - len(kept)} near-duplicate questions ({len(clusters)} clusters).")
+    return kept
+
+
+def main():
+    import argparse
+    import json
+
+    from mcq import loaders, sync
+
+    parser = argparse.ArgumentParser(description="Report near-duplicate questions across banks.")
+    parser.add_argument("files", nargs="*", help=".ods/.xlsx/.csv banks")
+    parser.add_argument("--remote", action="append", default=[],
+                        help="name of a remote bank to include (its local synced copy)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--json", help="also write the clusters to this file")
+    args = parser.parse_args()
+
+    banks = []
+    for path in args.files:
+        if path.endswith(".csv"):
+            with open(path, encoding="utf-8") as f:
+                banks.append((path, loaders.questions_from_csv(f.read())))
+        else:
+            banks.append((path, loaders.load_spreadsheet(path)))
+    for name in args.remote:
+        bank = sync.load_local_questions(name)
+        if bank is None:
+            print(f"No local copy of remote bank {name}; open the app once to sync it.")
+            continue
+        banks.append((f"remote:{name}", bank))
+
+    clusters = find_duplicates(banks, args.threshold)
+    by_source = dict(banks)
+    for n, cluster in enumerate(clusters, start=1):
+        print(f"Cluster {n} (similarity >= {cluster['similarity']}):")
+        for source, pos, qn in cluster["members"]:
+            print(f"  {source} QN {qn}: {by_source[source][pos].text[:70]}")
+    total = sum(len(b) for _, b in banks)
+    dupes = sum(len(c["members"]) - 1 for c in clusters)
+    print(f"{total} questions, {len(clusters)} clusters, {dupes} duplicates.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(clusters, f, indent=1, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# Countdowns for timed exams, for every session of the process.
+#
+# One asyncio event loop on one daemon thread (shared_clock()) runs all of
+# them. There is no ticking per session. The clock keeps a heap of
+# (due, countdown) entries, where "due" is the next moment that countdown's
+# display changes or one of its deadlines passes. It sleeps until the
+# earliest entry, handles every entry that is due, and pushes each one back
+# with its next due time. A countdown whose deadlines change (new question,
+# answer checked) gets a fresh entry; the old one is dropped when it reaches
+# the top (its version no longer matches), as in scheduler.Scheduler. Waking
+# up costs O(log n) for n sessions.
+#
+# Redraws are throttled. The display shows whole seconds and is redrawn only
+# when its text changes, through the caller's on_tick (the app updates just
+# the timer Text, not the page). Question deadlines are snapped to the exam
+# deadline's second grid, so both countdowns change on the same tick and a
+# session redraws at most once a second (MIN_REDRAW_SECONDS). Expiry is never
+# throttled. on_expire runs on a worker thread, so a slow handler doesn't
+# hold up other sessions' timers.
+#
+# MCQ_EXAM_SECONDS sets the time for the whole quiz and MCQ_QUESTION_SECONDS
+# the time per question. Either one turns exam mode on in the app.
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+EXAM_SECONDS = float(os.environ.get("MCQ_EXAM_SECONDS", "0") or 0)
+QUESTION_SECONDS = float(os.environ.get("MCQ_QUESTION_SECONDS", "0") or 0)
+ENABLED = EXAM_SECONDS > 0 or QUESTION_SECONDS > 0
+
+MIN_REDRAW_SECONDS = 1.0
+# how long the "time's up" feedback stays before the app moves on
+FEEDBACK_SECONDS = 2.0
+EXPIRE_WORKERS = 4
+
+
+def format_seconds(seconds):
+    """Whole seconds left as m:ss (h:mm:ss from an hour up), rounded up so 0:00 means expired."""
+    s = max(0, math.ceil(seconds - 1e-9))
+    h, rest = divmod(s, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+class Countdown:
+    """A session's exam and question deadlines, driven by an ExamClock."""
+
+    def __init__(self, clock, on_tick, on_expire):
+        self.clock = clock
+        self.on_tick = on_tick        # on_tick(text), on the clock's thread
+        self.on_expire = on_expire    # on_expire("question" | "exam"), on a worker thread
+        self.lock = threading.Lock()
+        self.exam_deadline = None     # time.monotonic() values
+        self.question_deadline = None
+        self.version = 0
+        self.shown = None
+        self.drawn_at = float("-inf")
+        self.cancelled = False
+
+    def start_exam(self, seconds, now=None):
+        """Starts the exam timer; returns the text to show now."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.exam_deadline = now + seconds
+            return self._changed(now)
+
+    def start_question(self, seconds, now=None):
+        """
+        Starts the question timer and returns the text to show now. The
+        deadline lands on the exam timer's second grid (up to 1 s later).
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            deadline = now + seconds
+            if self.exam_deadline is not None:
+                deadline = min(self.exam_deadline,
+                               self.exam_deadline - math.floor(self.exam_deadline - deadline))
+            self.question_deadline = deadline
+            return self._changed(now)
+
+    def stop_question(self, now=None):
+        """Stops the question timer (answer checked); returns the text to show now."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.question_deadline = None
+            return self._changed(now)
+
+    def stop(self):
+        """Stops both timers (quiz finished); returns the text to show now."""
+        with self.lock:
+            self.exam_deadline = self.question_deadline = None
+            return self._changed(time.monotonic())
+
+    def cancel(self):
+        """Stops for good (session closed)."""
+        with self.lock:
+            self.cancelled = True
+            self.exam_deadline = self.question_deadline = None
+            self._changed(time.monotonic())
+
+    def _changed(self, now):
+        # the caller shows the new text with its own update; the next tick isn't held back
+        self.shown = self.text(now)
+        self.drawn_at = float("-inf")
+        self.version += 1
+        self.clock.wake(self)
+        return self.shown
+
+    def remaining(self, now=None):
+        """(seconds left on the question, seconds left in the exam); None where there's no timer."""
+        now = time.monotonic() if now is None else now
+        return tuple(None if d is None else d - now for d in (self.question_deadline, self.exam_deadline))
+
+    def text(self, now=None):
+        question, exam = self.remaining(now)
+        parts = [format_seconds(t) for t in (question, exam) if t is not None]
+        return "⏱ " + " | ".join(parts) if parts else ""
+
+    def _next_due(self, now):
+        """When the text next changes or a deadline passes; None when there's nothing to wait for."""
+        due = None
+        for deadline in (self.question_deadline, self.exam_deadline):
+            if deadline is None:
+                continue
+            left = deadline - now
+            # the shown value ceil(left) drops by one when left crosses the next whole second
+            change = deadline - (math.ceil(left - 1e-9) - 1) if left > 0 else now
+            due = change if due is None else min(due, change)
+        return due
+
+    def _poll(self, now):
+        """Handles expiry and redraws; returns the next due time (or None)."""
+        expired = []
+        draw = None
+        with self.lock:
+            if self.question_deadline is not None and now >= self.question_deadline:
+                self.question_deadline = None
+                expired.append("question")
+            if self.exam_deadline is not None and now >= self.exam_deadline:
+                self.exam_deadline = self.question_deadline = None
+                expired = ["exam"]
+            text = self.text(now)
+            if text != self.shown and (expired or now - self.drawn_at >= MIN_REDRAW_SECONDS - 0.05):
+                self.shown = draw = text
+                self.drawn_at = now
+            due = self._next_due(now)
+            if due is not None and text != self.shown:
+                # a change held back by the throttle: draw it as soon as allowed
+                due = min(due, self.drawn_at + MIN_REDRAW_SECONDS)
+        if draw is not None:
+            self.on_tick(draw)
+        for kind in expired:
+            self.clock.call_expire(self, kind)
+        return due
+
+
+class ExamClock:
+    """One asyncio loop on a daemon thread that drives every Countdown of the process."""
+
+    def __init__(self):
+        self._heap = []                  # (due, seq, version, countdown)
+        self._seq = itertools.count()
+        self._loop = asyncio.new_event_loop()
+        self._wakeup = None
+        self._expire_pool = ThreadPoolExecutor(EXPIRE_WORKERS, thread_name_prefix="exam-expire")
+        # redraws and expiries so far, for benchmarks and debugging
+        self.stats = {"ticks": 0, "expired": 0, "wakeups": 0}
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="exam-clock", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def countdown(self, on_tick, on_expire):
+        """A new Countdown for one session; start it with start_exam() / start_question()."""
+        return Countdown(self, on_tick, on_expire)
+
+    def wake(self, countdown):
+        """Reschedules `countdown` after its deadlines changed (any thread)."""
+        self._loop.call_soon_threadsafe(self._push_now, countdown)
+
+    def call_later(self, seconds, fn):
+        """Runs fn() on a worker thread after `seconds`, e.g. to move on after feedback."""
+        self._loop.call_soon_threadsafe(self._loop.call_later, seconds, self._expire_pool.submit, fn)
+
+    def call_expire(self, countdown, kind):
+        self.stats["expired"] += 1
+        self._expire_pool.submit(countdown.on_expire, kind)
+
+    def _push_now(self, countdown):
+        self._push(countdown, time.monotonic())
+        self._wakeup.set()
+
+    def _push(self, countdown, due):
+        heapq.heappush(self._heap, (due, next(self._seq), countdown.version, countdown))
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        ready.set()
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        heap = self._heap
+        while True:
+            now = time.monotonic()
+            while heap and heap[0][0] <= now:
+                _, _, version, countdown = heapq.heappop(heap)
+                if version != countdown.version or countdown.cancelled:
+                    continue  # superseded by a newer entry
+                drawn = countdown.drawn_at
+                try:
+                    due = countdown._poll(now)
+                except Exception as e:
+                    print(f"Warning: exam timer callback failed: {e}")
+                    due = None
+                if countdown.drawn_at != drawn:
+                    self.stats["ticks"] += 1
+                if due is not None:
+                    self._push(countdown, due)
+            self._wakeup.clear()
+            timeout = heap[0][0] - time.monotonic() if heap else None
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            self.stats["wakeups"] += 1
+
+
+_clock = None
+_clock_lock = threading.Lock()
+
+
+def shared_clock():
+    """The process-wide ExamClock, started on first use."""
+    global _clock
+    with _clock_lock:
+        if _clock is None:
+            _clock = ExamClock()
+    return _clock
@@ -0,0 +1,271 @@
+# Batch grading of whole-class answer sheets against a bank.
+#
+# A sheet gives one student's letters keyed by QN. All sheets are encoded
+# into one students x questions uint8 matrix aligned with the bank's
+# positions: 0-3 for A-D, BLANK for no answer and INVALID for anything else
+# (two letters, "E", ...). The key is one uint8 per question. Grading then
+# does three vectorized steps, with no Python loop over students or questions:
+#   correct = responses == key                    (students x questions, bool)
+#   credit  = table.ravel()[responses + offsets]  (students x questions, float)
+#   scores  = credit.sum(axis=1)
+# `table` is a questions x 6 credit table (A-D, blank, invalid) from
+# credit_table(). Plain right/wrong, negative marking and per-option partial
+# credit are all just different tables.
+#
+# Sheets come as CSV (a student column, then one column per QN) or JSON
+# ({student: {qn: letter}}, or a list of {"student": ..., "answers": ...}).
+# "answers" may also be a string of letters in bank order. QNs that aren't
+# in the bank are reported and ignored. Questions a sheet leaves out count
+# as blank.
+#
+#   python -m mcq.grading src/MCQ_files/mcq_algae.ods sheets.csv
+#          [--wrong -0.333] [--blank 0] [--partial partial.json] [--json out.json]
+#
+# partial.json maps QN -> {letter: credit}, e.g. {"12": {"B": 0.5, "C": 1}}.
+#
+# numpy is imported inside the functions, so importing this module stays cheap.
+
+import csv
+import io
+import json
+
+from mcq.question_bank import ANSWER_LETTERS
+
+BLANK = 4
+INVALID = 5
+_CODES_PER_QUESTION = 6
+
+
+class _Codes(dict):
+    """Cell text -> response code, filled in on first sight of each distinct cell."""
+
+    def __missing__(self, cell):
+        s = "" if cell is None else str(cell).strip().upper()
+        if s.startswith("OPTION "):
+            s = s[7:].strip()
+        code = BLANK if s == "" else ANSWER_LETTERS.index(s) if len(s) == 1 and s in ANSWER_LETTERS else INVALID
+        self[cell] = code
+        return code
+
+
+class AnswerSheets:
+    """Encoded responses of many students to one bank."""
+
+    def __init__(self, students, responses, unknown_qns=()):
+        self.students = students        # one id per row of `responses`
+        self.responses = responses      # uint8 students x len(bank)
+        self.unknown_qns = list(unknown_qns)
+
+    def __len__(self):
+        return len(self.students)
+
+    @classmethod
+    def from_rows(cls, bank, qns, rows):
+        """
+        Encodes rows of (student, cell, cell, ...) where the cells answer
+        the questions numbered `qns`, in that order.
+        """
+        import numpy as np
+
+        codes = _Codes()
+        positions, columns, unknown = [], [], []
+        for col, qn in enumerate(qns):
+            pos = bank.index_of(_qn(qn))
+            if pos is None:
+                unknown.append(qn)
+            else:
+                positions.append(pos)
+                columns.append(col)
+
+        students = []
+        encoded = bytearray()
+        width = len(qns)
+        for row in rows:
+            students.append(row[0])
+            cells = row[1:width + 1]
+            encoded += bytes(map(codes.__getitem__, cells))
+            if len(cells) < width:
+                encoded += bytes([BLANK]) * (width - len(cells))
+        sheet = np.frombuffer(bytes(encoded), dtype=np.uint8).reshape(len(students), width)
+
+        responses = np.full((len(students), len(bank)), BLANK, dtype=np.uint8)
+        if positions:
+            responses[:, positions] = sheet[:, columns]
+        return cls(students, responses, unknown)
+
+    @classmethod
+    def from_csv(cls, bank, text):
+        """Sheets from CSV text: a header of (student, QN, QN, ...), then one row per student."""
+        rows = [r for r in csv.reader(io.StringIO(text)) if r]
+        if not rows:
+            return cls.from_rows(bank, [], [])
+        return cls.from_rows(bank, rows[0][1:], rows[1:])
+
+    @classmethod
+    def from_json(cls, bank, data):
+        """
+        Sheets from parsed JSON: {student: answers} or [{"student": id,
+        "answers": answers}], where answers is {qn: letter} or a string of
+        letters in bank order.
+        """
+        if isinstance(data, dict):
+            data = [{"student": student, "answers": answers} for student, answers in data.items()]
+        by_position = None
+        if any(isinstance(sheet["answers"], str) for sheet in data):
+            by_position = [str(qn) for qn in bank.qns()]
+        # every QN any sheet answers, in first-seen order; keys are used as
+        # they come (JSON gives "12", Python callers may give 12)
+        qns = dict.fromkeys(by_position or ())
+        for sheet in data:
+            if isinstance(sheet["answers"], dict):
+                qns.update(sheet["answers"])
+        qns = list(qns)
+
+        rows = []
+        for sheet in data:
+            answers = sheet["answers"]
+            if isinstance(answers, str):
+                answers = dict(zip(by_position, answers))
+            rows.append([sheet["student"], *map(answers.get, qns)])
+        return cls.from_rows(bank, qns, rows)
+
+    @classmethod
+    def load(cls, bank, path):
+        """Sheets from a .csv or .json file."""
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".json"):
+                return cls.from_json(bank, json.load(f))
+            return cls.from_csv(bank, f.read())
+
+
+def _qn(value):
+    """Sheet headers are text; bank QNs are usually ints."""
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return value
+
+
+def encode_key(bank):
+    """The answer key of `bank` as a uint8 array of option indices (0-3), in bank order."""
+    import numpy as np
+
+    return np.frombuffer(bytes(q.answer_index for q in bank), dtype=np.uint8)
+
+
+def credit_table(bank, key=None, right=1.0, wrong=0.0, blank=0.0, partial=None):
+    """
+    Questions x 6 credit table: what each answer (A-D, blank, invalid) is
+    worth for every question. An invalid mark counts as wrong. `partial`
+    maps a QN to {letter: credit} and overrides single cells, e.g. half
+    marks for a near-miss distractor or full marks for a second accepted
+    answer. wrong=-1/3 gives the usual negative marking for 4 options.
+    """
+    import numpy as np
+
+    if key is None:
+        key = encode_key(bank)
+    n = len(key)
+    table = np.full((n, _CODES_PER_QUESTION), wrong, dtype=np.float32)
+    table[:, BLANK] = blank
+    table[np.arange(n), key] = right
+    for qn, credits in (partial or {}).items():
+        pos = bank.index_of(_qn(qn))
+        if pos is None:
+            raise ValueError(f"partial credit given for unknown question {qn}")
+        for letter, value in credits.items():
+            table[pos, ANSWER_LETTERS.index(str(letter).strip().upper())] = value
+    return table
+
+
+def correctness(responses, key):
+    """Students x questions bool matrix: True where the answer matches the key."""
+    return responses == key
+
+
+def credit_matrix(responses, table):
+    """Students x questions credit: table[q, responses[s, q]] for every cell, in one gather."""
+    import numpy as np
+
+    offsets = np.arange(0, table.shape[0] * _CODES_PER_QUESTION, _CODES_PER_QUESTION, dtype=np.intp)
+    return table.ravel()[responses + offsets]
+
+
+def grade(bank, sheets, right=1.0, wrong=0.0, blank=0.0, partial=None):
+    """
+    Grades `sheets` (AnswerSheets) against `bank`. Returns a dict of arrays:
+    "correct" (students x questions bool), "raw" (number right per student),
+    "scores" (total credit per student with the given marking),
+    "answered" (non-blank answers per student) and per question "p_correct"
+    (share of students right) and "choices" (questions x 6 counts of A-D,
+    blank, invalid).
+    """
+    import numpy as np
+
+    key = encode_key(bank)
+    responses = sheets.responses
+    correct = correctness(responses, key)
+    table = credit_table(bank, key, right, wrong, blank, partial)
+    n_students, n_questions = responses.shape
+    # one bincount over (question, code) pairs instead of six comparisons
+    pairs = responses + np.arange(n_questions, dtype=np.intp) * _CODES_PER_QUESTION
+    choices = np.bincount(pairs.ravel(), minlength=n_questions * _CODES_PER_QUESTION)
+    return {
+        "students": sheets.students,
+        "correct": correct,
+        "raw": correct.sum(axis=1),
+        "scores": credit_matrix(responses, table).sum(axis=1, dtype=np.float64),
+        "answered": (responses != BLANK).sum(axis=1),
+        "p_correct": correct.mean(axis=0) if n_students else np.zeros(n_questions),
+        "choices": choices.reshape(n_questions, _CODES_PER_QUESTION),
+    }
+
+
+def main():
+    import argparse
+
+    from mcq import loaders
+
+    parser = argparse.ArgumentParser(description="Grade answer sheets against a question bank.")
+    parser.add_argument("bank", help=".ods/.xlsx/.csv bank")
+    parser.add_argument("sheets", help="answer sheets (.csv or .json)")
+    parser.add_argument("--wrong", type=float, default=0.0, help="credit for a wrong answer (e.g. -0.333)")
+    parser.add_argument("--blank", type=float, default=0.0, help="credit for no answer")
+    parser.add_argument("--partial", help="JSON file of {qn: {letter: credit}}")
+    parser.add_argument("--json", help="also write the per-student results to this file")
+    args = parser.parse_args()
+
+    if args.bank.endswith(".csv"):
+        with open(args.bank, encoding="utf-8") as f:
+            bank = loaders.questions_from_csv(f.read())
+    else:
+        bank = loaders.load_spreadsheet(args.bank)
+    sheets = AnswerSheets.load(bank, args.sheets)
+    partial = None
+    if args.partial:
+        with open(args.partial, encoding="utf-8") as f:
+            partial = json.load(f)
+    if sheets.unknown_qns:
+        print(f"Ignored {len(sheets.unknown_qns)} questions not in the bank: "
+              f"{', '.join(map(str, sheets.unknown_qns[:10]))}")
+
+    results = grade(bank, sheets, wrong=args.wrong, blank=args.blank, partial=partial)
+    for student, raw, score in zip(results["students"], results["raw"], results["scores"]):
+        print(f"{student}: {raw}/{len(bank)} right, score {score:.2f}")
+    if len(sheets):
+        qns = bank.qns()
+        hardest = results["p_correct"].argsort()[:5]
+        print("Hardest questions: " + ", ".join(
+            f"QN {qns[i]} ({results['p_correct'][i]:.0%})" for i in hardest))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([
+                {"student": student, "raw": int(raw), "score": round(float(score), 4), "answered": int(n)}
+                for student, raw, score, n in zip(results["students"], results["raw"],
+                                                  results["scores"], results["answered"])
+            ], f, indent=1, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
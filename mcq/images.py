@@ -0,0 +1,222 @@
+# Question images: lazy loading and an on-disk thumbnail cache.
+#
+# A question's Image cell is an http(s) URL or a path relative to the assets
+# folder (ASSETS_DIR). Nothing is downloaded or decoded when a bank loads:
+# ThumbnailCache.fetch() does that on a small worker pool the first time an
+# image is needed (the app also prefetch()es the next question's image), and
+# keeps a copy downscaled to at most THUMB_SIZE px on its long side in the
+# cache folder. Every later view reads that thumbnail straight from disk.
+#
+# The cache is bounded by MAX_BYTES (MCQ_THUMB_CACHE_MB) and evicts the least
+# recently used thumbnails first; a hit bumps the file's mtime, so the order
+# survives restarts. Concurrent requests for one image share one load.
+#
+# Downscaling uses Pillow when it is installed. Without it the original
+# bytes are cached as they are (the bound still applies) and the client
+# scales them.
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from mcq import bank_cache, instrument
+
+THUMB_SIZE = 480
+MAX_BYTES = int(float(os.environ.get("MCQ_THUMB_CACHE_MB", "64")) * 1024 * 1024)
+ASSETS_DIR = os.environ.get("MCQ_ASSETS_DIR") or os.path.join("src", "assets")
+WORKERS = 2
+
+# (connect, read) in seconds
+FETCH_TIMEOUT = (5, 20)
+
+
+def thumbs_dir_for(cache_dir=None):
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, "thumbs")
+
+
+def make_thumbnail(raw, size=THUMB_SIZE):
+    """
+    `raw` image bytes downscaled to fit in size x size: PNG if the image has
+    transparency or a palette, JPEG otherwise. Images that already fit are
+    returned unchanged, and so is everything when Pillow isn't installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return raw
+
+    with Image.open(io.BytesIO(raw)) as im:
+        if max(im.size) <= size and im.format in ("PNG", "JPEG"):
+            return raw
+        im.draft("RGB", (size, size))  # JPEG: decode straight at a reduced scale
+        im.thumbnail((size, size))
+        out = io.BytesIO()
+        if im.mode in ("RGBA", "LA", "P"):
+            im.save(out, "PNG", optimize=True)
+        else:
+            im.convert("RGB").save(out, "JPEG", quality=85)
+        return out.getvalue()
+
+
+class ThumbnailCache:
+    """Size-bounded LRU cache of downscaled question images, kept in a folder."""
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, size=THUMB_SIZE,
+                 assets_dir=ASSETS_DIR, workers=WORKERS, timeout=FETCH_TIMEOUT):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = size
+        self.assets_dir = assets_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()  # file name -> bytes, least recently used first
+        self._total = 0
+        self._pending = {}             # file name -> Future of a load in progress
+        self._executor = None
+        # hits / misses / evictions, for benchmarks and debugging
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._scan()
+
+    def _scan(self):
+        try:
+            found = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".tmp"):
+                    continue
+                st = entry.stat()
+                found.append((st.st_mtime_ns, entry.name, st.st_size))
+        except OSError:
+            return
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._total += size
+
+    def _name(self, source):
+        return hashlib.sha1(f"{self.size}:{source}".encode("utf-8")).hexdigest()[:24] + ".img"
+
+    def __contains__(self, source):
+        return self._name(source) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    # --- reading ---
+
+    def get(self, source):
+        """The cached thumbnail of `source` as bytes, or None if it isn't cached yet."""
+        data = self._read(self._name(source))
+        self.stats["hits" if data is not None else "misses"] += 1
+        return data
+
+    def _read(self, name):
+        with self.lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self._total -= self._entries.pop(name, 0)
+            return None
+        return data
+
+    # --- loading ---
+
+    def fetch(self, source, callback=None):
+        """
+        Loads the thumbnail of `source` on the worker pool (or joins a load in
+        progress) and returns the Future; `callback(data)` is called with the
+        bytes, or None if the image couldn't be loaded.
+        """
+        name = self._name(source)
+        with self.lock:
+            future = self._pending.get(name)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="thumbs")
+                future = self._pending[name] = self._executor.submit(self._load, source, name)
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(f.result()))
+        return future
+
+    def prefetch(self, source):
+        """Starts loading `source` in the background unless it's cached (or empty)."""
+        if source and source not in self:
+            self.fetch(source)
+
+    def _load(self, source, name):
+        try:
+            data = self._read(name)  # cached by a load that finished meanwhile
+            if data is None:
+                with instrument.span("image.fetch"):
+                    raw = self._read_source(source)
+                with instrument.span("image.thumbnail"):
+                    data = make_thumbnail(raw, self.size)
+                self._store(name, data)
+            return data
+        except Exception as e:
+            print(f"Warning: could not load image {source}: {e}")
+            return None
+        finally:
+            with self.lock:
+                self._pending.pop(name, None)
+
+    def _read_source(self, source):
+        if source.startswith(("http://", "https://")):
+            import requests
+
+            response = requests.get(source, timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
+        path = source if os.path.isabs(source) else os.path.join(self.assets_dir, source)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _store(self, name, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        evicted = []
+        with self.lock:
+            self._total += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            # the newest thumbnail always stays, even if it alone is over the limit
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old, size = self._entries.popitem(last=False)
+                self._total -= size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+        self.stats["evictions"] += len(evicted)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def shared_cache(cache_dir=None):
+    """The process-wide ThumbnailCache, scanned from disk on first use."""
+    directory = thumbs_dir_for(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = ThumbnailCache(directory)
+    return cache
@@ -0,0 +1,223 @@
+# Low-overhead timings for startup and UI phases.
+#
+# Off by default. MCQ_TIMINGS=1 records every phase into a histogram and
+# writes them all as JSON when the process exits (to MCQ_TIMINGS_FILE,
+# default mcq_timings.json); MCQ_TIMINGS=overlay also shows a live summary
+# in a corner of the app. Phases recorded by the app:
+#
+#   device_id                   get_system_uuid()
+#   fetch.dns / fetch.connect   resolving the bank host / time to response headers
+#   fetch.download / fetch.decode   reading the body / json decoding it
+#   cache.read                  compiled-cache lookup (counters cache.hit / cache.miss)
+#   parse.spreadsheet / parse.pandas
+#   normalize                   one normalize_columns() call (one per stream batch)
+#   ui.first_render             main() up to the first question
+#   ui.update                   each page.update()
+#   ui.check / ui.next / ui.restart   a whole click handler
+#
+# When off, span() hands back one shared do-nothing context manager and
+# timed() returns the function unchanged, so instrumented code pays a
+# global lookup at most.
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+_MODE = os.environ.get("MCQ_TIMINGS", "")
+ENABLED = _MODE not in ("", "0")
+OVERLAY = _MODE == "overlay"
+TIMINGS_FILE = os.environ.get("MCQ_TIMINGS_FILE", "mcq_timings.json")
+
+_lock = threading.Lock()
+_histograms = {}  # name -> Histogram
+_counters = {}    # name -> int
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Histogram:
+    """Durations bucketed by powers of two (in microseconds), plus count/total/min/max."""
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        # bucket b holds durations in [2**(b-1), 2**b) microseconds; 0 is < 1 us
+        self.buckets = [0] * 40
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min((ns // 1000).bit_length(), 39)] += 1
+
+    def quantile_ms(self, q):
+        """Upper bound of the bucket holding the q-quantile (so within a factor of 2)."""
+        rank = q * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(2 ** b / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / 1e6 / self.count, 3) if self.count else 0,
+            "min_ms": round((self.min_ns or 0) / 1e6, 3),
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "p50_ms": round(self.quantile_ms(0.5), 3),
+            "p95_ms": round(self.quantile_ms(0.95), 3),
+            "buckets_us": {f"<{2 ** b}": n for b, n in enumerate(self.buckets) if n},
+        }
+
+
+def record(name, ns):
+    """Adds one duration (in nanoseconds) to the histogram `name`."""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(ns)
+
+
+def count(name, n=1):
+    """Bumps the counter `name`; does nothing while timings are off."""
+    if ENABLED:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+def span(name):
+    """Context manager that times its block into the histogram `name`."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name):
+    """Decorator form of span(); leaves the function untouched while timings are off."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter_ns() - start)
+
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """Everything recorded so far: {"timings": {name: {...}}, "counters": {...}}."""
+    with _lock:
+        return {
+            "timings": {name: h.to_dict() for name, h in sorted(_histograms.items())},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def export_json(path=None):
+    """Writes snapshot() to `path` (default TIMINGS_FILE) and returns the path."""
+    path = path or TIMINGS_FILE
+    data = snapshot()
+    data["pid"] = os.getpid()
+    data["written_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    return path
+
+
+def summary_lines(limit=12):
+    """One short line per phase, slowest total first, for the overlay."""
+    snap = snapshot()
+    rows = sorted(snap["timings"].items(), key=lambda kv: -kv[1]["total_ms"])[:limit]
+    lines = [f"{name:<18} n={t['count']:<4} p50={t['p50_ms']:.2f} max={t['max_ms']:.1f} ms"
+             for name, t in rows]
+    lines += [f"{name:<18} {n}" for name, n in snap["counters"].items()]
+    return lines
+
+
+def attach(page):
+    """
+    Times every page.update() of `page` as "ui.update", and with
+    MCQ_TIMINGS=overlay keeps a summary text in page.overlay up to date.
+    Does nothing while timings are off.
+    """
+    if not ENABLED:
+        return
+
+    import flet as ft
+
+    update = page.update
+    overlay_text = None
+    if OVERLAY:
+        overlay_text = ft.Text("", size=10, font_family="monospace", selectable=True)
+        page.overlay.append(ft.Container(
+            content=overlay_text, left=8, bottom=8, padding=6, border_radius=6,
+            bgcolor=ft.Colors.with_opacity(0.85, ft.Colors.WHITE),
+        ))
+
+    def timed_update(*controls):
+        if overlay_text is not None:
+            overlay_text.value = "\n".join(summary_lines())
+            if controls:
+                # an update of just these controls would not send the overlay
+                controls += (overlay_text,)
+        start = time.perf_counter_ns()
+        try:
+            return update(*controls)
+        finally:
+            record("ui.update", time.perf_counter_ns() - start)
+
+    page.update = timed_update
+
+
+def _export_at_exit():
+    if _histograms or _counters:
+        try:
+            export_json()
+        except OSError as e:
+            print(f"Warning: could not write timings to {TIMINGS_FILE}: {e}")
+
+
+if ENABLED:
+    atexit.register(_export_at_exit)
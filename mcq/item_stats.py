@@ -0,0 +1,336 @@
+# Item analysis kept up to date answer by answer.
+#
+# For every question, ItemStats keeps a fixed set of running sums in flat
+# arrays (a row per qn, like scheduler.ReviewState):
+#   attempts, right                       -> p-value (share answered right)
+#   sum x, sum x^2, sum x over right      -> point-biserial discrimination
+#   picks and sum x per option A-D        -> distractor histogram, and the
+#                                            mean ability of each option's pickers
+# where x is the answerer's ability. observe() is O(1) and the memory per
+# question is constant; a report reads the sums, never the answers. Because
+# everything is a sum, stats from several devices or sessions merge by
+# adding them up (merge(), or `python -m mcq.item_stats merge`).
+#
+# The ability of an answer is the session's accuracy before it, smoothed
+# towards 1/2 ((right + 1) / (answered + 2)); Session tracks it. Early
+# answers of a session carry little ability information, which shrinks the
+# discrimination towards 0 but doesn't flip its sign.
+#
+# The state is saved with the bank cache's file format (marshal + crc,
+# atomic replace), a little after answers arrive and at exit.
+#
+#   python -m mcq.item_stats report Fungi [--flagged] [--json out.json]
+#   python -m mcq.item_stats merge Fungi device1/items.Fungi.bank device2/...
+#
+# MCQ_ITEM_STATS=0 turns it off in the app.
+
+import atexit
+import marshal
+import math
+import os
+import threading
+from array import array
+
+from mcq import bank_cache
+
+ENABLED = os.environ.get("MCQ_ITEM_STATS", "1") != "0"
+
+# no flags before this many attempts
+MIN_ATTEMPTS = 20
+TOO_EASY = 0.9
+TOO_HARD = 0.3
+LOW_DISCRIMINATION = 0.1
+# a distractor is only called misleading if at least this share picks it
+DISTRACTOR_SHARE = 0.05
+SAVE_DELAY = 2.0
+
+OPTIONS = "ABCD"
+_FORMAT = 1
+
+
+def stats_path_for(bank, cache_dir=None):
+    safe = bank_cache.safe_name(bank)
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, f"items.{safe}.bank")
+
+
+class ItemStats:
+    """Running per-question sums for item analysis of one bank."""
+
+    def __init__(self, bank, path=None):
+        self.bank = bank
+        self.path = path
+        self.lock = threading.Lock()
+        self._rows = {}               # qn -> row
+        self.attempts = array("I")
+        self.right = array("I")
+        self.sum_x = array("d")
+        self.sum_x2 = array("d")
+        self.sum_x_right = array("d")
+        self.key = array("b")         # option index of the right answer, -1 until seen
+        self.picks = array("I")       # 4 per row
+        self.pick_x = array("d")      # 4 per row
+        self._saver = bank_cache.DebouncedSaver(self.save)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _row_for(self, qn):
+        row = self._rows.get(qn)
+        if row is None:
+            row = self._rows[qn] = len(self.attempts)
+            for arr in (self.attempts, self.right, self.sum_x, self.sum_x2, self.sum_x_right):
+                arr.append(0)
+            self.key.append(-1)
+            self.picks.extend((0, 0, 0, 0))
+            self.pick_x.extend((0.0, 0.0, 0.0, 0.0))
+        return row
+
+    def observe(self, qn, choice, correct, ability):
+        """Adds one answer: `choice` is the letter picked (in the sheet's option order), "" if none."""
+        option = OPTIONS.find(choice) if choice else -1
+        with self.lock:
+            row = self._row_for(qn)
+            self.attempts[row] += 1
+            self.sum_x[row] += ability
+            self.sum_x2[row] += ability * ability
+            if correct:
+                self.right[row] += 1
+                self.sum_x_right[row] += ability
+                if option >= 0:
+                    self.key[row] = option
+            if option >= 0:
+                self.picks[row * 4 + option] += 1
+                self.pick_x[row * 4 + option] += ability
+        self.save_soon()
+
+    def session(self):
+        """A Session feeding this bank's stats."""
+        return Session(self)
+
+    def merge(self, other):
+        """Adds `other`'s sums (e.g. another device's stats of the same bank) into this one."""
+        with other.lock:
+            rows = list(other._rows.items())
+            snapshot = [(qn, other._values(row)) for qn, row in rows]
+        with self.lock:
+            for qn, (attempts, right, sx, sx2, sxr, key, picks, pick_x) in snapshot:
+                row = self._row_for(qn)
+                self.attempts[row] += attempts
+                self.right[row] += right
+                self.sum_x[row] += sx
+                self.sum_x2[row] += sx2
+                self.sum_x_right[row] += sxr
+                if key >= 0:
+                    self.key[row] = key
+                for i in range(4):
+                    self.picks[row * 4 + i] += picks[i]
+                    self.pick_x[row * 4 + i] += pick_x[i]
+        self.save_soon()
+        return self
+
+    def _values(self, row):
+        return (self.attempts[row], self.right[row], self.sum_x[row], self.sum_x2[row],
+                self.sum_x_right[row], self.key[row],
+                self.picks[row * 4:row * 4 + 4], self.pick_x[row * 4:row * 4 + 4])
+
+    # --- queries ---
+
+    def item(self, qn):
+        """The analysis of one question as a dict, or None if it was never answered."""
+        with self.lock:
+            row = self._rows.get(qn)
+            if row is None:
+                return None
+            values = self._values(row)
+        return _analyse(qn, *values)
+
+    def report(self, qns=None, flagged_only=False):
+        """Analyses of `qns` (default: every answered question), optionally only the flagged ones."""
+        with self.lock:
+            if qns is None:
+                qns = list(self._rows)
+            found = [(qn, self._values(self._rows[qn])) for qn in qns if qn in self._rows]
+        items = [_analyse(qn, *values) for qn, values in found]
+        if flagged_only:
+            items = [item for item in items if item["flags"]]
+        return items
+
+    # --- persistence ---
+
+    def _key(self):
+        return ("items", self.bank, _FORMAT, marshal.version)
+
+    def save(self):
+        """Writes every row; returns how many were written."""
+        if self.path is None:
+            return 0
+        with self.lock:
+            qns = list(self._rows)
+            data = (qns, *(arr.tobytes() for arr in self._arrays()))
+        try:
+            bank_cache.write_cache(self.path, self._key(), data)
+        except OSError as e:
+            print(f"Warning: could not save item stats {self.path}: {e}")
+        return len(qns)
+
+    def _arrays(self):
+        return (self.attempts, self.right, self.sum_x, self.sum_x2, self.sum_x_right,
+                self.key, self.picks, self.pick_x)
+
+    def save_soon(self):
+        """Saves from a timer thread a little later, coalescing bursts of answers."""
+        if self.path is not None:
+            self._saver.soon(SAVE_DELAY)
+
+    @classmethod
+    def load(cls, bank, path):
+        """Reads the saved stats of `bank`, or starts empty if there are none (or they're unusable)."""
+        stats = cls(bank, path)
+        cached = bank_cache.read_cache(path)
+        if cached is None or cached[0] != stats._key():
+            return stats
+        qns, *blobs = cached[1]
+        arrays = stats._arrays()
+        for arr, blob in zip(arrays, blobs):
+            arr.frombytes(blob)
+        widths = (1, 1, 1, 1, 1, 1, 4, 4)
+        if len(blobs) != len(arrays) or any(len(arr) != len(qns) * w for arr, w in zip(arrays, widths)):
+            return cls(bank, path)
+        stats._rows = {qn: row for row, qn in enumerate(qns)}
+        return stats
+
+
+def _analyse(qn, attempts, right, sum_x, sum_x2, sum_x_right, key, picks, pick_x):
+    p = right / attempts
+    wrong = attempts - right
+    variance = sum_x2 / attempts - (sum_x / attempts) ** 2
+    discrimination = None
+    if right and wrong and variance > 1e-12:
+        mean_right = sum_x_right / right
+        mean_wrong = (sum_x - sum_x_right) / wrong
+        discrimination = (mean_right - mean_wrong) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+
+    options = {
+        letter: {
+            "picks": picks[i],
+            "share": picks[i] / attempts,
+            "mean_ability": pick_x[i] / picks[i] if picks[i] else None,
+        }
+        for i, letter in enumerate(OPTIONS)
+    }
+    flags = []
+    if attempts >= MIN_ATTEMPTS:
+        if p >= TOO_EASY:
+            flags.append("too easy")
+        elif p <= TOO_HARD:
+            flags.append("too hard")
+        if discrimination is not None and discrimination < LOW_DISCRIMINATION:
+            flags.append("low discrimination")
+        if key >= 0:
+            right_option = options[OPTIONS[key]]
+            for letter, option in options.items():
+                if letter == OPTIONS[key] or option["share"] < DISTRACTOR_SHARE:
+                    continue
+                # draws most wrong answers and more than the answer itself (miskeyed?),
+                # or is picked by stronger students than the answer
+                if (option["picks"] > right_option["picks"] and option["picks"] * 2 > wrong) or (
+                        right_option["mean_ability"] is not None
+                        and option["mean_ability"] >= right_option["mean_ability"]):
+                    flags.append(f"misleading distractor {letter}")
+    return {
+        "qn": qn,
+        "attempts": attempts,
+        "p_value": p,
+        "discrimination": discrimination,
+        "answer": OPTIONS[key] if key >= 0 else None,
+        "options": options,
+        "flags": flags,
+    }
+
+
+class Session:
+    """One quiz session: feeds answers to ItemStats with the session's running accuracy as ability."""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.answered = 0
+        self.correct = 0
+
+    def observe(self, qn, choice, correct):
+        self.stats.observe(qn, choice, correct, (self.correct + 1) / (self.answered + 2))
+        self.answered += 1
+        self.correct += bool(correct)
+
+
+class NullSession:
+    """Stand-in used when item stats are off."""
+
+    def observe(self, qn, choice, correct):
+        pass
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_stats(bank, cache_dir=None):
+    """The process-wide ItemStats of `bank`, loaded from disk on first use (saved at exit)."""
+    path = stats_path_for(bank, cache_dir)
+    with _shared_lock:
+        stats = _shared.get(path)
+        if stats is None:
+            stats = _shared[path] = ItemStats.load(bank, path)
+            atexit.register(stats.save)
+    return stats
+
+
+def new_session(bank):
+    """A Session for the app's current quiz, or a NullSession when item stats are off."""
+    if not ENABLED:
+        return NullSession()
+    return shared_stats(bank).session()
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Item analysis of a bank from its accumulated answer stats.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="print p-values, discrimination and flags")
+    report.add_argument("bank")
+    report.add_argument("--stats", help="stats file (default: the app's cache)")
+    report.add_argument("--flagged", action="store_true", help="only questions with a flag")
+    report.add_argument("--json", help="also write the report to this file")
+    merge = sub.add_parser("merge", help="add stats files of the same bank into the app's cache (or --out)")
+    merge.add_argument("bank")
+    merge.add_argument("files", nargs="+")
+    merge.add_argument("--out", help="stats file to merge into")
+    args = parser.parse_args()
+
+    if args.command == "merge":
+        target = ItemStats.load(args.bank, args.out or stats_path_for(args.bank))
+        for path in args.files:
+            other = ItemStats.load(args.bank, path)
+            if not len(other):
+                print(f"Warning: no usable stats for {args.bank} in {path}")
+            target.merge(other)
+        target.save()
+        print(f"{len(target)} questions, {sum(target.attempts)} answers in {target.path}")
+        return
+
+    stats = ItemStats.load(args.bank, args.stats or stats_path_for(args.bank))
+    items = stats.report(flagged_only=args.flagged)
+    for item in sorted(items, key=lambda i: i["qn"]):
+        disc = "-" if item["discrimination"] is None else f"{item['discrimination']:+.2f}"
+        picks = " ".join(f"{letter}:{o['share']:.0%}" for letter, o in item["options"].items())
+        flags = f"  [{', '.join(item['flags'])}]" if item["flags"] else ""
+        print(f"QN {item['qn']}: n={item['attempts']} p={item['p_value']:.2f} r_pb={disc} {picks}{flags}")
+    print(f"{len(items)} questions{' flagged' if args.flagged else ''}.")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(items, f, indent=1, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# Question loaders.
+#
+# Remote JSON payloads and CSV text are turned into QuestionBanks with plain
+# Python. .ods/.xlsx files are read by the streaming reader in
+# mcq/stream_reader.py; pandas (and odfpy/openpyxl behind it) is only imported
+# if that reader can't handle a file, so startup doesn't pay for it.
+# load_spreadsheet_progressively() returns the first rows of an uncached sheet
+# right away and reads the rest on a worker thread.
+
+import csv
+import io
+import os
+import threading
+from itertools import compress, zip_longest
+
+from mcq import bank_cache, instrument
+from mcq.question_bank import QuestionBank
+
+REQUIRED_COLS = ['Question', 'A', 'B', 'C', 'D', 'Answer']
+# optional: a URL or a path (relative to the assets folder) of a diagram
+IMAGE_COL = 'Image'
+ANSWER_KEYS = ('A', 'B', 'C', 'D')
+# questions load_spreadsheet_progressively() reads before it returns
+FIRST_QUESTIONS = 32
+
+
+def _clean(column):
+    """str() and strip every cell of a column in one pass."""
+    return list(map(str.strip, map(str, column)))
+
+
+def normalize_columns(columns, n_rows, start=0):
+    """
+    Normalizes a bank held as columns: {"QN": [...], "Question": [...], "A": [...], ...}.
+
+    Every column is cleaned in a single pass (str() + strip), the answer column
+    is upper-cased and checked against A-D and QN is parsed as an int. Rows
+    that fail either check are dropped. Returns (bank, rejected) where
+    rejected is a list of {"row", "reason", "value"} dicts in row order
+    ("row" is 1-based, like the app's warnings; `start` offsets it when the
+    columns are one batch of a longer sheet).
+    """
+    with instrument.span("normalize"):
+        return _normalize_columns(columns, n_rows, start)
+
+
+def _normalize_columns(columns, n_rows, start):
+    question, a, b, c, d = (_clean(columns[name]) for name in REQUIRED_COLS[:5])
+    answers = [s.upper() for s in _clean(columns['Answer'])]
+    answer_ok = [s in ANSWER_KEYS for s in answers]
+
+    rejected = [
+        {"row": start + i + 1, "reason": "invalid answer key", "value": answers[i]}
+        for i, ok in enumerate(answer_ok) if not ok
+    ]
+
+    if 'QN' in columns:
+        qns = []
+        for i, s in enumerate(_clean(columns['QN'])):
+            try:
+                qns.append(int(s))
+            except ValueError:
+                qns.append(None)
+                if answer_ok[i]:
+                    answer_ok[i] = False
+                    rejected.append({"row": start + i + 1, "reason": "invalid QN", "value": s})
+        rejected.sort(key=lambda r: r["row"])
+    else:
+        qns = range(start + 1, start + n_rows + 1)
+
+    cols = [qns, question, a, b, c, d, answers]
+    if IMAGE_COL in columns:
+        cols.append(_clean(columns[IMAGE_COL]))
+    if rejected:
+        cols = [list(compress(col, answer_ok)) for col in cols]
+    return QuestionBank.from_columns(*cols), rejected
+
+
+def columns_from_rows(header, rows):
+    """Transposes data rows into {column name: values}, padding short rows with ''."""
+    header = [str(h).strip() for h in header]
+    transposed = list(zip_longest(*rows, fillvalue=''))
+    empty = ('',) * len(rows)
+    return {
+        name: transposed[i] if i < len(transposed) else empty
+        for i, name in enumerate(header)
+    }
+
+
+def questions_from_columns(columns, n_rows):
+    """Checks the required columns, normalizes and prints a warning for every skipped row."""
+    if not all(col in columns for col in REQUIRED_COLS):
+        print("Error: DataFrame missing required columns (Question, A, B, C, D, Answer).")
+        return QuestionBank.empty()
+
+    questions, rejected = normalize_columns(columns, n_rows)
+    for r in rejected:
+        print(f"Warning: Skipping question {r['row']} due to {r['reason']}.")
+    return questions
+
+
+def questions_from_rows(header, rows):
+    """
+    Builds a QuestionBank from a header row and data rows (lists of cell values).
+
+    This is the same normalization the app always did on its DataFrame: every
+    cell is str()-ed and stripped, the answer letter is upper-cased and rows
+    with an answer outside A-D are skipped with a warning. The work is done
+    column by column (see normalize_columns), not row by row.
+    """
+    return questions_from_columns(columns_from_rows(header, rows), len(rows))
+
+
+def questions_from_payload(payload):
+    """Loads the remote list-of-lists format: a header row followed by data rows."""
+    if not payload:
+        return QuestionBank.empty()
+    return questions_from_rows(payload[0], payload[1:])
+
+
+def questions_from_csv(text):
+    """Loads questions from CSV text (blank lines are ignored, like pandas does)."""
+    rows = [r for r in csv.reader(io.StringIO(text)) if r]
+    if not rows:
+        return QuestionBank.empty()
+    return questions_from_rows(rows[0], rows[1:])
+
+
+def columns_from_dataframe(df):
+    """{column name: values} of a pandas DataFrame."""
+    columns = {str(name).strip(): df[name].tolist() for name in df.columns}
+    if IMAGE_COL in columns:
+        # most questions have no image: keep those cells empty, not "nan"
+        columns[IMAGE_COL] = ["" if v != v or v is None else v for v in columns[IMAGE_COL]]
+    return columns
+
+
+def questions_from_dataframe(df):
+    """Loads questions from an already-built pandas DataFrame, one column at a time."""
+    return questions_from_columns(columns_from_dataframe(df), len(df))
+
+
+def parse_spreadsheet(filepath):
+    """Parses an .ods/.xlsx file with the streaming reader, falling back to pandas."""
+    from mcq import stream_reader
+
+    try:
+        with instrument.span("parse.spreadsheet"):
+            return stream_reader.read_questions(filepath)
+    except Exception as e:
+        print(f"Streaming reader failed on {filepath}: {e}. Trying pandas instead.")
+        return parse_spreadsheet_pandas(filepath)
+
+
+def parse_spreadsheet_pandas(filepath):
+    """Parses an .ods/.xlsx file with pandas. This is the only place pandas gets imported."""
+    import pandas as pd
+
+    with instrument.span("parse.pandas"):
+        return questions_from_dataframe(pd.read_excel(filepath, dtype=str))
+
+
+def load_spreadsheet(filepath, cache_dir=None):
+    """Loads a spreadsheet bank through the compiled cache, parsing it only on a miss."""
+    return bank_cache.load_cached_bank(filepath, parse_spreadsheet, cache_dir)
+
+
+def load_spreadsheet_progressively(filepath, on_complete, cache_dir=None, first=FIRST_QUESTIONS):
+    """
+    Like load_spreadsheet(), but a sheet that has to be parsed returns after
+    its first `first` questions. The rest is read on a daemon thread, which
+    writes the compiled cache and calls on_complete(bank) with the whole
+    bank. on_complete isn't called if the first call already returned all of it.
+    """
+    from mcq import stream_reader
+
+    questions = bank_cache.read_cached_bank(filepath, cache_dir)
+    if questions is not None:
+        return questions
+    instrument.count("cache.miss")
+    head, n = [], 0
+    batches = stream_reader.iter_question_batches(filepath)
+    try:
+        with instrument.span("parse.first"):
+            for batch in batches:
+                head.append(batch)
+                n += len(batch)
+                if n >= first:
+                    break
+            else:
+                batches = None  # that was the whole sheet
+    except Exception as e:
+        print(f"Streaming reader failed on {filepath}: {e}. Trying pandas instead.")
+        return load_spreadsheet(filepath, cache_dir)
+    questions = QuestionBank.concat(head)
+    if batches is None or not questions:
+        if questions:
+            bank_cache.save_compiled(filepath, questions, cache_dir)
+            return questions
+        return load_spreadsheet(filepath, cache_dir)
+
+    def read_rest():
+        try:
+            with instrument.span("parse.spreadsheet"):
+                whole = QuestionBank.concat([questions, *batches])
+        except Exception as e:
+            print(f"Streaming reader failed on {filepath}: {e}. Trying pandas instead.")
+            whole = parse_spreadsheet_pandas(filepath)
+        if whole:
+            bank_cache.save_compiled(filepath, whole, cache_dir)
+            on_complete(whole)
+
+    threading.Thread(target=read_rest, name=f"sheet-{os.path.basename(filepath)}", daemon=True).start()
+    return questions
@@ -0,0 +1,353 @@
+# Compact in-memory question bank.
+#
+# A bank used to be a list of dicts, each with a nested "options" dict and
+# the answer stored as yet another "option X" string. QuestionBank keeps the
+# same data as a handful of flat columns instead:
+#
+#   qns      array of ints (or a list, if some questions have no number)
+#   texts    list of question strings
+#   options  one flat list, 4 interned strings per question
+#   answers  bytearray, 0-3 per question
+#   images   list of image sources ("" for none), or None if no question has one
+#
+# Views (slices, `take`) share those columns and only hold their own index,
+# so they're cheap to make. bank[i] returns a small Question accessor.
+#
+# A view can also carry one byte per question naming a permutation of its
+# options (see PERMUTATIONS); such a view shows the options in that order
+# and remaps the answer to match, still without copying anything.
+
+import itertools
+import sys
+from array import array
+
+OPTION_KEYS = ("option A", "option B", "option C", "option D")
+ANSWER_LETTERS = "ABCD"
+
+# The 24 orders of four options; PERMUTATIONS[0] is the sheet's order.
+# perm[slot] is the sheet index of the option shown in that slot.
+PERMUTATIONS = tuple(itertools.permutations(range(4)))
+_PERM_IDS = {perm: i for i, perm in enumerate(PERMUTATIONS)}
+# _SLOT_OF[perm id][sheet index] is the slot that option is shown in
+_SLOT_OF = tuple(tuple(perm.index(i) for i in range(4)) for perm in PERMUTATIONS)
+
+
+class Question:
+    """Read-only accessor for one question of a QuestionBank."""
+
+    __slots__ = ("_bank", "_row")
+
+    def __init__(self, bank, row):
+        self._bank = bank
+        self._row = row
+
+    @property
+    def qn(self):
+        return self._bank._qns[self._row]
+
+    @property
+    def text(self):
+        return self._bank._texts[self._row]
+
+    @property
+    def options(self):
+        """The four option texts, in A-D order."""
+        start = self._row * 4
+        return tuple(self._bank._options[start:start + 4])
+
+    def option_items(self):
+        """(radio value, text) pairs: ("option A", ...) .. ("option D", ...)."""
+        return tuple(zip(OPTION_KEYS, self.options))
+
+    def option_text(self, key):
+        """Text of an option given its radio value, e.g. "option B"."""
+        return self._bank._options[self._row * 4 + OPTION_KEYS.index(key)]
+
+    def source_key(self, key):
+        """The radio value the option shown as `key` has in the sheet."""
+        return key
+
+    @property
+    def image(self):
+        """Image source (URL or path) for the question, or "" if it has none."""
+        images = self._bank._images
+        return images[self._row] if images is not None else ""
+
+    @property
+    def answer_index(self):
+        return self._bank._answers[self._row]
+
+    @property
+    def answer(self):
+        """Radio value of the correct option, e.g. "option C"."""
+        return OPTION_KEYS[self._bank._answers[self._row]]
+
+    @property
+    def correct_text(self):
+        return self._bank._options[self._row * 4 + self._bank._answers[self._row]]
+
+    def as_row(self):
+        """(qn, question, A, B, C, D, answer letter)."""
+        return (self.qn, self.text, *self.options, ANSWER_LETTERS[self.answer_index])
+
+    def to_dict(self):
+        """The old dict form: {"qn", "question", "options": {...}, "answer"} (+ "image")."""
+        d = {
+            "qn": self.qn,
+            "question": self.text,
+            "options": dict(self.option_items()),
+            "answer": self.answer,
+        }
+        if self.image:
+            d["image"] = self.image
+        return d
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return self.as_row() == other.as_row()
+
+    def __hash__(self):
+        return hash(self.as_row())
+
+    def __repr__(self):
+        return f"Question(qn={self.qn!r}, text={self.text!r})"
+
+
+class ShuffledQuestion(Question):
+    """A Question whose options are shown in another order; `answer` follows them."""
+
+    __slots__ = ("_perm",)
+
+    def __init__(self, bank, row, perm):
+        super().__init__(bank, row)
+        self._perm = perm
+
+    @property
+    def options(self):
+        start = self._row * 4
+        options = self._bank._options
+        return tuple(options[start + i] for i in self._perm)
+
+    def option_text(self, key):
+        return self._bank._options[self._row * 4 + self._perm[OPTION_KEYS.index(key)]]
+
+    def source_key(self, key):
+        return OPTION_KEYS[self._perm[OPTION_KEYS.index(key)]]
+
+    @property
+    def answer_index(self):
+        return self._perm.index(self._bank._answers[self._row])
+
+    @property
+    def answer(self):
+        return OPTION_KEYS[self.answer_index]
+
+
+class QuestionBank:
+    """A list-like, read-only collection of questions stored as columns."""
+
+    __slots__ = ("_qns", "_texts", "_options", "_answers", "_images", "_index", "_perms", "_qn_map")
+
+    def __init__(self, qns, texts, options, answers, index=None, perms=None, images=None):
+        self._qns = qns
+        self._texts = texts
+        self._options = options
+        self._answers = answers
+        self._images = images
+        self._index = range(len(texts)) if index is None else index
+        self._perms = perms  # None, or a PERMUTATIONS id per position
+        self._qn_map = None
+
+    # --- construction ---
+
+    @classmethod
+    def from_columns(cls, qns, texts, a, b, c, d, answer_letters, images=None):
+        """Builds a bank from per-field columns; answers are letters A-D."""
+        intern = sys.intern
+        options = [intern(s) for quad in zip(a, b, c, d) for s in quad]
+        answers = bytearray(ANSWER_LETTERS.index(x) for x in answer_letters)
+        return cls(_compact_qns(qns), list(texts), options, answers, images=_compact_images(images))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a bank from (qn, question, A, B, C, D, answer letter) tuples."""
+        rows = list(rows)
+        if not rows:
+            return cls.empty()
+        return cls.from_columns(*zip(*rows))
+
+    @classmethod
+    def from_questions(cls, questions):
+        """Builds a bank from the old list-of-dicts form (answers "option X" or "X")."""
+        questions = list(questions)
+        bank = cls.from_rows(
+            (
+                q.get("qn", i + 1),
+                q["question"],
+                *(q["options"][key] for key in OPTION_KEYS),
+                str(q["answer"]).strip()[-1].upper(),
+            )
+            for i, q in enumerate(questions)
+        )
+        bank._images = _compact_images([q.get("image", "") for q in questions])
+        return bank
+
+    @classmethod
+    def from_compact(cls, qns, texts, options, answers, images=None):
+        """Rebuilds a bank from the tuple returned by `compact()`."""
+        return cls(_compact_qns(qns), list(texts), list(options), bytearray(answers),
+                   images=_compact_images(images))
+
+    @classmethod
+    def concat(cls, banks):
+        """Joins several banks (or views) into one new bank."""
+        qns, texts, options, answers, images = [], [], [], bytearray(), []
+        for bank in banks:
+            b_qns, b_texts, b_options, b_answers, b_images = bank.compact()
+            qns.extend(b_qns)
+            texts.extend(b_texts)
+            options.extend(b_options)
+            answers.extend(b_answers)
+            images.extend(b_images or [""] * len(b_texts))
+        return cls(_compact_qns(qns), texts, options, answers, images=_compact_images(images))
+
+    @classmethod
+    def empty(cls):
+        return cls(array("q"), [], [], bytearray())
+
+    # --- access ---
+
+    def __len__(self):
+        return len(self._index)
+
+    def __bool__(self):
+        return len(self._index) > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._view(self._index[i], None if self._perms is None else self._perms[i])
+        if self._perms is None:
+            return Question(self, self._index[i])
+        return ShuffledQuestion(self, self._index[i], PERMUTATIONS[self._perms[i]])
+
+    def __iter__(self):
+        if self._perms is None:
+            for row in self._index:
+                yield Question(self, row)
+        else:
+            for row, perm in zip(self._index, self._perms):
+                yield ShuffledQuestion(self, row, PERMUTATIONS[perm])
+
+    def __eq__(self, other):
+        if not isinstance(other, QuestionBank):
+            return NotImplemented
+        return len(self) == len(other) and self.rows() == other.rows()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"QuestionBank({len(self)} questions)"
+
+    def take(self, positions, perms=None):
+        """
+        A view of the questions at `positions` (indices into this bank), in
+        that order. `perms` optionally gives a PERMUTATIONS id per position to
+        reorder its options (on top of any order this view already has).
+        """
+        index = self._index
+        if perms is None and self._perms is None:
+            return self._view(array("l", (index[p] for p in positions)))
+        positions = list(positions)
+        if self._perms is not None:
+            own = [self._perms[p] for p in positions]
+            if perms is None:
+                perms = own
+            else:
+                perms = [_PERM_IDS[tuple(PERMUTATIONS[a][i] for i in PERMUTATIONS[b])]
+                         for a, b in zip(own, perms)]
+        return self._view(array("l", (index[p] for p in positions)), bytes(perms))
+
+    def index_of(self, qn):
+        """Position of the question numbered `qn`, or None. O(1) after the first call."""
+        if self._qn_map is None:
+            qn_map = {}
+            for pos, row in enumerate(self._index):
+                qn_map.setdefault(self._qns[row], pos)
+            self._qn_map = qn_map
+        return self._qn_map.get(qn)
+
+    def qns(self):
+        """The question numbers, in bank order."""
+        qns = self._qns
+        return [qns[row] for row in self._index]
+
+    def answer_indices(self):
+        """The correct option of every question as shown (0-3), in bank order, as bytes."""
+        answers = self._answers
+        if self._perms is None:
+            return bytes(answers[row] for row in self._index)
+        return bytes(_SLOT_OF[perm][answers[row]] for row, perm in zip(self._index, self._perms))
+
+    def compact(self):
+        """(qns, texts, options, answers, images) as plain lists/bytes, e.g. for marshal."""
+        index = self._index
+        images = self._images
+        if images is not None:
+            images = [images[row] for row in index]
+        if self._perms is not None:
+            questions = list(self)
+            return (
+                [self._qns[row] for row in index],
+                [self._texts[row] for row in index],
+                [s for q in questions for s in q.options],
+                bytes(q.answer_index for q in questions),
+                images,
+            )
+        if isinstance(index, range) and index == range(len(self._texts)) and type(self._texts) is list:
+            return list(self._qns), self._texts, self._options, bytes(self._answers), images
+        options = self._options
+        return (
+            [self._qns[row] for row in index],
+            [self._texts[row] for row in index],
+            [s for row in index for s in options[row * 4:row * 4 + 4]],
+            bytes(self._answers[row] for row in index),
+            images,
+        )
+
+    def text_rows(self):
+        """Yields (qn, question, options) for every question in bank order, options as shown."""
+        qns, texts, options, _, _ = self.compact()
+        for i, qn in enumerate(qns):
+            yield qn, texts[i], options[i * 4:i * 4 + 4]
+
+    def rows(self):
+        """Every question as a (qn, question, A, B, C, D, answer letter) tuple."""
+        return [q.as_row() for q in self]
+
+    def to_dicts(self):
+        """The old list-of-dicts form, for code that still wants it."""
+        return [q.to_dict() for q in self]
+
+    def _view(self, index, perms=None):
+        return QuestionBank(self._qns, self._texts, self._options, self._answers, index, perms,
+                            self._images)
+
+
+def _compact_qns(qns):
+    """Stores question numbers as a machine-int array when they're all ints."""
+    qns = list(qns)
+    if all(type(qn) is int for qn in qns):
+        try:
+            return array("q", qns)
+        except OverflowError:
+            pass
+    return qns
+
+
+def _compact_images(images):
+    """The image column as a list, or None when no question has an image."""
+    if images is None:
+        return None
+    images = list(images)
+    return images if any(images) else None
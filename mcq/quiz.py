@@ -0,0 +1,89 @@
+# Seeded random quizzes over a loaded bank.
+#
+# generate() draws k questions with random.Random(seed).sample, which picks
+# k distinct positions in O(k) when k is small next to the bank, and gives
+# each one of the 24 option orders. The result is a QuestionBank view (an
+# index array plus one permutation byte per question) over the shared bank
+# columns, so a quiz costs a few bytes per question however big the bank is,
+# and the same bank + seed always gives the same quiz: answers can be graded
+# later with answer_key().
+#
+# The sheets have no topic column, so stratified sampling takes the labels
+# from the caller: strata_by(bank, key) groups positions once per bank, and
+# generate(..., strata=...) then samples each group in proportion to its size.
+#
+# MCQ_QUIZ_SIZE=k gives every app session its own quiz of k questions;
+# MCQ_SHUFFLE_OPTIONS=0 keeps the sheet's option order.
+
+import os
+import random
+import secrets
+from array import array
+
+from mcq.question_bank import ANSWER_LETTERS, PERMUTATIONS
+
+QUIZ_SIZE = int(os.environ.get("MCQ_QUIZ_SIZE", "0") or 0)
+ENABLED = QUIZ_SIZE > 0
+SHUFFLE_OPTIONS = os.environ.get("MCQ_SHUFFLE_OPTIONS", "1") != "0"
+
+
+def new_seed():
+    """A fresh seed for generate(), to keep with the quiz's answers."""
+    return secrets.randbits(32)
+
+
+def strata_by(bank, key):
+    """{label: array of positions} grouping `bank` by key(question), in first-seen order."""
+    strata = {}
+    for pos, question in enumerate(bank):
+        label = key(question)
+        positions = strata.get(label)
+        if positions is None:
+            positions = strata[label] = array("l")
+        positions.append(pos)
+    return strata
+
+
+def _allocate(sizes, k):
+    """Splits k over groups in proportion to their sizes (largest remainder)."""
+    total = sum(sizes)
+    shares = [k * size / total for size in sizes]
+    counts = [int(share) for share in shares]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: counts[i] - shares[i])
+    for i in by_remainder[:k - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def generate(bank, k, seed, shuffle_options=SHUFFLE_OPTIONS, strata=None):
+    """
+    A quiz of min(k, len(bank)) questions from `bank` as a QuestionBank view.
+
+    With `strata` (see strata_by) every group contributes in proportion to
+    its size and the picks are then shuffled together.
+    """
+    rng = random.Random(seed)
+    k = min(k, len(bank))
+    if strata is None:
+        positions = rng.sample(range(len(bank)), k)
+    else:
+        groups = list(strata.values())
+        positions = []
+        for group, count in zip(groups, _allocate([len(g) for g in groups], k)):
+            positions.extend(rng.sample(group, count))
+        rng.shuffle(positions)
+    perms = None
+    if shuffle_options:
+        perms = bytes(rng.randrange(len(PERMUTATIONS)) for _ in range(k))
+    return bank.take(positions, perms)
+
+
+def answer_key(quiz):
+    """The correct letters of a quiz, in quiz order (e.g. "CADB...")."""
+    return "".join(ANSWER_LETTERS[i] for i in quiz.answer_indices())
+
+
+def grade(bank, k, seed, letters, **options):
+    """Score of `letters` (one per question, as shown) for the quiz generate() gives for `seed`."""
+    key = answer_key(generate(bank, k, seed, **options))
+    return sum(1 for given, right in zip(letters, key) if given == right)
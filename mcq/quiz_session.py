@@ -0,0 +1,248 @@
+# The quiz itself, without any UI.
+#
+# QuizSession is one user's round as a small state machine. Its state is a
+# handful of ints, the round's answer key and one byte per question for the
+# option chosen. The Flet front ends (main.py, src/main_class.py) drive it
+# and redraw from its fields. The phases go
+#
+#   IDLE -start()-> QUESTION -check()-> ANSWERED -next()-> QUESTION ... -> FINISHED
+#
+# with restart() starting a new round (optionally on a new bank or quiz),
+# jump() showing any question (a search result), and finish() ending the
+# round early (the exam time ran out). A call that doesn't fit the current
+# phase changes nothing and returns None, the same as a stray click.
+#
+# Side effects of a transition (logging the answer, item stats, marking the
+# question seen) subscribe to its events. fn(event, session) is called
+# with "question", "checked" or "finished", and a session with no
+# subscribers pays nothing for them.
+#
+# check() reads the right answer from the question on screen, so a session
+# over a StoredBank (MCQ_STORE) only touches the pages it shows. A caller
+# that already holds the round's answer key (QuestionBank.answer_indices())
+# can pass it in, and check() is then a byte comparison. mcq.simulator does
+# this to run millions of sessions a minute.
+#
+# An optional `order` (a scheduler.Scheduler, MCQ_ORDER=spaced) picks each
+# next position and is graded on every check; the round then ends after
+# len(questions) questions. A session isn't thread-safe: the app calls it
+# under its bank lock.
+
+from mcq.question_bank import OPTION_KEYS
+
+IDLE, QUESTION, ANSWERED, FINISHED = range(4)
+PHASES = ("idle", "question", "answered", "finished")
+
+# events
+SHOWN = "question"
+CHECKED = "checked"
+DONE = "finished"
+
+
+class QuizSession:
+    """One user's round of a quiz: position, score and chosen options, with events."""
+
+    __slots__ = ("questions", "key", "order", "listeners", "phase", "pos", "asked", "score",
+                 "selected", "correct", "timed_out", "choices")
+
+    def __init__(self, questions, order=None, key=None):
+        self.questions = questions
+        self.key = key              # answer per position as bytes, or None to read it per check
+        self.order = order
+        self.listeners = []
+        self.phase = IDLE
+        self.pos = self.asked = self.score = 0
+        self.selected = -1          # option picked on the question on screen, -1 for none
+        self.correct = False        # result of the last check()
+        self.timed_out = False
+        self.choices = bytearray(len(questions))  # per position: 0 = no answer, else option + 1
+
+    def subscribe(self, fn):
+        """Calls fn(event, session) on every transition; returns fn."""
+        self.listeners.append(fn)
+        return fn
+
+    def _emit(self, event):
+        for fn in self.listeners:
+            fn(event, self)
+
+    # --- transitions ---
+
+    def start(self):
+        """Starts the round on its first question; returns its position."""
+        self.asked = self.score = 0
+        self.choices = bytearray(len(self.questions))
+        self.pos = self.order.next_position() if self.order is not None and self.questions else 0
+        self._show()
+        return self.pos
+
+    def restart(self, questions=None, key=None):
+        """Starts a new round, on `questions` if given (a new quiz or a refreshed bank)."""
+        if questions is not None and questions is not self.questions:
+            self._set_bank(questions, key)
+        return self.start()
+
+    def select(self, choice):
+        """Picks an option for the question on screen: 0-3, its radio value, or None to clear."""
+        if self.phase != QUESTION:
+            return None
+        if choice is None:
+            self.selected = -1
+        elif choice.__class__ is int:
+            if not 0 <= choice < len(OPTION_KEYS):
+                raise ValueError(f"no option {choice}")
+            self.selected = choice
+        else:
+            self.selected = OPTION_KEYS.index(choice)
+        return True
+
+    def check(self, timed_out=False):
+        """
+        Grades the question on screen and returns whether it was right. Returns
+        None if no option is picked, unless the time ran out (then it's wrong).
+        """
+        if self.phase != QUESTION:
+            return None
+        selected = self.selected
+        if selected < 0 and not timed_out:
+            return None
+        pos = self.pos
+        key = self.key
+        correct = selected == (key[pos] if key is not None else self.questions[pos].answer_index)
+        if selected >= 0:
+            self.choices[pos] = selected + 1
+        if correct:
+            self.score += 1
+        self.correct = correct
+        self.timed_out = timed_out
+        self.phase = ANSWERED
+        if self.order is not None:
+            self.order.grade(pos, correct)
+        if self.listeners:
+            self._emit(CHECKED)
+        return correct
+
+    def next(self, questions=None, pos=None):
+        """
+        Moves on from a checked question; returns the new position. With
+        `questions` the round continues in that bank (a refreshed download)
+        at `pos`.
+        """
+        if self.phase != ANSWERED:
+            return None
+        if questions is not None:
+            self.replace_bank(questions, pos)
+        elif self.order is None:
+            self.pos += 1
+        if self.order is not None:
+            self.asked += 1
+            n = len(self.questions)
+            self.pos = self.order.next_position() if self.asked < n else n
+        self._show()
+        return self.pos
+
+    def jump(self, pos):
+        """Shows the question at `pos`, even after the round finished."""
+        if not 0 <= pos < len(self.questions):
+            return None
+        self.pos = pos
+        self._show()
+        return pos
+
+    def finish(self):
+        """Ends the round now, e.g. when the exam time runs out."""
+        if self.phase == FINISHED:
+            return None
+        self._end()
+        return self.score
+
+    def _end(self):
+        self.pos = len(self.questions)
+        self.phase = FINISHED
+        if self.listeners:
+            self._emit(DONE)
+
+    def _show(self):
+        if self.pos >= len(self.questions):
+            self._end()
+            return
+        self.phase = QUESTION
+        self.selected = -1
+        self.timed_out = False
+        if self.listeners:
+            self._emit(SHOWN)
+
+    # --- bank changes ---
+
+    def _set_bank(self, questions, key=None):
+        self.questions = questions
+        self.key = key
+        if self.order is not None:
+            self.order.set_bank(questions)
+
+    def replace_bank(self, questions, pos, key=None):
+        """Swaps in a refreshed bank mid-round at `pos`; answers given so far follow their qn."""
+        old, choices = self.questions, self.choices
+        self._set_bank(questions, key)
+        moved = bytearray(len(questions))
+        if any(choices):
+            old_qns = old.qns()
+            for p, c in enumerate(choices):
+                if c:
+                    q = questions.index_of(old_qns[p])
+                    if q is not None:
+                        moved[q] = c
+        self.choices = moved
+        self.pos = pos
+
+    # --- reading ---
+
+    @property
+    def finished(self):
+        return self.phase == FINISHED
+
+    @property
+    def current(self):
+        """The Question on screen, or None when the round is over."""
+        return self.questions[self.pos] if self.phase in (QUESTION, ANSWERED) else None
+
+    def upcoming(self):
+        """
+        Position next() will show, or None if there is none or it isn't known
+        yet. With an order it's only known once the question on screen is
+        checked, since the grade can bring that question straight back.
+        """
+        if self.order is None:
+            pos = self.pos + 1
+            return pos if self.phase in (QUESTION, ANSWERED) and pos < len(self.questions) else None
+        if self.phase != ANSWERED or self.asked + 1 >= len(self.questions):
+            return None
+        return self.order.next_position()
+
+    @property
+    def progress(self):
+        """Questions already asked this round (the scheduler's count, or the position)."""
+        return self.asked if self.order is not None else self.pos
+
+    def choice(self, pos):
+        """Option (0-3) answered at `pos`, or None."""
+        c = self.choices[pos]
+        return c - 1 if c else None
+
+    def chosen(self):
+        """{qn: radio value} for every answered question, for the review screen."""
+        qns = self.questions.qns()
+        return {qns[p]: OPTION_KEYS[c - 1] for p, c in enumerate(self.choices) if c}
+
+    def state(self):
+        """The session's state as a small tuple of ints and bytes (the bank isn't included)."""
+        return (self.phase, self.pos, self.asked, self.score, self.selected, bytes(self.choices))
+
+    def restore(self, state):
+        """Puts back a state() taken on the same bank."""
+        self.phase, self.pos, self.asked, self.score, self.selected, choices = state
+        self.choices = bytearray(choices)
+
+    def __repr__(self):
+        n = len(self.questions)
+        return f"QuizSession({PHASES[self.phase]}, question {min(self.pos + 1, n)}/{n}, score {self.score})"
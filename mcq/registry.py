@@ -0,0 +1,216 @@
+# Process-wide question bank registry.
+#
+# When the app runs as a Flet web server, main(page) runs once per browser
+# session. Without sharing, every session would load and fetch its own copy
+# of the bank. The registry keeps one read-only QuestionBank per name for the
+# whole process:
+#
+#   - the first get() loads the bank; sessions that arrive while that load is
+#     running wait for it instead of starting their own (single flight)
+#   - refreshes are single flight too, and skipped if the bank is fresh;
+#     after a failed fetch, new sessions wait out a growing backoff
+#   - a successful refresh replaces the shared bank and is pushed to every
+#     subscribed session (each one swaps it in without losing its place)
+#   - schedule_refresh() re-fetches on a timer from a single daemon thread
+#   - complete() swaps a progressively loaded sheet for its whole bank
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+# How old a bank may get before a new session triggers a refresh, and how
+# often the background timer refreshes it. 0 disables the timer.
+REFRESH_SECONDS = float(os.environ.get("MCQ_REFRESH_SECONDS", "900"))
+# How long new sessions wait before retrying a failed fetch; doubles with
+# each further failure, up to REFRESH_SECONDS.
+FAILURE_BACKOFF = 30.0
+
+
+class BankRegistry:
+    """Loads each bank once and shares it between all sessions of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._banks = {}        # name -> QuestionBank
+        self._refreshed = {}    # name -> time.monotonic() of the last successful fetch
+        self._failed = {}       # name -> (time.monotonic() of the last failed fetch, failures in a row)
+        self._inflight = {}     # (kind, name) -> Future
+        self._subscribers = {}  # name -> list of callbacks
+        self._timers = {}       # name -> timer thread
+        # how many times each kind of work actually ran, e.g. {("fetch", "Fungi"): 1}
+        self.counts = {}
+
+    def _single_flight(self, key, fn):
+        """Runs fn() once for concurrent callers with the same key; all of them get its result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.counts[key] = self.counts.get(key, 0) + 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return result
+
+    def get(self, name, load):
+        """Returns the shared bank `name`, calling load() only if nobody has loaded it yet."""
+        bank = self._banks.get(name)
+        if bank is not None:
+            return bank
+
+        def load_once():
+            bank = self._banks.get(name)
+            if bank is None:
+                bank = load()
+                if bank:
+                    with self._lock:
+                        self._banks.setdefault(name, bank)
+                        bank = self._banks[name]
+            return bank
+
+        return self._single_flight(("load", name), load_once)
+
+    def peek(self, name):
+        """The shared bank if it is loaded, else None."""
+        return self._banks.get(name)
+
+    def is_stale(self, name, max_age=REFRESH_SECONDS):
+        last = self._refreshed.get(name)
+        return last is None or time.monotonic() - last >= max_age
+
+    def is_backing_off(self, name):
+        """True while a recent failed fetch of `name` should not be retried yet."""
+        failed = self._failed.get(name)
+        if failed is None:
+            return False
+        last, failures = failed
+        backoff = min(FAILURE_BACKOFF * 2 ** (failures - 1), max(REFRESH_SECONDS, FAILURE_BACKOFF))
+        return time.monotonic() - last < backoff
+
+    def publish(self, name, bank):
+        """Replaces the shared bank and hands it to every subscriber."""
+        with self._lock:
+            self._banks[name] = bank
+            self._refreshed[name] = time.monotonic()
+            self._failed.pop(name, None)
+            subscribers = list(self._subscribers.get(name, ()))
+        self._notify(name, bank, subscribers)
+
+    def complete(self, name, bank):
+        """
+        Replaces the first rows of a progressively loaded bank with the whole
+        bank and hands it to every subscriber. Unlike publish() this isn't a
+        refresh (the remote fetch still runs), and it is dropped if a fetched
+        bank was published in the meantime. Returns whether it was used.
+        """
+        with self._lock:
+            if not bank or name in self._refreshed:
+                return False
+            self._banks[name] = bank
+            subscribers = list(self._subscribers.get(name, ()))
+        self._notify(name, bank, subscribers)
+        return True
+
+    @staticmethod
+    def _notify(name, bank, subscribers):
+        for callback in subscribers:
+            try:
+                callback(bank)
+            except Exception as e:
+                print(f"Bank {name}: subscriber failed: {e}")
+
+    def refresh(self, name, fetch, max_age=0):
+        """
+        Fetches `name` (single flight) and publishes it.
+
+        Does nothing if the bank was refreshed less than `max_age` seconds ago.
+        Returns the new bank, or None if nothing was fetched.
+        """
+        if not self.is_stale(name, max_age):
+            return None
+
+        def fetch_once():
+            if not self.is_stale(name, max_age):
+                return None
+            try:
+                bank = fetch()
+            except BaseException:
+                self._fetch_failed(name)
+                raise
+            if bank:
+                self.publish(name, bank)
+            else:
+                self._fetch_failed(name)
+            return bank
+
+        return self._single_flight(("fetch", name), fetch_once)
+
+    def _fetch_failed(self, name):
+        with self._lock:
+            failures = self._failed.get(name, (0, 0))[1]
+            self._failed[name] = (time.monotonic(), failures + 1)
+
+    def refresh_in_background(self, name, fetch, max_age=REFRESH_SECONDS):
+        """
+        refresh() on a daemon thread, so the calling session isn't blocked.
+        Skipped while the bank is fresh or a failed fetch is backing off.
+        """
+        if not self.is_stale(name, max_age) or ("fetch", name) in self._inflight:
+            return None
+        if self.is_backing_off(name):
+            return None
+        thread = threading.Thread(
+            target=self.refresh, args=(name, fetch, max_age), name=f"bank-refresh-{name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def subscribe(self, name, callback):
+        """Calls callback(bank) whenever `name` is refreshed. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.setdefault(name, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(name, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def schedule_refresh(self, name, fetch, interval=REFRESH_SECONDS):
+        """Starts (once per name) a daemon thread that refreshes `name` every `interval` seconds."""
+        if interval <= 0:
+            return None
+        with self._lock:
+            if name in self._timers:
+                return self._timers[name]
+
+            def run():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.refresh(name, fetch, max_age=interval / 2)
+                    except Exception as e:
+                        print(f"Bank {name}: scheduled refresh failed: {e}")
+
+            thread = threading.Thread(target=run, name=f"bank-timer-{name}", daemon=True)
+            self._timers[name] = thread
+        thread.start()
+        return thread
+
+
+# The registry every session in this process shares
+REGISTRY = BankRegistry()
@@ -0,0 +1,49 @@
+# Remote question bank (Google Apps Script endpoint).
+#
+# The fetch always has explicit connect/read timeouts and never raises, so a
+# bad network can't hang the UI. Banks are synced conditionally against a
+# local versioned copy (see mcq/sync.py). The app runs the fetch off the UI
+# thread through the shared bank registry (see mcq/registry.py).
+
+import os
+
+from mcq import sync
+
+# MCQ_BANK_URL points the app at another endpoint, e.g. `python -m mcq.stub_server`
+BANK_URL = os.environ.get("MCQ_BANK_URL") or "https://script.google.com/macros/s/AKfycbxoqcO6l-xxXvvgvSYGzQ5fwkLoTXFqnIr2Xp4-x152crVv9wvSUeNUSUdSnT_Gd_Xd/exec"
+BANK_NAME = "Fungi"
+
+# (connect, read) in seconds, passed straight to requests
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+
+
+def fetch_remote_questions(user_id, bank=BANK_NAME, url=BANK_URL,
+                           timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+    """
+    Syncs a bank with the Apps Script endpoint.
+
+    Returns the QuestionBank, or None if the request failed, timed
+    out or returned something that isn't a usable bank. A "not modified"
+    answer returns the local copy.
+    """
+    questions, status = sync.sync_bank(user_id, bank, url, timeout)
+    print(f"Bank {bank}: {status}")
+    return questions
+
+def locate_question(questions, qn):
+    """Returns the index of the question numbered `qn`, or None if it isn't in the bank."""
+    return questions.index_of(qn)
+
+
+def index_after(questions, qn):
+    """Returns the index of the question that should follow question `qn` in `questions`."""
+    i = questions.index_of(qn)
+    if i is not None:
+        return i + 1
+    if qn is None:
+        return 0
+    for i, q in enumerate(questions):
+        if q.qn is not None and q.qn > qn:
+            return i
+    return len(questions)
@@ -0,0 +1,169 @@
+# Coalesced page updates for the quiz UI.
+#
+# Handlers don't call page.update() themselves. They name the controls they
+# changed with render.touch(*controls), and the scheduler sends them:
+#
+#   - inside an action (a @render.click handler, or `with render.action(...)`)
+#     nothing is sent until the outermost action ends. Then one
+#     page.update(*dirty) sends every change as a single batch and diffs
+#     only the touched subtrees, not the whole page. Nested helpers that
+#     touch controls (_update_ui inside a click) add no extra update.
+#   - outside any action (image loaded, bank swapped, timer tick) touch()
+#     sends right away, unless an action is running on another thread. Then
+#     the change is sent with that action's flush.
+#
+# @render.click(label) also debounces, per clicked control (per label when a
+# handler is called without an event). A click is dropped if the handler of
+# an earlier click on the same button is still running, or if it arrives
+# within DEBOUNCE_SECONDS of the last accepted one. "Check Answer" turns into
+# "Next Question" in place, so a double-click on it no longer also moves on,
+# while a click on another button (search, review) is never held up by it.
+#
+# `stats` counts per action label: actions, flushes (updates sent), touches
+# and dropped clicks. MCQ_DEBOUNCE_MS sets the window (default 300).
+# MCQ_RENDER=0 goes back to a page.update() per touch (DirectRender).
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("MCQ_RENDER", "1") != "0"
+DEBOUNCE_SECONDS = float(os.environ.get("MCQ_DEBOUNCE_MS", "300")) / 1000
+
+BACKGROUND = "background"
+# click times kept before the stale ones are dropped
+_MAX_CLICK_KEYS = 64
+
+
+def _counter():
+    return {"actions": 0, "flushes": 0, "touches": 0, "dropped": 0}
+
+
+class RenderScheduler:
+    """Collects touched controls and sends them in one page.update() per action."""
+
+    def __init__(self, page=None, debounce=None):
+        self.page = page            # may be set later, e.g. when a custom control mounts
+        self.debounce = DEBOUNCE_SECONDS if debounce is None else debounce
+        self.lock = threading.Lock()
+        self._dirty = {}            # control -> None, in touch order; the page itself = full update
+        self._depth = 0             # open actions, on any thread
+        self._label = BACKGROUND
+        self._clicking = {}         # click key -> handlers running
+        self._last_click = {}       # click key -> time.monotonic() of the last accepted click
+        self.stats = {}
+
+    def _stats(self, label):
+        s = self.stats.get(label)
+        if s is None:
+            s = self.stats[label] = _counter()
+        return s
+
+    def touch(self, *controls):
+        """Marks `controls` (no arguments: the whole page) as changed."""
+        with self.lock:
+            for control in controls or (self.page,):
+                self._dirty[control] = None
+            self._stats(self._label if self._depth else BACKGROUND)["touches"] += 1
+            if self._depth:
+                return
+        self.flush(BACKGROUND)
+
+    @contextmanager
+    def action(self, label):
+        """Groups everything touched until the outermost action ends into one update."""
+        with self.lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._label = label
+                self._stats(label)["actions"] += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self._depth -= 1
+                outermost = self._depth == 0
+                label = self._label
+                if outermost:
+                    self._label = BACKGROUND
+            if outermost:
+                self.flush(label)
+
+    def click(self, label):
+        """Decorator for click handlers: debounced, and run as one action."""
+        def decorate(handler):
+            def wrapper(e=None):
+                key = getattr(e, "control", None)
+                if key is None:
+                    key = label
+                now = time.monotonic()
+                with self.lock:
+                    if self._clicking.get(key) or now - self._last_click.get(key, float("-inf")) < self.debounce:
+                        self._stats(label)["dropped"] += 1
+                        return None
+                    self._clicking[key] = self._clicking.get(key, 0) + 1
+                    self._last_click[key] = now
+                    if len(self._last_click) > _MAX_CLICK_KEYS:
+                        self._forget_clicks(now)
+                try:
+                    with self.action(label):
+                        return handler(e)
+                finally:
+                    with self.lock:
+                        self._clicking[key] -= 1
+                        if not self._clicking[key]:
+                            del self._clicking[key]
+
+            wrapper.__name__ = getattr(handler, "__name__", "click")
+            wrapper.__wrapped__ = handler
+            return wrapper
+
+        return decorate
+
+    def _forget_clicks(self, now):
+        """Drops click times that can no longer debounce anything (e.g. of removed buttons)."""
+        for key, at in list(self._last_click.items()):
+            if now - at >= self.debounce and key not in self._clicking:
+                del self._last_click[key]
+
+    def flush(self, label=BACKGROUND):
+        """Sends everything touched so far in one update."""
+        page = self.page
+        with self.lock:
+            if not self._dirty or page is None:
+                return
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            self._stats(label)["flushes"] += 1
+        if page in dirty:
+            page.update()
+        else:
+            page.update(*dirty)
+
+
+class DirectRender:
+    """Stand-in used with MCQ_RENDER=0: every touch is its own page.update(), no debouncing."""
+
+    def __init__(self, page=None):
+        self.page = page
+        self.stats = {}
+
+    def touch(self, *controls):
+        if self.page is not None:
+            self.page.update()
+
+    @contextmanager
+    def action(self, label):
+        yield self
+
+    def click(self, label):
+        return lambda handler: handler
+
+    def flush(self, label=BACKGROUND):
+        pass
+
+
+def renderer_for(page=None):
+    """A RenderScheduler for one session's page, or a DirectRender when MCQ_RENDER=0."""
+    return RenderScheduler(page) if ENABLED else DirectRender(page)
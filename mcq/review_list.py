@@ -0,0 +1,122 @@
+# Review screen: every question of the round with the answer given and the
+# correct one, for banks of any size.
+#
+# Only one page of rows exists on the client. ReviewList builds PAGE_ROWS
+# row controls once and recycles them: moving to another page (scrolling to
+# the end of the list, or the Previous / Next buttons) only relabels those
+# rows, so each page turn sends a property patch of the same size whether the
+# round had 20 questions or 100,000, and nothing is built for rows that are
+# never looked at. Page turns are sent through the session's renderer (see
+# mcq/render.py) when one is given.
+
+import flet as ft
+
+PAGE_ROWS = 20
+ROW_HEIGHT = 96
+
+
+class _Row:
+    """One recycled row: question, the answer given, the correct answer."""
+
+    def __init__(self):
+        self.question = ft.Text("", weight=ft.FontWeight.BOLD, max_lines=2,
+                                overflow=ft.TextOverflow.ELLIPSIS)
+        self.given = ft.Text("", size=13)
+        self.correct = ft.Text("", size=13, color=ft.Colors.GREEN_700)
+        self.control = ft.Container(
+            ft.Column([self.question, self.given, self.correct], spacing=2),
+            height=ROW_HEIGHT,
+            padding=8,
+            border_radius=8,
+            bgcolor=ft.Colors.BLUE_GREY_50,
+        )
+
+    def show(self, number, question, key):
+        self.question.value = f"{number}. {question.text}"
+        if key is None:
+            self.given.value = "Not answered"
+            self.given.color = ft.Colors.GREY_600
+        else:
+            right = key == question.answer
+            self.given.value = f"{'✅' if right else '❌'} Your answer: {key[-1]}. {question.option_text(key)}"
+            self.given.color = ft.Colors.GREEN_700 if right else ft.Colors.RED_700
+        self.correct.value = f"Correct: {question.answer[-1]}. {question.correct_text}"
+        self.control.visible = True
+
+
+class ReviewList:
+    """A paged, recycled list of review rows; `control` goes into the page."""
+
+    def __init__(self, page_rows=PAGE_ROWS, renderer=None):
+        self.page_rows = page_rows
+        self.renderer = renderer
+        self.questions = None
+        self.choices = {}
+        self.page = 0
+        self._rows = [_Row() for _ in range(page_rows)]
+        self.list_view = ft.ListView(
+            [row.control for row in self._rows],
+            spacing=6,
+            item_extent=ROW_HEIGHT + 6,
+            height=400,
+            on_scroll_interval=100,
+            on_scroll=self._scrolled,
+        )
+        self.status = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.prev_button = ft.TextButton("< Previous", on_click=lambda e: self.turn(-1))
+        self.next_button = ft.TextButton("Next >", on_click=lambda e: self.turn(1))
+        self.control = ft.Column(
+            [
+                self.list_view,
+                ft.Row([self.prev_button, self.status, self.next_button],
+                       alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            ],
+            visible=False,
+        )
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self.questions) // self.page_rows)) if self.questions else 1
+
+    def show(self, questions, choices):
+        """
+        Points the list at a round: `questions` (a bank or view) and `choices`,
+        {qn: radio value given}. Call page.update() afterwards.
+        """
+        self.questions = questions
+        self.choices = choices
+        self.page = 0
+        self._render()
+
+    def turn(self, step):
+        """Moves `step` pages and sends the relabelled rows."""
+        page = min(max(self.page + step, 0), self.pages - 1)
+        if page == self.page:
+            return
+        self.page = page
+        self._render()
+        if self.renderer is not None:
+            self.renderer.touch(self.control)
+        else:
+            self.control.update()
+        self.list_view.scroll_to(offset=0 if step > 0 else -1)
+
+    def _scrolled(self, e):
+        # reaching the end of the page loads the next one
+        if e.event_type == "end" and e.pixels >= e.max_scroll_extent > 0:
+            self.turn(1)
+
+    def _render(self):
+        questions, choices = self.questions, self.choices
+        start = self.page * self.page_rows
+        for i, row in enumerate(self._rows):
+            pos = start + i
+            if pos < len(questions):
+                question = questions[pos]
+                row.show(pos + 1, question, choices.get(question.qn))
+            else:
+                row.control.visible = False
+        end = min(start + self.page_rows, len(questions))
+        self.status.value = f"{start + 1}-{end} of {len(questions)}" if questions else "Nothing to review"
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.pages - 1
@@ -0,0 +1,263 @@
+# Spaced-repetition order for the quiz (SM-2 style).
+#
+# ReviewState keeps, per question number, when the question is due and its
+# ease / interval / repetition counts, as flat arrays indexed by a row per
+# qn. It's saved with the bank cache's file format (marshal + crc, atomic
+# replace), only for questions that have been answered at least once.
+#
+# Scheduler picks the next question for one quiz session: answered
+# questions sit in a heap of (due, position) entries, never-answered ones are
+# walked in bank order by a cursor. Overdue questions come first, then new
+# ones, then (ahead of schedule) whichever is due soonest. Grading pushes a
+# fresh heap entry; the old one stays in the heap and is dropped when it
+# reaches the top (its due no longer matches the state), so next_position()
+# and grade() are O(log n) and the bank is never rescanned. The ReviewState
+# is shared by every session of the process, so a question can also be
+# re-graded by another session: when a position's newest entry turns out
+# stale, it is pushed again with the current due.
+#
+# MCQ_ORDER=spaced turns it on in the app; the default is file order.
+
+import atexit
+import heapq
+import marshal
+import os
+import threading
+import time
+from array import array
+
+from mcq import bank_cache
+
+ENABLED = os.environ.get("MCQ_ORDER", "file") == "spaced"
+
+DAY = 86400.0
+# a wrong answer comes back after this many seconds
+RELEARN_SECONDS = 60.0
+START_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 quality for a right / wrong answer (0-5)
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+SAVE_DELAY = 2.0
+
+_FORMAT = 1
+
+
+def state_path_for(bank, cache_dir=None):
+    safe = bank_cache.safe_name(bank)
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, f"review.{safe}.bank")
+
+
+class ReviewState:
+    """Per-qn review state (due, ease, interval, reps, lapses) in flat arrays."""
+
+    def __init__(self, bank, path=None):
+        self.bank = bank
+        self.path = path
+        self.lock = threading.Lock()
+        self._rows = {}             # qn -> row
+        self.due = array("d")       # epoch seconds; 0 = never answered
+        self.ease = array("f")
+        self.interval = array("f")  # days
+        self.reps = array("H")
+        self.lapses = array("H")
+        self._saver = bank_cache.DebouncedSaver(self.save)
+
+    def row_of(self, qn):
+        """Row of `qn`, or -1 if it has never been answered."""
+        return self._rows.get(qn, -1)
+
+    def row_for(self, qn):
+        """Row of `qn`, adding a fresh (never answered) row if it's new. Call with lock held."""
+        row = self._rows.get(qn)
+        if row is None:
+            row = self._rows[qn] = len(self.due)
+            self.due.append(0.0)
+            self.ease.append(START_EASE)
+            self.interval.append(0.0)
+            self.reps.append(0)
+            self.lapses.append(0)
+        return row
+
+    def grade(self, qn, correct, now=None):
+        """Applies one answer to `qn` and returns its new due time."""
+        now = time.time() if now is None else now
+        q = QUALITY_CORRECT if correct else QUALITY_WRONG
+        with self.lock:
+            row = self.row_for(qn)
+            ease = self.ease[row] + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02)
+            self.ease[row] = max(MIN_EASE, ease)
+            if correct:
+                reps = self.reps[row] + 1
+                if reps == 1:
+                    interval = 1.0
+                elif reps == 2:
+                    interval = 6.0
+                else:
+                    interval = self.interval[row] * self.ease[row]
+                self.reps[row] = min(reps, 0xFFFF)
+                self.interval[row] = interval
+                due = now + interval * DAY
+            else:
+                self.reps[row] = 0
+                self.lapses[row] = min(self.lapses[row] + 1, 0xFFFF)
+                self.interval[row] = 0.0
+                due = now + RELEARN_SECONDS
+            self.due[row] = due
+        self.save_soon()
+        return due
+
+    # --- persistence ---
+
+    def _key(self):
+        return ("review", self.bank, _FORMAT, marshal.version)
+
+    def save(self):
+        """Writes the rows that have been answered; returns how many were written."""
+        if self.path is None:
+            return 0
+        with self.lock:
+            qns = [qn for qn, row in self._rows.items() if self.due[row]]
+            rows = [self._rows[qn] for qn in qns]
+            data = (
+                qns,
+                array("d", (self.due[r] for r in rows)).tobytes(),
+                array("f", (self.ease[r] for r in rows)).tobytes(),
+                array("f", (self.interval[r] for r in rows)).tobytes(),
+                array("H", (self.reps[r] for r in rows)).tobytes(),
+                array("H", (self.lapses[r] for r in rows)).tobytes(),
+            )
+        try:
+            bank_cache.write_cache(self.path, self._key(), data)
+        except OSError as e:
+            print(f"Warning: could not save review state {self.path}: {e}")
+        return len(qns)
+
+    def save_soon(self):
+        """Saves from a timer thread a little later, coalescing bursts of grades."""
+        if self.path is not None:
+            self._saver.soon(SAVE_DELAY)
+
+    @classmethod
+    def load(cls, bank, path):
+        """Reads the saved state of `bank`, or starts empty if there is none (or it's unusable)."""
+        state = cls(bank, path)
+        cached = bank_cache.read_cache(path)
+        if cached is None or cached[0] != state._key():
+            return state
+        qns, due, ease, interval, reps, lapses = cached[1]
+        arrays = (state.due, state.ease, state.interval, state.reps, state.lapses)
+        for arr, blob in zip(arrays, (due, ease, interval, reps, lapses)):
+            arr.frombytes(blob)
+        if any(len(arr) != len(qns) for arr in arrays):
+            return cls(bank, path)
+        state._rows = {qn: row for row, qn in enumerate(qns)}
+        return state
+
+
+class Scheduler:
+    """Next-question picker for one session over a bank, backed by a ReviewState."""
+
+    def __init__(self, state, questions):
+        self.state = state
+        self.set_bank(questions)
+
+    def set_bank(self, questions):
+        """Switches to a (new) bank and rebuilds the heap in O(n)."""
+        state = self.state
+        qns = questions.qns()
+        with state.lock:
+            # -1: never answered, the row is created by the first grade
+            get = state._rows.get
+            rows = array("l", (get(qn, -1) for qn in qns))
+            due = state.due
+            heap = [(due[row], pos) for pos, row in enumerate(rows) if row >= 0 and due[row]]
+        heapq.heapify(heap)
+        # per position, the due of its newest heap entry (0: none)
+        queued = array("d", bytes(8 * len(rows)))
+        for entry_due, pos in heap:
+            queued[pos] = entry_due
+        self.questions = questions
+        self._qns = qns
+        self._rows = rows
+        self._heap = heap
+        self._queued = queued
+        self._new = 0  # no never-answered question before this position
+
+    def _next_new(self):
+        state, rows, pos = self.state, self._rows, self._new
+        while pos < len(rows):
+            row = rows[pos]
+            if row < 0:
+                # answered under the same qn at another position (or elsewhere)?
+                row = rows[pos] = state.row_of(self._qns[pos])
+            if row < 0 or not state.due[row]:
+                break
+            if not self._queued[pos]:
+                # first answered by another session: review it here too
+                self._queued[pos] = state.due[row]
+                heapq.heappush(self._heap, (state.due[row], pos))
+            pos += 1
+        self._new = pos
+        return pos if pos < len(rows) else None
+
+    def _next_review(self):
+        heap, due, rows, queued = self._heap, self.state.due, self._rows, self._queued
+        while heap:
+            entry_due, pos = heap[0]
+            current = due[rows[pos]]  # heap entries always have a row
+            if current == entry_due:
+                return heap[0]
+            if queued[pos] == entry_due and current:
+                # re-graded by another session: requeue it at its new due
+                queued[pos] = current
+                heapq.heapreplace(heap, (current, pos))
+            else:
+                heapq.heappop(heap)  # re-graded here since this entry was pushed
+        return None
+
+    def next_position(self, now=None):
+        """
+        Position of the question to ask next: the most overdue one, else the
+        next never-answered one (in bank order), else the one due soonest.
+        None only for an empty bank.
+        """
+        now = time.time() if now is None else now
+        new = self._next_new()  # first: it queues what other sessions answered
+        review = self._next_review()
+        if review is not None and review[0] <= now:
+            return review[1]
+        if new is not None:
+            return new
+        return review[1] if review is not None else None
+
+    def grade(self, pos, correct, now=None):
+        """Records the answer to the question at `pos` and reschedules it."""
+        qn = self._qns[pos]
+        due = self.state.grade(qn, correct, now)
+        if self._rows[pos] < 0:
+            self._rows[pos] = self.state.row_of(qn)
+        self._queued[pos] = due
+        heapq.heappush(self._heap, (due, pos))
+        return due
+
+    def due_count(self, now=None):
+        """How many answered questions are due again now. O(n)."""
+        now = time.time() if now is None else now
+        due = self.state.due
+        return sum(1 for row in self._rows if row >= 0 and 0 < due[row] <= now)
+
+
+_states = {}
+_states_lock = threading.Lock()
+
+
+def state_for(bank, cache_dir=None):
+    """The process-wide ReviewState of `bank`, loaded from disk on first use (saved at exit)."""
+    path = state_path_for(bank, cache_dir)
+    with _states_lock:
+        state = _states.get(path)
+        if state is None:
+            state = _states[path] = ReviewState.load(bank, path)
+            atexit.register(state.save)
+    return state
@@ -0,0 +1,308 @@
+# Full-text search over question and option text.
+#
+# SearchIndex is an in-memory inverted index: for every case-folded word,
+# the documents (questions) it occurs in and a weight per document (2 per
+# occurrence in the question, 1 per occurrence in an option). Queries match
+# every word; the last word also matches as a prefix ("chlor" finds
+# "chlorophyll") if it has at least MIN_PREFIX characters and the query
+# doesn't end with a space. Results are ranked by
+# sum(idf * weight).
+#
+# Documents are keyed by qn. update(bank) reads the bank through
+# text_rows(), which a StoredBank streams from its table, and only
+# (re)indexes questions whose text changed (compared by a crc32 of question + options) and tombstones
+# the old versions; the postings are compacted once a quarter of them are
+# dead. The index is saved with the bank cache's file format, so a launch
+# with an unchanged bank doesn't re-tokenize anything.
+
+import bisect
+import heapq
+import marshal
+import math
+import os
+import re
+import threading
+import zlib
+from array import array
+from operator import itemgetter
+
+from mcq import bank_cache
+
+QUESTION_WEIGHT = 2
+OPTION_WEIGHT = 1
+# shorter last words only match whole words; a prefix matching more words
+# than MAX_PREFIX_TERMS only uses the most common ones
+MIN_PREFIX = 3
+MAX_PREFIX_TERMS = 16
+
+_FORMAT = 1
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Case-folded word tokens of `text`."""
+    return _TOKEN.findall(text.casefold())
+
+
+def index_path_for(bank, cache_dir=None):
+    safe = bank_cache.safe_name(bank)
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, f"search.{safe}.bank")
+
+
+def _fingerprint(text, options):
+    return zlib.crc32("\x1f".join((text, *options)).encode("utf-8"))
+
+
+class SearchIndex:
+    """Inverted index over a bank's question and option text, keyed by qn."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._postings = {}        # term -> (array("I") docs, array("B") weights)
+        self._doc_qn = []          # doc -> qn
+        self._doc_fp = array("I")  # doc -> fingerprint
+        self._live = bytearray()   # doc -> 1 while current
+        self._by_qn = {}           # qn -> live doc
+        self._dead = 0
+        self._terms = None         # sorted vocabulary, built on the first prefix query
+        self._indexed = None       # the bank object last passed to update()
+        self._wanted = None        # the bank last passed to update_in_background()
+        self.path = None           # where shared_index() saves it
+
+    def __len__(self):
+        return len(self._by_qn)
+
+    # --- building ---
+
+    def _add(self, qn, text, options, fp):
+        doc = len(self._doc_qn)
+        self._doc_qn.append(qn)
+        self._doc_fp.append(fp)
+        self._live.append(1)
+        self._by_qn[qn] = doc
+
+        weights = {}
+        get = weights.get
+        for token in tokenize(text):
+            weights[token] = get(token, 0) + QUESTION_WEIGHT
+        for token in tokenize("\n".join(options)):
+            weights[token] = get(token, 0) + OPTION_WEIGHT
+        postings = self._postings
+        for token, weight in weights.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = (array("I"), array("B"))
+                self._terms = None
+            entry[0].append(doc)
+            entry[1].append(min(weight, 255))
+
+    def _remove(self, qn):
+        doc = self._by_qn.pop(qn)
+        self._live[doc] = 0
+        self._dead += 1
+
+    def update(self, bank):
+        """
+        Brings the index in line with `bank`, only tokenizing questions that
+        are new or changed. Returns (added, removed) counts.
+        """
+        with self.lock:
+            if bank is self._indexed:
+                return 0, 0
+            added = 0
+            seen = set()
+            doc_fp, by_qn = self._doc_fp, self._by_qn
+            # streamed: a StoredBank is read from its table in batches, not loaded whole
+            for qn, text, opts in bank.text_rows():
+                if qn in seen:
+                    continue  # duplicate qn: the first one wins, like index_of()
+                seen.add(qn)
+                fp = _fingerprint(text, opts)
+                doc = by_qn.get(qn)
+                if doc is not None:
+                    if doc_fp[doc] == fp:
+                        continue
+                    self._remove(qn)
+                self._add(qn, text, opts, fp)
+                added += 1
+            gone = [qn for qn in by_qn if qn not in seen]
+            for qn in gone:
+                self._remove(qn)
+            if self._dead * 4 > len(self._doc_qn):
+                self._compact()
+            self._indexed = bank
+            return added, len(gone)
+
+    def _compact(self):
+        """Drops tombstoned documents and renumbers the rest."""
+        remap = array("l", [-1]) * len(self._doc_qn)
+        doc_qn, doc_fp = [], array("I")
+        for doc, alive in enumerate(self._live):
+            if alive:
+                remap[doc] = len(doc_qn)
+                doc_qn.append(self._doc_qn[doc])
+                doc_fp.append(self._doc_fp[doc])
+        postings = {}
+        for term, (docs, weights) in self._postings.items():
+            new_docs, new_weights = array("I"), array("B")
+            for doc, weight in zip(docs, weights):
+                new = remap[doc]
+                if new >= 0:
+                    new_docs.append(new)
+                    new_weights.append(weight)
+            if new_docs:
+                postings[term] = (new_docs, new_weights)
+        self._postings = postings
+        self._doc_qn, self._doc_fp = doc_qn, doc_fp
+        self._live = bytearray(b"\x01") * len(doc_qn)
+        self._by_qn = {qn: doc for doc, qn in enumerate(doc_qn)}
+        self._dead = 0
+        self._terms = None
+
+    # --- querying ---
+
+    def _prefix_terms(self, prefix):
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        terms = self._terms
+        i = bisect.bisect_left(terms, prefix)
+        out = []
+        while i < len(terms) and terms[i].startswith(prefix):
+            out.append(terms[i])
+            i += 1
+        if len(out) > MAX_PREFIX_TERMS:
+            out = heapq.nlargest(MAX_PREFIX_TERMS, out, key=lambda t: len(self._postings[t][0]))
+        return out
+
+    def _word_scores(self, terms):
+        """{doc: score} for the docs containing any of `terms` (the matches of one query word)."""
+        n = max(len(self._by_qn), 1)
+        postings = self._postings
+        if len(terms) == 1:
+            docs, weights = postings[terms[0]]
+            idf = math.log(1 + n / len(docs))
+            return {doc: idf * w for doc, w in zip(docs, weights)}
+        scores = {}
+        get = scores.get
+        for term in terms:
+            docs, weights = postings[term]
+            idf = math.log(1 + n / len(docs))
+            for doc, w in zip(docs, weights):
+                scores[doc] = get(doc, 0.0) + idf * w
+        return scores
+
+    def search(self, query, limit=20):
+        """
+        Ranked matches for `query` as a list of (qn, score), best first.
+
+        Every word has to match; the last one also matches as a prefix
+        (see MIN_PREFIX) unless the query ends with whitespace.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        prefix_last = not query[-1:].isspace() and len(words[-1]) >= MIN_PREFIX
+        with self.lock:
+            per_word = []
+            for i, word in enumerate(words):
+                if prefix_last and i == len(words) - 1:
+                    terms = self._prefix_terms(word)
+                else:
+                    terms = [word] if word in self._postings else []
+                if not terms:
+                    return []
+                per_word.append(terms)
+
+            # rarest word first, so the candidate set starts (and stays) small
+            per_word.sort(key=lambda terms: sum(len(self._postings[t][0]) for t in terms))
+            scores = self._word_scores(per_word[0])
+            for terms in per_word[1:]:
+                more = self._word_scores(terms)
+                scores = {doc: s + more[doc] for doc, s in scores.items() if doc in more}
+                if not scores:
+                    return []
+            live = self._live
+            if self._dead:
+                scores = {doc: s for doc, s in scores.items() if live[doc]}
+            # nlargest is stable and dicts keep doc order, so ties go to the earlier question
+            best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            return [(self._doc_qn[doc], score) for doc, score in best]
+
+    # --- persistence ---
+
+    def save(self, path):
+        with self.lock:
+            terms = list(self._postings)
+            data = (
+                terms,
+                [self._postings[t][0].tobytes() for t in terms],
+                [self._postings[t][1].tobytes() for t in terms],
+                self._doc_qn,
+                self._doc_fp.tobytes(),
+                bytes(self._live),
+            )
+        bank_cache.write_cache(path, ("search", _FORMAT, marshal.version, array("I").itemsize), data)
+
+    @classmethod
+    def load(cls, path):
+        """The index saved at `path`, or an empty one if it's missing or unusable."""
+        index = cls()
+        cached = bank_cache.read_cache(path)
+        if cached is None or cached[0] != ("search", _FORMAT, marshal.version, array("I").itemsize):
+            return index
+        try:
+            terms, docs, weights, doc_qn, doc_fp, live = cached[1]
+            postings = {}
+            for term, d, w in zip(terms, docs, weights):
+                entry = postings[term] = (array("I"), array("B"))
+                entry[0].frombytes(d)
+                entry[1].frombytes(w)
+            index._postings = postings
+            index._doc_qn = list(doc_qn)
+            index._doc_fp.frombytes(doc_fp)
+            index._live = bytearray(live)
+        except (ValueError, TypeError):
+            return cls()
+        index._by_qn = {qn: doc for doc, qn in enumerate(index._doc_qn) if index._live[doc]}
+        index._dead = len(index._doc_qn) - len(index._by_qn)
+        return index
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def shared_index(bank, cache_dir=None):
+    """The process-wide SearchIndex of `bank`, loaded from disk on first use."""
+    path = index_path_for(bank, cache_dir)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = SearchIndex.load(path)
+            index.path = path
+    return index
+
+
+def update_in_background(index, questions):
+    """
+    Indexes `questions` on a daemon thread and saves the index if anything
+    changed. If several updates overlap, the index ends on the bank passed last.
+    """
+    def run():
+        while True:
+            bank = index._wanted
+            added, removed = index.update(bank)
+            if added or removed:
+                try:
+                    index.save(index.path)
+                except OSError as e:
+                    print(f"Warning: could not save search index {index.path}: {e}")
+            if index._wanted is bank:
+                return
+
+    index._wanted = questions
+    if questions is index._indexed:
+        return None
+    thread = threading.Thread(target=run, name="search-index", daemon=True)
+    thread.start()
+    return thread
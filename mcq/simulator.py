@@ -0,0 +1,180 @@
+# Synthetic quiz sessions for capacity planning and regression runs.
+#
+# simulate() plays `sessions` rounds through the real QuizSession engine.
+# Each round is a simulated student answering a seeded quiz of `size`
+# questions with start / select / check / next until it finishes. The
+# student model is kept simple:
+#
+#   ability ~ N(0, 1) per session, difficulty ~ N(0, 1) per question (by qn)
+#   P(right) = 1 / (1 + exp(difficulty - ability))
+#   a wrong answer is one of the other three options; with `timeout_rate`
+#   the time runs out first and the question counts as unanswered.
+#
+# A class shares a few quiz versions, so `variants` quizzes are generated
+# once with quiz.generate() (their answer keys read once) and dealt out in
+# turn. The sessions are split into chunks, each with its own
+# random.Random seeded from (seed, chunk). Chunks run in a pool of worker
+# processes, as in bulk_import. The totals (score histogram and digest)
+# therefore depend only on the arguments, not on --jobs, and a change that
+# alters the quiz logic shows up as a new digest.
+#
+#   python -m mcq.simulator [--sessions 1000000] [--size 20] [--bank file.ods | --bank-size 2000]
+#                           [--variants 64] [--timeout-rate 0.02] [--jobs N] [--seed 1] [--json out.json]
+
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mcq import quiz
+from mcq.question_bank import ANSWER_LETTERS, QuestionBank
+from mcq.quiz_session import QUESTION, QuizSession
+
+CHUNK_SESSIONS = 20_000
+
+
+def synthetic_bank(n, seed=0):
+    """A bank of `n` placeholder questions with seeded answer keys."""
+    rng = random.Random(f"{seed}:bank")
+    qns = range(1, n + 1)
+    return QuestionBank.from_columns(
+        qns, [f"Question {qn}?" for qn in qns],
+        *([f"{letter}{qn}" for qn in qns] for letter in ANSWER_LETTERS),
+        [rng.choice(ANSWER_LETTERS) for _ in qns],
+    )
+
+
+# --- worker side ---
+
+_bank = None
+
+
+def _init_worker(bank):
+    global _bank
+    _bank = bank
+
+
+def _variants(bank, size, count, seed):
+    """[(quiz, answer key, exp(difficulty) per position)] for `count` seeded quizzes."""
+    rng = random.Random(f"{seed}:difficulty")
+    qns = bank.qns()
+    easiness = {qn: math.exp(rng.gauss(0, 1)) for qn in qns}
+    out = []
+    for v in range(count):
+        questions = quiz.generate(bank, min(size, len(bank)), seed * 1_000_003 + v)
+        out.append((questions, questions.answer_indices(), [easiness[qn] for qn in questions.qns()]))
+    return out
+
+
+def run_chunk(chunk, sessions, size, variants, timeout_rate, seed):
+    """Plays `sessions` sessions for chunk number `chunk`; returns its totals."""
+    quizzes = _variants(_bank, size, variants, seed)
+    rng = random.Random(f"{seed}:{chunk}")
+    rand, gauss, exp = rng.random, rng.gauss, math.exp
+    scores = [0] * (size + 1)
+    answers = timeouts = 0
+    first = chunk * CHUNK_SESSIONS
+    for i in range(first, first + sessions):
+        questions, key, easiness = quizzes[i % variants]
+        session = QuizSession(questions, key=key)
+        # P(right) = 1 / (1 + exp(difficulty) * exp(-ability))
+        weakness = exp(-gauss(0, 1))
+        session.start()
+        while session.phase == QUESTION:
+            pos = session.pos
+            if timeout_rate and rand() < timeout_rate:
+                timeouts += 1
+                session.check(True)
+            else:
+                right = key[pos]
+                if rand() * (1 + easiness[pos] * weakness) < 1:
+                    session.select(right)
+                else:
+                    session.select((right + 1 + int(rand() * 3)) & 3)
+                session.check()
+            answers += 1
+            session.next()
+        scores[session.score] += 1
+    return {"sessions": sessions, "answers": answers, "timeouts": timeouts, "scores": scores}
+
+
+# --- parent side ---
+
+def simulate(sessions, size=20, bank=None, variants=64, timeout_rate=0.0, jobs=None, seed=1):
+    """Runs `sessions` synthetic sessions on `jobs` processes; returns the totals and timings."""
+    bank = synthetic_bank(2000, seed) if bank is None else bank
+    size = min(size, len(bank))
+    chunks = [(c, min(CHUNK_SESSIONS, sessions - c * CHUNK_SESSIONS))
+              for c in range(math.ceil(sessions / CHUNK_SESSIONS))]
+    args = [(c, n, size, variants, timeout_rate, seed) for c, n in chunks]
+    t0 = time.perf_counter()
+    if jobs == 1:
+        _init_worker(bank)
+        results = [run_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(bank,)) as pool:
+            results = list(pool.map(run_chunk, *zip(*args))) if args else []
+    seconds = time.perf_counter() - t0
+
+    scores = [0] * (size + 1)
+    for r in results:
+        scores = [a + b for a, b in zip(scores, r["scores"])]
+    answers = sum(r["answers"] for r in results)
+    return {
+        "sessions": sessions,
+        "questions": size,
+        "answers": answers,
+        "timeouts": sum(r["timeouts"] for r in results),
+        "mean_score": sum(s * n for s, n in enumerate(scores)) / sessions if sessions else 0.0,
+        "scores": scores,
+        # same arguments, same digest, whatever the number of processes
+        "digest": hashlib.sha1(json.dumps([sessions, size, seed, scores]).encode()).hexdigest()[:12],
+        "seconds": round(seconds, 3),
+        "jobs": jobs or os.cpu_count() or 1,
+        "sessions_per_minute": round(sessions / seconds * 60) if seconds else 0,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run synthetic quiz sessions through the QuizSession engine.")
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=20, help="questions per quiz")
+    parser.add_argument("--bank", help=".ods/.xlsx/.csv bank (default: a synthetic one)")
+    parser.add_argument("--bank-size", type=int, default=2000, help="questions in the synthetic bank")
+    parser.add_argument("--variants", type=int, default=64, help="quiz versions dealt out to the sessions")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of questions where time runs out")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.bank:
+        from mcq import loaders
+
+        if args.bank.endswith(".csv"):
+            with open(args.bank, encoding="utf-8") as f:
+                bank = loaders.questions_from_csv(f.read())
+        else:
+            bank = loaders.load_spreadsheet(args.bank)
+    else:
+        bank = synthetic_bank(args.bank_size, args.seed)
+
+    out = simulate(args.sessions, args.size, bank, args.variants, args.timeout_rate, args.jobs, args.seed)
+    print(f"{out['sessions']} sessions x {out['questions']} questions ({out['answers']} answers, "
+          f"{out['timeouts']} timed out) in {out['seconds']:.2f} s with {out['jobs']} processes: "
+          f"{out['sessions_per_minute']:,} sessions/min")
+    print(f"mean score {out['mean_score']:.2f}; digest {out['digest']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,505 @@
+# SQLite question store.
+#
+# For syllabi too big to hold in memory, questions can live in one local
+# SQLite file instead:
+#
+#   questions(bank, qn, pos, question, a, b, c, d, answer, image,
+#             topic, difficulty, last_seen)     primary key (bank, qn)
+#
+# with indexes on (bank, pos) for bank order and paging, on (bank, topic, ...)
+# / (bank, difficulty, ...) for filtered queries and on (bank, last_seen) for
+# unseen ones. Topic and difficulty come from optional "Topic" / "Difficulty"
+# sheet columns (see import_rows) and are kept as text, so a level ("3") and a
+# label ("Hard") filter the same way; last_seen is set when a question is answered.
+#
+# QuestionStore.bank(name) returns a StoredBank: a QuestionBank whose columns
+# are read from the database a page of PAGE_ROWS questions at a time (the
+# last CACHED_PAGES pages stay in memory). Only the question numbers are
+# loaded up front, so the rest of the app (quiz views, search, the review
+# screen) uses it like any other bank. Code that needs every row streams
+# them instead (text_rows() for the search index, STREAM_ROWS per query).
+# upsert_bank() replaces a bank's rows in one transaction when it refreshes
+# and only rewrites rows that changed.
+#
+# MCQ_STORE=1 keeps the app's bank in .mcq_cache/questions.db (MCQ_STORE=<path>
+# picks the file). Import sheets with
+#   python -m mcq.store import src/MCQ_files/mcq_algae.ods [--bank NAME]
+#   python -m mcq.store sample NAME [-k 20] [--topic T] [--difficulty D]
+
+import os
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from mcq import bank_cache, loaders
+from mcq.question_bank import QuestionBank
+
+_SETTING = os.environ.get("MCQ_STORE", "")
+ENABLED = _SETTING not in ("", "0")
+
+PAGE_ROWS = 64
+CACHED_PAGES = 256
+# rows per query when a whole bank is streamed (text_rows)
+STREAM_ROWS = 1000
+# random_unseen() probes random positions this many times over before
+# falling back to listing every match
+PROBE_FACTOR = 8
+
+TOPIC_COL = "Topic"
+DIFFICULTY_COL = "Difficulty"
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    bank TEXT NOT NULL,
+    qn INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    a TEXT NOT NULL, b TEXT NOT NULL, c TEXT NOT NULL, d TEXT NOT NULL,
+    answer INTEGER NOT NULL,
+    image TEXT NOT NULL DEFAULT '',
+    topic TEXT,
+    difficulty TEXT,
+    last_seen REAL,
+    PRIMARY KEY (bank, qn)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS questions_pos ON questions (bank, pos);
+CREATE INDEX IF NOT EXISTS questions_topic ON questions (bank, topic, difficulty, last_seen);
+CREATE INDEX IF NOT EXISTS questions_difficulty ON questions (bank, difficulty, last_seen);
+CREATE INDEX IF NOT EXISTS questions_unseen ON questions (bank, last_seen);
+"""
+# version 1 declared difficulty INTEGER, but sheets give labels ("Hard") as
+# often as levels; the table is rebuilt around _SCHEMA with the values as text
+_MIGRATE_1 = (
+    """
+DROP INDEX IF EXISTS questions_pos;
+DROP INDEX IF EXISTS questions_topic;
+DROP INDEX IF EXISTS questions_difficulty;
+DROP INDEX IF EXISTS questions_unseen;
+ALTER TABLE questions RENAME TO questions_v1;
+""",
+    """
+INSERT INTO questions
+SELECT bank, qn, pos, question, a, b, c, d, answer, image, topic, CAST(difficulty AS TEXT), last_seen
+FROM questions_v1;
+DROP TABLE questions_v1;
+""",
+)
+
+_COLUMNS = "question, a, b, c, d, answer, image"
+_MISSING = ("", "", "", "", "", 0, "")  # a row deleted since the bank was opened
+
+
+def default_path(cache_dir=None):
+    if ENABLED and _SETTING != "1":
+        return _SETTING
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, "questions.db")
+
+
+class _Rows:
+    """Page cache over one bank's rows, in the order of a snapshot of its qns."""
+
+    def __init__(self, store, bank, qns):
+        self.store = store
+        self.bank = bank
+        self.qns = qns
+        self.lock = threading.Lock()
+        self._pages = OrderedDict()  # page number -> list of row tuples
+
+    def get(self, row):
+        page_no = row // PAGE_ROWS
+        with self.lock:
+            page = self._pages.get(page_no)
+            if page is not None:
+                self._pages.move_to_end(page_no)
+        if page is None:
+            page = self._fetch(page_no)
+            with self.lock:
+                self._pages[page_no] = page
+                while len(self._pages) > CACHED_PAGES:
+                    self._pages.popitem(last=False)
+        return page[row - page_no * PAGE_ROWS]
+
+    def _fetch(self, page_no):
+        qns = self.qns[page_no * PAGE_ROWS:(page_no + 1) * PAGE_ROWS]
+        found = {}
+        query = (f"SELECT qn, {_COLUMNS} FROM questions "
+                 f"WHERE bank = ? AND qn IN ({','.join('?' * len(qns))})")
+        for r in self.store._query(query, (self.bank, *qns)):
+            found[r[0]] = r[1:]
+        return [found.get(qn, _MISSING) for qn in qns]
+
+
+class _Column:
+    """One field of a StoredBank, read through the page cache."""
+
+    __slots__ = ("_rows", "_field")
+
+    def __init__(self, rows, field):
+        self._rows = rows
+        self._field = field
+
+    def __len__(self):
+        return len(self._rows.qns)
+
+    def __getitem__(self, row):
+        return self._rows.get(row)[self._field]
+
+
+class _OptionColumn:
+    """The four options of every question as one flat sequence, like QuestionBank's."""
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows.qns) * 4
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._rows.get(i // 4)[1 + i % 4]
+
+
+class StoredBank(QuestionBank):
+    """A QuestionBank read lazily from a QuestionStore (see QuestionStore.bank)."""
+
+    __slots__ = ()
+
+    def _whole(self):
+        """True for the bank as stored (not a slice or reordered view)."""
+        index = self._index
+        return isinstance(index, range) and index == range(len(self._texts._rows.qns)) and self._perms is None
+
+    def answer_indices(self):
+        # the whole bank: one query instead of a page fetch per PAGE_ROWS questions
+        if not self._whole():
+            return super().answer_indices()
+        rows = self._texts._rows
+        found = dict(rows.store._query("SELECT qn, answer FROM questions WHERE bank = ?", (rows.bank,)))
+        return bytes(found.get(qn, 0) for qn in rows.qns)
+
+    def text_rows(self):
+        # streamed from the table STREAM_ROWS at a time, never the whole bank in memory
+        if not self._whole():
+            yield from super().text_rows()
+            return
+        rows = self._texts._rows
+        for qn, text, *options in rows.store.iter_rows(rows.bank, "qn, question, a, b, c, d"):
+            yield qn, text, options
+
+    def compact(self):
+        # the whole bank: one query instead of a page fetch per PAGE_ROWS questions
+        if not self._whole():
+            return super().compact()
+        rows = self._texts._rows
+        found = {}
+        for r in rows.store._query(f"SELECT qn, {_COLUMNS} FROM questions WHERE bank = ?", (rows.bank,)):
+            found[r[0]] = r[1:]
+        ordered = [found.get(qn, _MISSING) for qn in rows.qns]
+        return (
+            list(rows.qns),
+            [r[0] for r in ordered],
+            [s for r in ordered for s in r[1:5]],
+            bytes(r[5] for r in ordered),
+            [r[6] for r in ordered] if self._images is not None else None,
+        )
+
+
+class QuestionStore:
+    """Questions of any number of banks in one SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        import sqlite3  # only once a store is opened, so checking ENABLED stays cheap
+
+        self.lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                if version == 1:
+                    self._conn.executescript(_MIGRATE_1[0])
+                self._conn.executescript(_SCHEMA)
+                if version == 1:
+                    self._conn.executescript(_MIGRATE_1[1])
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- reading ---
+
+    def banks(self):
+        """{bank name: question count}."""
+        return dict(self._query("SELECT bank, COUNT(*) FROM questions GROUP BY bank"))
+
+    def count(self, bank, topic=None, difficulty=None, unseen=False):
+        where, params = self._filter(bank, topic, difficulty, unseen)
+        return self._query(f"SELECT COUNT(*) FROM questions WHERE {where}", params)[0][0]
+
+    def topics(self, bank):
+        """{topic: question count} for a bank (topic None for questions without one)."""
+        return dict(self._query(
+            "SELECT topic, COUNT(*) FROM questions WHERE bank = ? GROUP BY topic", (bank,)))
+
+    def bank(self, bank):
+        """The bank as a StoredBank (only its qns are read now), or None if it has no questions."""
+        qns = array("q", (r[0] for r in self._query(
+            "SELECT qn FROM questions WHERE bank = ? ORDER BY pos", (bank,))))
+        if not qns:
+            return None
+        rows = _Rows(self, bank, qns)
+        has_images = self._query(
+            "SELECT 1 FROM questions WHERE bank = ? AND image != '' LIMIT 1", (bank,))
+        return StoredBank(
+            qns,
+            _Column(rows, 0),
+            _OptionColumn(rows),
+            _Column(rows, 5),
+            images=_Column(rows, 6) if has_images else None,
+        )
+
+    def iter_rows(self, bank, columns, batch=STREAM_ROWS):
+        """Yields `columns` of every row of `bank` in bank order, reading `batch` rows per query."""
+        last = -1
+        while True:
+            rows = self._query(
+                f"SELECT pos, {columns} FROM questions WHERE bank = ? AND pos > ? ORDER BY pos LIMIT ?",
+                (bank, last, batch))
+            if not rows:
+                return
+            last = rows[-1][0]
+            for r in rows:
+                yield r[1:]
+
+    def pages(self, bank, page_size=PAGE_ROWS):
+        """Yields the bank in order as in-memory QuestionBanks of up to `page_size` questions."""
+        last = -1
+        while True:
+            rows = self._query(
+                f"SELECT pos, qn, {_COLUMNS} FROM questions WHERE bank = ? AND pos > ? "
+                "ORDER BY pos LIMIT ?", (bank, last, page_size))
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield QuestionBank.from_columns(
+                [r[1] for r in rows], [r[2] for r in rows],
+                [r[3] for r in rows], [r[4] for r in rows], [r[5] for r in rows], [r[6] for r in rows],
+                ["ABCD"[r[7]] for r in rows], [r[8] for r in rows],
+            )
+
+    @staticmethod
+    def _filter(bank, topic, difficulty, unseen):
+        where, params = ["bank = ?"], [bank]
+        if topic is not None:
+            where.append("topic = ?")
+            params.append(topic)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        if unseen:
+            where.append("last_seen IS NULL")
+        return " AND ".join(where), params
+
+    def random_unseen(self, questions, k, topic=None, difficulty=None, rng=random):
+        """
+        Up to k random never-answered questions of a StoredBank (optionally of
+        one topic / difficulty), as a view of it.
+
+        Without a topic or difficulty, random positions are probed in batches
+        through the primary key: O(k) lookups while unseen questions are
+        common. With one, or once probing stops finding enough, the matching
+        qns are listed from an index and sampled.
+        """
+        rows = questions._texts._rows
+        n = len(rows.qns)
+        where, params = self._filter(rows.bank, topic, difficulty, True)
+        picked, tried = [], set()
+        probe = topic is None and difficulty is None
+        while probe and len(picked) < k and len(tried) < min(n, k * PROBE_FACTOR):
+            batch = [p for p in (rng.randrange(n) for _ in range(2 * (k - len(picked)))) if p not in tried]
+            tried.update(batch)
+            by_qn = {}
+            for p in batch:
+                by_qn.setdefault(rows.qns[p], p)
+            if not by_qn:
+                continue
+            found = self._query(
+                f"SELECT qn FROM questions WHERE {where} AND qn IN ({','.join('?' * len(by_qn))})",
+                (*params, *by_qn))
+            picked.extend(by_qn[qn] for (qn,) in found)
+        if len(picked) < k:
+            matching = [qn for (qn,) in self._query(f"SELECT qn FROM questions WHERE {where}", params)]
+            positions = [p for p in map(questions.index_of, matching) if p is not None]
+            picked = rng.sample(positions, min(k, len(positions)))
+        return questions.take(picked[:k])
+
+    # --- writing ---
+
+    def mark_seen(self, bank, qns, when=None):
+        """Records that the questions numbered `qns` were answered."""
+        when = time.time() if when is None else when
+        with self.lock, self._conn:
+            self._conn.executemany(
+                "UPDATE questions SET last_seen = ? WHERE bank = ? AND qn = ?",
+                ((when, bank, qn) for qn in qns))
+
+    def reset_seen(self, bank):
+        with self.lock, self._conn:
+            self._conn.execute("UPDATE questions SET last_seen = NULL WHERE bank = ?", (bank,))
+
+    def upsert_bank(self, bank, questions, extras=None):
+        """
+        Makes the stored `bank` match `questions` in one transaction: new
+        questions are inserted, changed ones updated (keeping last_seen, and
+        topic / difficulty unless `extras` gives them) and missing ones
+        deleted. `extras` is {qn: (topic, difficulty)}. Returns (written, deleted).
+        """
+        extras = extras or {}
+        qns, texts, options, answers, images = questions.compact()
+        seen = set()
+        records = []
+        for pos, qn in enumerate(qns):
+            if qn in seen:
+                continue  # duplicate qn: the first one wins, like index_of()
+            seen.add(qn)
+            topic, difficulty = extras.get(qn, (None, None))
+            records.append((
+                bank, qn, pos, texts[pos], *options[pos * 4:pos * 4 + 4], answers[pos],
+                images[pos] if images is not None else "", topic, difficulty,
+            ))
+        with self.lock, self._conn:
+            conn = self._conn
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT INTO questions (bank, qn, pos, question, a, b, c, d, answer, image, topic, difficulty)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (bank, qn) DO UPDATE SET
+                    pos = excluded.pos, question = excluded.question,
+                    a = excluded.a, b = excluded.b, c = excluded.c, d = excluded.d,
+                    answer = excluded.answer, image = excluded.image,
+                    topic = COALESCE(excluded.topic, topic),
+                    difficulty = COALESCE(excluded.difficulty, difficulty)
+                WHERE (pos, question, a, b, c, d, answer, image) IS NOT
+                      (excluded.pos, excluded.question, excluded.a, excluded.b, excluded.c,
+                       excluded.d, excluded.answer, excluded.image)
+                   OR (excluded.topic IS NOT NULL AND excluded.topic IS NOT topic)
+                   OR (excluded.difficulty IS NOT NULL AND excluded.difficulty IS NOT difficulty)
+                """,
+                records,
+            )
+            written = conn.total_changes - before
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (qn PRIMARY KEY) WITHOUT ROWID")
+            conn.execute("DELETE FROM incoming")
+            conn.executemany("INSERT INTO incoming VALUES (?)", ((qn,) for qn in seen))
+            deleted = conn.execute(
+                "DELETE FROM questions WHERE bank = ? AND qn NOT IN (SELECT qn FROM incoming)", (bank,)
+            ).rowcount
+            conn.execute("DELETE FROM incoming")
+        return written, deleted
+
+    def import_rows(self, bank, header, rows):
+        """
+        Normalizes sheet rows like the loaders do and upserts them, taking
+        topic and difficulty from the optional Topic / Difficulty columns.
+        """
+        columns = loaders.columns_from_rows(header, rows)
+        questions = loaders.questions_from_columns(columns, len(rows))
+        extras = {}
+        if TOPIC_COL in columns or DIFFICULTY_COL in columns:
+            empty = ("",) * len(rows)
+            topics = [str(t).strip() or None for t in columns.get(TOPIC_COL, empty)]
+            levels = [str(d).strip() or None for d in columns.get(DIFFICULTY_COL, empty)]
+            if "QN" in columns:
+                keys = []
+                for value in columns["QN"]:
+                    try:
+                        keys.append(int(str(value).strip()))
+                    except ValueError:
+                        keys.append(None)
+            else:
+                keys = range(1, len(rows) + 1)
+            extras = {qn: (t, d) for qn, t, d in zip(keys, topics, levels) if qn is not None}
+        return self.upsert_bank(bank, questions, extras)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(path=None):
+    """The process-wide QuestionStore for `path` (default_path() if not given)."""
+    path = path or default_path()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = QuestionStore(path)
+    return store
+
+
+def main():
+    import argparse
+
+    from mcq import stream_reader
+
+    parser = argparse.ArgumentParser(description="Import and query the SQLite question store.")
+    parser.add_argument("--db", help="database file (default: MCQ_STORE or .mcq_cache/questions.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import .ods/.xlsx/.csv sheets")
+    imp.add_argument("files", nargs="+")
+    imp.add_argument("--bank", help="bank name (default: the file name without extension)")
+    sample = sub.add_parser("sample", help="print random unseen questions")
+    sample.add_argument("bank")
+    sample.add_argument("-k", type=int, default=20)
+    sample.add_argument("--topic")
+    sample.add_argument("--difficulty")
+    sub.add_parser("stats", help="questions per bank")
+    args = parser.parse_args()
+
+    store = shared_store(args.db)
+    if args.command == "import":
+        for path in args.files:
+            bank = args.bank or os.path.splitext(os.path.basename(path))[0]
+            if path.endswith(".csv"):
+                import csv
+
+                with open(path, encoding="utf-8", newline="") as f:
+                    rows = [r for r in csv.reader(f) if r]
+            else:
+                rows = list(stream_reader.iter_rows(path))
+            if not rows:
+                print(f"{path}: empty")
+                continue
+            t0 = time.perf_counter()
+            written, deleted = store.import_rows(bank, rows[0], rows[1:])
+            print(f"{path} -> {bank}: {written} written, {deleted} deleted "
+                  f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    elif args.command == "sample":
+        questions = store.bank(args.bank)
+        if questions is None:
+            print(f"No bank named {args.bank}")
+            return
+        for q in store.random_unseen(questions, args.k, args.topic, args.difficulty):
+            print(f"{q.qn}. {q.text}")
+    else:
+        for bank, n in sorted(store.banks().items()):
+            print(f"{bank}: {n} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# Streaming .ods/.xlsx reader.
+#
+# pd.read_excel builds the whole sheet before the first question exists. This
+# reader walks the sheet XML inside the zip with iterparse, one row at a time,
+# and normalizes rows in small batches, so the first question is ready after
+# the first row and memory stays bounded by the batch size (plus, for .xlsx,
+# the shared-strings table). A row is cleared and detached from its parent
+# once it is read, so the tree iterparse builds never grows past one row.
+# Only the first sheet is read, like pd.read_excel.
+#
+# Cell values follow pandas: numeric cells that hold whole numbers come out as
+# ints ("1", not "1.0"), empty cells as "". Rows that are completely empty are
+# skipped.
+
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from mcq import loaders
+from mcq.question_bank import QuestionBank
+
+_ODS_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_ODS_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+_ODS_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+_XLSX_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_XLSX_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# elements whose children are the rows of an ODS sheet
+_ODS_ROW_PARENTS = frozenset(_ODS_TABLE + tag for tag in (
+    "table", "table-header-rows", "table-row-group", "table-rows"))
+
+# Never expand a repeated cell/row run past this; spreadsheets pad the
+# sheet with runs like number-columns-repeated="16384".
+_MAX_REPEAT = 1024
+
+FIRST_BATCH = 1
+MAX_BATCH = 512
+
+
+def _number(value):
+    """Formats a numeric cell the way pandas does (1.0 -> 1)."""
+    f = float(value)
+    return int(f) if f.is_integer() else f
+
+
+# --- ODS ---
+
+def _ods_cell_text(cell):
+    """Text of an ODS cell: paragraphs joined by newlines, <text:s/> expanded."""
+    paragraphs = []
+    for p in cell.iter(_ODS_TEXT + "p"):
+        parts = []
+        for node in p.iter():
+            if node is not p and node.tag == _ODS_TEXT + "s":
+                parts.append(" " * int(node.get(_ODS_TEXT + "c", "1")))
+            elif node.tag == _ODS_TEXT + "line-break":
+                parts.append("\n")
+            elif node.tag == _ODS_TEXT + "tab":
+                parts.append("\t")
+            if node.text and node.tag != _ODS_TEXT + "s":
+                parts.append(node.text)
+            if node is not p and node.tail:
+                parts.append(node.tail)
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def _ods_cell_value(cell):
+    value_type = cell.get(_ODS_OFFICE + "value-type")
+    if value_type is None:
+        return ""
+    if value_type in ("float", "percentage", "currency"):
+        return _number(cell.get(_ODS_OFFICE + "value"))
+    if value_type == "boolean":
+        return cell.get(_ODS_OFFICE + "boolean-value") == "true"
+    if value_type == "date":
+        return cell.get(_ODS_OFFICE + "date-value")
+    return _ods_cell_text(cell)
+
+
+def iter_ods_rows(filepath):
+    """Yields the first sheet of an .ods file as lists of cell values."""
+    with zipfile.ZipFile(filepath) as zf, zf.open("content.xml") as f:
+        depth = 0
+        parents = []  # open row containers; the innermost holds the row being read
+        for event, elem in iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if tag in _ODS_ROW_PARENTS:
+                if event == "start":
+                    parents.append(elem)
+                else:
+                    parents.pop()
+                if tag == _ODS_TABLE + "table":
+                    depth += 1 if event == "start" else -1
+                    if depth == 0:
+                        return  # end of the first sheet
+                continue
+            if event != "end" or tag != _ODS_TABLE + "table-row" or depth != 1:
+                continue
+
+            row = []
+            for cell in elem:
+                if cell.tag not in (_ODS_TABLE + "table-cell", _ODS_TABLE + "covered-table-cell"):
+                    continue
+                repeat = min(int(cell.get(_ODS_TABLE + "number-columns-repeated", "1")), _MAX_REPEAT)
+                row.extend([_ods_cell_value(cell)] * repeat)
+            while row and row[-1] == "":
+                row.pop()
+
+            repeat = min(int(elem.get(_ODS_TABLE + "number-rows-repeated", "1")), _MAX_REPEAT)
+            elem.clear()
+            parents[-1].remove(elem)
+            if row:
+                for _ in range(repeat):
+                    yield row
+
+
+# --- XLSX ---
+
+def _xlsx_shared_strings(zf):
+    try:
+        f = zf.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with f:
+        for _, elem in iterparse(f):
+            if elem.tag == _XLSX_MAIN + "si":
+                # plain <t>, or rich-text runs <r><t>; <rPh> phonetic hints are skipped
+                t = elem.find(_XLSX_MAIN + "t")
+                if t is not None:
+                    strings.append(t.text or "")
+                else:
+                    strings.append("".join(
+                        r.findtext(_XLSX_MAIN + "t", "") for r in elem.findall(_XLSX_MAIN + "r")
+                    ))
+                elem.clear()
+    return strings
+
+
+def _xlsx_first_sheet(zf):
+    """Path of the first worksheet, following workbook.xml and its rels."""
+    try:
+        with zf.open("xl/workbook.xml") as f:
+            sheet = next(e for _, e in iterparse(f) if e.tag == _XLSX_MAIN + "sheet")
+            rel_id = sheet.get(_XLSX_REL + "id")
+        with zf.open("xl/_rels/workbook.xml.rels") as f:
+            for _, e in iterparse(f):
+                if e.tag == _XLSX_PKG_REL + "Relationship" and e.get("Id") == rel_id:
+                    target = e.get("Target")
+                    if target.startswith("/"):
+                        return target.lstrip("/")
+                    return posixpath.normpath(posixpath.join("xl", target))
+    except (KeyError, StopIteration):
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+_CELL_REF = re.compile(r"([A-Z]+)")
+
+
+def _column_index(ref):
+    letters = _CELL_REF.match(ref).group(1)
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def _xlsx_cell_value(cell, shared):
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(_XLSX_MAIN + "t"))
+    v = cell.find(_XLSX_MAIN + "v")
+    if v is None or v.text is None:
+        return ""
+    if cell_type == "s":
+        return shared[int(v.text)]
+    if cell_type == "b":
+        return v.text == "1"
+    if cell_type == "n":
+        return _number(v.text)
+    return v.text
+
+
+def iter_xlsx_rows(filepath):
+    """Yields the first sheet of an .xlsx file as lists of cell values."""
+    with zipfile.ZipFile(filepath) as zf:
+        shared = _xlsx_shared_strings(zf)
+        with zf.open(_xlsx_first_sheet(zf)) as f:
+            sheet_data = None
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == _XLSX_MAIN + "sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag != _XLSX_MAIN + "row":
+                    continue
+                row = []
+                for cell in elem.iter(_XLSX_MAIN + "c"):
+                    ref = cell.get("r")
+                    col = _column_index(ref) if ref else len(row)
+                    if col >= len(row):
+                        row.extend([""] * (col - len(row) + 1))
+                    row[col] = _xlsx_cell_value(cell, shared)
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+                while row and row[-1] == "":
+                    row.pop()
+                if row:
+                    yield row
+
+
+# --- questions ---
+
+def iter_rows(filepath):
+    """Yields the rows of an .ods or .xlsx file."""
+    if filepath.endswith(".ods"):
+        return iter_ods_rows(filepath)
+    if filepath.endswith(".xlsx"):
+        return iter_xlsx_rows(filepath)
+    raise ValueError(f"Unsupported spreadsheet type: {filepath}")
+
+
+def iter_question_batches(filepath, max_batch=MAX_BATCH):
+    """
+    Yields QuestionBanks of normalized questions as the sheet is read.
+
+    The first batch holds a single row so the first question is available as
+    early as possible; batches then double up to `max_batch` rows. Skipped
+    rows print the same warnings as the other loaders.
+    """
+    rows = iter_rows(filepath)
+    header = next(rows, None)
+    if header is None:
+        return
+    header = [str(h).strip() for h in header]
+    if not all(col in header for col in loaders.REQUIRED_COLS):
+        print("Error: DataFrame missing required columns (Question, A, B, C, D, Answer).")
+        return
+
+    batch, size, start = [], FIRST_BATCH, 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield _normalize_batch(header, batch, start)
+            start += len(batch)
+            batch, size = [], min(size * 2, max_batch)
+    if batch:
+        yield _normalize_batch(header, batch, start)
+
+
+def _normalize_batch(header, batch, start):
+    columns = loaders.columns_from_rows(header, batch)
+    questions, rejected = loaders.normalize_columns(columns, len(batch), start=start)
+    for r in rejected:
+        print(f"Warning: Skipping question {r['row']} due to {r['reason']}.")
+    return questions
+
+
+def iter_questions(filepath):
+    """Yields normalized questions one at a time (see iter_question_batches)."""
+    for batch in iter_question_batches(filepath):
+        yield from batch
+
+
+def read_questions(filepath):
+    """Reads a whole spreadsheet into one QuestionBank without pandas."""
+    return QuestionBank.concat(list(iter_question_batches(filepath)))
@@ -0,0 +1,226 @@
+# Local stand-in for the Apps Script bank endpoint.
+#
+# Serves banks over HTTP on 127.0.0.1 with the sync protocol described in
+# mcq/sync.py, so the client can be exercised and benchmarked offline. With
+# legacy=True it answers like today's script: the full list-of-lists, always
+# ({"questions": rows}; legacy="list" sends the bare list). With use_304=True
+# an up-to-date client gets an empty 304 instead of a notModified body.
+#
+#   with StubBankServer({"Fungi": rows}) as server:
+#       sync.sync_bank("me", "Fungi", server.url, timeout=5)
+#
+# POST ?action=answers takes answer-log batches (see mcq/answer_log.py),
+# gzip or plain, and keeps them in `answers` without duplicate ids; set
+# `fail_posts` to make the next n uploads fail with 503. A bytes body from
+# respond() / accept_answers() is sent as is, as an HTML error page would be.
+#
+# Run `python -m mcq.stub_server [bank.csv]` and set MCQ_BANK_URL to the
+# printed URL to point the app at it.
+
+import csv
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from mcq import sync
+
+SAMPLE_ROWS = [
+    ["QN", "Question", "A", "B", "C", "D", "Answer"],
+    [1, "Which of these is a fungus?", "Mushroom", "Moss", "Fern", "Alga", "A"],
+    [2, "Fungal cell walls are made of", "Cellulose", "Chitin", "Pectin", "Lignin", "B"],
+    [3, "Yeast reproduces mainly by", "Fission", "Spores", "Budding", "Fragmentation", "C"],
+]
+
+
+class StubBankServer:
+    """An in-process HTTP server holding versioned banks."""
+
+    def __init__(self, banks=None, legacy=False, host="127.0.0.1", port=0, delay=0.0):
+        self.legacy = legacy
+        # answer "not modified" with a bare HTTP 304
+        self.use_304 = False
+        # seconds to wait before answering, to stand in for a slow network
+        self.delay = delay
+        self.lock = threading.Lock()
+        # name -> {"version": int, "history": {version: rows}}
+        self.banks = {}
+        # one entry per request: {"params", "status", "bytes"}
+        self.requests = []
+        # uploaded answer records, in arrival order, without duplicate ids
+        self.answers = []
+        self._answer_ids = set()
+        # answer the next n POSTs with 503
+        self.fail_posts = 0
+        for name, rows in (banks or {}).items():
+            self.set_rows(name, rows)
+
+        handler = type("Handler", (_Handler,), {"stub": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+    def set_rows(self, name, rows):
+        """Publishes a new version of a bank."""
+        with self.lock:
+            bank = self.banks.setdefault(name, {"version": 0, "history": {}})
+            bank["version"] += 1
+            bank["history"][bank["version"]] = [list(r) for r in rows]
+
+    def rows(self, name):
+        with self.lock:
+            bank = self.banks[name]
+            return bank["history"][bank["version"]]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="stub-bank-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def respond(self, params):
+        """Builds (status, body) for a GET with the given query params."""
+        name = params.get("filename")
+        with self.lock:
+            bank = self.banks.get(name)
+            if bank is None:
+                return 404, {"error": f"unknown bank {name}"}
+            version = bank["version"]
+            rows = bank["history"][version]
+
+            if self.legacy:
+                return 200, rows if self.legacy == "list" else {"questions": rows}
+
+            client_version = _parse_version(params.get("version"))
+            if client_version == version and params.get("hash") == sync.rows_hash(rows):
+                if self.use_304:
+                    return 304, None
+                return 200, {"notModified": True, "version": version}
+
+            base = bank["history"].get(client_version)
+            if base is not None and params.get("hash") == sync.rows_hash(base) and base[0] == rows[0]:
+                return 200, {
+                    "version": version,
+                    "baseVersion": client_version,
+                    "hash": sync.rows_hash(rows),
+                    "delta": _diff(base, rows),
+                }
+            return 200, {"version": version, "hash": sync.rows_hash(rows), "questions": rows}
+
+    def accept_answers(self, params, body):
+        """Builds (status, body) for an answer-log upload."""
+        with self.lock:
+            if self.fail_posts > 0:
+                self.fail_posts -= 1
+                return 503, {"error": "unavailable"}
+            if params.get("action") != "answers":
+                return 400, {"error": "unknown action"}
+            try:
+                records = json.loads(body)["answers"]
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": "bad payload"}
+            accepted = 0
+            for record in records:
+                if record.get("id") not in self._answer_ids:
+                    self._answer_ids.add(record.get("id"))
+                    self.answers.append(record)
+                    accepted += 1
+            return 200, {"ok": True, "accepted": accepted}
+
+
+def _parse_version(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _diff(old, new):
+    """Row-level delta (by QN) that turns `old` into `new`."""
+    i_qn = old[0].index("QN")
+    old_by_qn = {str(r[i_qn]).strip(): r for r in old[1:]}
+    new_keys = [str(r[i_qn]).strip() for r in new[1:]]
+    upsert = [r for k, r in zip(new_keys, new[1:]) if old_by_qn.get(k) != r]
+    new_set = set(new_keys)
+    delete = [r[i_qn] for k, r in old_by_qn.items() if k not in new_set]
+    return {"upsert": upsert, "delete": delete}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stub = None
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        params = {k: v[-1] for k, v in query.items()}
+        if self.stub.delay:
+            time.sleep(self.stub.delay)
+        status, body = self.stub.respond(params)
+        self._send(params, status, body)
+
+    def do_POST(self):
+        query = parse_qs(urlparse(self.path).query)
+        params = {k: v[-1] for k, v in query.items()}
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except OSError:
+                body = b""
+        if self.stub.delay:
+            time.sleep(self.stub.delay)
+        status, answer = self.stub.accept_answers(params, body)
+        self._send(params, status, answer)
+
+    def _send(self, params, status, body):
+        if body is None or isinstance(body, bytes):
+            payload = body or b""
+        else:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+        # logged before the answer goes out, so a client that has it sees the entry
+        with self.stub.lock:
+            self.stub.requests.append({"params": params, "status": status, "bytes": len(payload)})
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "text/html" if isinstance(body, bytes) else "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    import sys
+
+    rows = SAMPLE_ROWS
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], newline="", encoding="utf-8") as f:
+            rows = [r for r in csv.reader(f) if r]
+    server = StubBankServer({"Fungi": rows}, port=8765)
+    print(f"Serving bank 'Fungi' ({len(rows) - 1} rows) at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
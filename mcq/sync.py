@@ -0,0 +1,197 @@
+# Conditional / delta sync of remote question banks.
+#
+# The client keeps a versioned copy of each bank's raw rows (header row
+# first, exactly as the endpoint sends them) and sends its version and hash
+# with every request. The endpoint can answer with any of:
+#
+#   {"notModified": true, "version": v}               (or HTTP 304)
+#   {"version": v, "baseVersion": b, "hash": h,
+#    "delta": {"upsert": [row, ...], "delete": [qn, ...]}}
+#   {"version": v, "hash": h, "questions": [header, row, ...]}
+#   {"questions": [header, row, ...]}                 (today's Apps Script)
+#   [header, row, ...]                                (older scripts)
+#
+# Rows in a delta use the local header's column order and are matched on the
+# QN column. The hash is sha256 over the compact JSON of all rows (header
+# included); if a delta doesn't reproduce the server's hash, or anything else
+# looks off, the client falls back to a full download.
+
+import hashlib
+import json
+import marshal
+import os
+
+from mcq import bank_cache, instrument, loaders
+
+
+def rows_hash(rows):
+    """Hashes a bank's rows (header row included) the way the server does."""
+    blob = json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def copy_path_for(bank, cache_dir=None):
+    """Returns where the local versioned copy of `bank` is kept."""
+    safe = bank_cache.safe_name(bank)
+    return os.path.join(cache_dir or bank_cache.CACHE_DIR, f"remote.{safe}.bank")
+
+
+def load_local_copy(bank, cache_dir=None):
+    """
+    Returns the local copy of a bank as {"version", "hash", "rows"}, or None.
+
+    A copy whose rows don't match its stored hash is treated as missing.
+    """
+    cached = bank_cache.read_cache(copy_path_for(bank, cache_dir))
+    if cached is None:
+        return None
+    key, rows = cached
+    if len(key) != 4 or key[0] != bank or key[3] != marshal.version:
+        return None
+    rows = [list(r) for r in rows]
+    if rows_hash(rows) != key[2]:
+        return None
+    return {"version": key[1], "hash": key[2], "rows": rows}
+
+
+def save_local_copy(bank, version, rows, cache_dir=None):
+    """Stores `rows` as the local copy of `bank` at `version`; returns the saved copy."""
+    copy = {"version": version, "hash": rows_hash(rows), "rows": rows}
+    try:
+        bank_cache.write_cache(
+            copy_path_for(bank, cache_dir),
+            (bank, version, copy["hash"], marshal.version),
+            rows,
+        )
+    except OSError as e:
+        print(f"Warning: could not save local copy of bank {bank}: {e}")
+    return copy
+
+
+def load_local_questions(bank, cache_dir=None):
+    """Returns the questions from the local copy of `bank`, or None if there isn't one."""
+    copy = load_local_copy(bank, cache_dir)
+    if copy is None:
+        return None
+    return loaders.questions_from_payload(copy["rows"]) or None
+
+
+def _row_key(value):
+    return str(value).strip()
+
+
+def apply_delta(rows, delta):
+    """
+    Applies a row-level delta to a bank's rows and returns the new rows.
+
+    Upserted rows replace the row with the same QN in place, or are appended
+    if the QN is new. Raises ValueError if the rows have no QN column.
+    """
+    header = list(rows[0])
+    if "QN" not in header:
+        raise ValueError("bank has no QN column, can't apply a delta")
+    i_qn = header.index("QN")
+
+    deleted = {_row_key(qn) for qn in delta.get("delete", [])}
+    upserts = {}
+    for row in delta.get("upsert", []):
+        upserts[_row_key(row[i_qn])] = list(row)
+
+    new_rows = [header]
+    for row in rows[1:]:
+        key = _row_key(row[i_qn])
+        if key in deleted:
+            continue
+        new_rows.append(upserts.pop(key, row))
+    for key, row in upserts.items():
+        if key not in deleted:
+            new_rows.append(row)
+    return new_rows
+
+
+def _time_dns(url):
+    """Resolves the endpoint's host once, only to time it as fetch.dns."""
+    import socket
+    from urllib.parse import urlparse
+
+    parts = urlparse(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    with instrument.span("fetch.dns"):
+        try:
+            socket.getaddrinfo(parts.hostname, port)
+        except (OSError, UnicodeError):
+            pass
+
+
+def sync_bank(user_id, bank, url, timeout, cache_dir=None):
+    """
+    Brings the local copy of `bank` up to date with the endpoint.
+
+    Returns (questions, status) where status is one of "not-modified",
+    "delta", "full" or "failed". On failure questions is None and the local
+    copy is left untouched.
+    """
+    import requests
+
+    local = load_local_copy(bank, cache_dir)
+
+    def request(conditional):
+        params = {
+            "userId": f"{user_id}",
+            "filename": bank,
+        }
+        if conditional:
+            params["version"] = local["version"]
+            params["hash"] = local["hash"]
+        # stream=True returns at the headers, so connect and download are timed apart
+        with instrument.span("fetch.connect"):
+            response = requests.get(url, params=params, timeout=timeout, stream=True)
+        with response:
+            print(f"Status Code: {response.status_code} {response.status_code == 200}")
+            if response.status_code == 304:
+                return {"notModified": True}
+            if response.status_code != 200:
+                return None
+            with instrument.span("fetch.download"):
+                body = response.content
+        instrument.count("fetch.bytes", len(body))
+        with instrument.span("fetch.decode"):
+            data = json.loads(body)
+        return {"questions": data} if isinstance(data, list) else data
+
+    if instrument.ENABLED:
+        _time_dns(url)
+    try:
+        data = request(conditional=local is not None)
+        if data is None:
+            return None, "failed"
+
+        if local is not None and data.get("notModified"):
+            return loaders.questions_from_payload(local["rows"]), "not-modified"
+
+        if local is not None and "delta" in data:
+            base = data.get("baseVersion", local["version"])
+            if base == local["version"]:
+                try:
+                    rows = apply_delta(local["rows"], data["delta"])
+                except (ValueError, IndexError, TypeError, AttributeError) as e:
+                    print(f"Could not apply delta to bank {bank}: {e}")
+                    rows = None
+                if rows is not None and data.get("hash") in (None, rows_hash(rows)):
+                    copy = save_local_copy(bank, data.get("version"), rows, cache_dir)
+                    return loaders.questions_from_payload(copy["rows"]), "delta"
+            # The delta doesn't fit our copy - start over with a full download
+            data = request(conditional=False)
+            if data is None:
+                return None, "failed"
+
+        rows = data["questions"]
+        if not rows:
+            return None, "failed"
+        questions = loaders.questions_from_payload(rows)
+        if questions:
+            save_local_copy(bank, data.get("version"), rows, cache_dir)
+        return questions or None, "full"
+    except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Could not fetch remote bank {bank}: {e}")
+        return None, "failed"
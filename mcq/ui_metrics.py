@@ -0,0 +1,134 @@
+# Counts what page.update() actually sends to the Flet client.
+#
+# Every page.update() turns into one batch of protocol commands: "add" for
+# new controls (a whole subtree), "set" for changed properties and "remove".
+# UpdateMeter hooks the page's connection, records each batch under the
+# current transition label ("check", "next", ...) and can print a line per
+# batch. Turn it on in the app with MCQ_UI_METRICS=1.
+#
+# HeadlessConnection lets a real ft.Page run without a Flet client, for
+# benchmarks and scripted sessions.
+
+import json
+import os
+
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientActions,
+    ClientMessage,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+def command_stats(commands):
+    """Sizes up one batch of commands: controls added, props set, controls removed, bytes."""
+    added = props = removed = 0
+    for cmd in commands:
+        if cmd.name == "add":
+            added += len(cmd.commands) + (1 if cmd.values else 0)
+        elif cmd.name == "set":
+            props += len(cmd.attrs)
+        elif cmd.name in ("remove", "clean"):
+            removed += len(cmd.values)
+    size = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")).encode("utf-8"))
+    return {"added": added, "props": props, "removed": removed, "bytes": size}
+
+
+class UpdateMeter:
+    """Records every update batch sent through a page's connection."""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.label = "init"
+        # one dict per batch: {"label", "added", "props", "removed", "bytes"}
+        self.batches = []
+
+    def begin(self, label):
+        """Starts a new transition; following batches are recorded under `label`."""
+        self.label = label
+
+    def record(self, commands):
+        stats = command_stats(commands)
+        stats["label"] = self.label
+        self.batches.append(stats)
+        if self.verbose:
+            print(f"[ui] {self.label}: {stats['added']} controls added, {stats['props']} props set, "
+                  f"{stats['removed']} removed, {stats['bytes']} bytes")
+
+    def attach(self, page):
+        """Wraps page.connection.send_commands so every batch gets recorded."""
+        conn = page.connection
+        send = conn.send_commands
+
+        def metered_send(session_id, commands):
+            self.record(commands)
+            return send(session_id, commands)
+
+        conn.send_commands = metered_send
+        return self
+
+    def summary(self):
+        """Per-label totals: {label: {"batches", "added", "props", "removed", "bytes"}}."""
+        out = {}
+        for b in self.batches:
+            s = out.setdefault(b["label"], {"batches": 0, "added": 0, "props": 0, "removed": 0, "bytes": 0})
+            s["batches"] += 1
+            for key in ("added", "props", "removed", "bytes"):
+                s[key] += b[key]
+        return out
+
+
+class NullMeter:
+    """Stand-in used when metering is off; costs one method call per transition."""
+
+    def begin(self, label):
+        pass
+
+
+def meter_from_env(page):
+    """Attaches a printing UpdateMeter when MCQ_UI_METRICS is set, else returns a NullMeter."""
+    if os.environ.get("MCQ_UI_METRICS") and getattr(page, "connection", None) is not None:
+        return UpdateMeter(verbose=True).attach(page)
+    return NullMeter()
+
+
+class HeadlessConnection(LocalConnection):
+    """A Flet connection with no client: commands are processed and the wire bytes counted."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = 0
+        self.bytes_sent = 0
+
+    def send_commands(self, session_id, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            batch = ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages)
+            self.messages += 1
+            self.bytes_sent += len(json.dumps(batch, cls=CommandEncoder, separators=(",", ":")).encode("utf-8"))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id, command):
+        r = self.send_commands(session_id, [command])
+        return PageCommandResponsePayload(result=r.results[0] if r.results else "", error="")
+
+
+def headless_page():
+    """A real ft.Page wired to a HeadlessConnection (no event loop; run_thread won't work)."""
+    import asyncio
+
+    import flet as ft
+
+    conn = HeadlessConnection()
+    page = ft.Page(conn, "headless", asyncio.new_event_loop())
+    conn.sessions["headless"] = page
+    return page
@@ -7,6 +7,14 @@ import flet as ft
 # Removed: from flet import icons # Reverting to ft.Icons
 import pandas as pd
 import io
+import os
+import sys
+
+# The repo root holds the shared `mcq` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mcq import render, store
+from mcq.question_bank import OPTION_KEYS, QuestionBank
+from mcq.quiz_session import QuizSession
 
 # --- 1. MOCK DATA (Replace with actual Excel reading) ---
 
@@ -55,23 +63,39 @@ def load_questions_from_excel(filepath=None):
         }
         questions.append(q)
         
-    return questions
+    return QuestionBank.from_questions(questions)
 
 # --- 2. FLET APPLICATION CLASS ---
 
 class McqQuiz(ft.Control):    
     def __init__(self, questions):
         super().__init__()
-        self.questions = questions
-        self.current_q_index = 0
-        self.score = 0
+        # Position and score live in a UI-free QuizSession that the handlers drive
+        self.session = QuizSession(questions)
+        self.session.start()
         # FIX: Removed ft.Ref for RadioGroup. We will store the instance directly.
         self.radio_options = None 
+        # The four option radios are reused for every question; only their
+        # labels change, so an update sends a property patch, not a new subtree.
+        self.option_radios = [
+            ft.Radio(value=key, label="", fill_color=ft.Colors.INDIGO_ACCENT_700)
+            for key in OPTION_KEYS
+        ]
         
         # We keep the Refs for other controls that are created in build()
         self.feedback_message = ft.Ref[ft.Text]()
         self.score_display = ft.Ref[ft.Text]()
         self.check_button = ft.Ref[ft.ElevatedButton]()
+
+        # Handlers touch() what they change; each click is sent as one update
+        # of just those controls, and double clicks are dropped
+        self.render = render.renderer_for()
+        self._check_answer_clicked = self.render.click("check")(self._check_answer_clicked)
+        self._next_question_clicked = self.render.click("next")(self._next_question_clicked)
+        self._restart_quiz = self.render.click("restart")(self._restart_quiz)
+
+    def did_mount(self):
+        self.render.page = self.page
     
     # This method MUST be overridden to return the control's name
     def _get_control_name(self) -> str:
@@ -83,7 +107,7 @@ class McqQuiz(ft.Control):
     def build(self):
         # 1. Question Text Display
         self.question_text = ft.Text(
-            self.questions[self.current_q_index]["question"], 
+            self.session.current.text,
             size=20, 
             weight=ft.FontWeight.BOLD,
             text_align=ft.TextAlign.CENTER
@@ -92,7 +116,8 @@ class McqQuiz(ft.Control):
         # 2. Options as Radio Buttons inside a RadioGroup
         # FIX: Create the RadioGroup instance and store it directly.
         self.radio_options = ft.RadioGroup(
-            content=ft.Column()
+            content=ft.Column(list(self.option_radios)),
+            disabled=False
         )
         self._update_options_content()
 
@@ -149,26 +174,21 @@ class McqQuiz(ft.Control):
         
     def _update_options_content(self):
         """Updates the radio buttons based on the current question."""
-        current_q = self.questions[self.current_q_index]
-        option_widgets = []
+        current_q = self.session.current
         # The key (e.g., 'option A') is the `value` of the Radio button
-        for key, text in current_q["options"].items():
-            option_widgets.append(
-                ft.Radio(
-                    value=key, 
-                    label=text,
-                    fill_color=ft.Colors.INDIGO_ACCENT_700
-                )
-            )
-        # FIX: Access content directly via the instance: self.radio_options.content.controls
-        self.radio_options.content.controls = option_widgets
+        for radio, text in zip(self.option_radios, current_q.options):
+            radio.label = text
+        self.radio_options.disabled = False
+        # Put the radios back if the final score replaced them
+        if self.radio_options.content.controls != self.option_radios:
+            self.radio_options.content.controls = list(self.option_radios)
         # Reset the selection
         self.radio_options.value = None
         
     def _update_ui(self):
         """Updates all displayed elements for the current question."""
-        if self.current_q_index < len(self.questions):
-            self.question_text.value = self.questions[self.current_q_index]["question"]
+        if not self.session.finished:
+            self.question_text.value = self.session.current.text
             self._update_options_content()
             self.feedback_message.current.value = ""
             self.check_button.current.text = "Check Answer"
@@ -180,7 +200,7 @@ class McqQuiz(ft.Control):
             self.question_text.value = "Quiz Complete! 🎉"
             # FIX: Access content directly via the instance: self.radio_options.content.controls
             self.radio_options.content.controls = [
-                ft.Text(f"Final Score: {self.score} out of {len(self.questions)}", size=24)
+                ft.Text(f"Final Score: {self.session.score} out of {len(self.session.questions)}", size=24)
             ]
             self.actions.controls = [
                 ft.ElevatedButton(
@@ -193,11 +213,12 @@ class McqQuiz(ft.Control):
             self.feedback_message.current.value = ""
             
         self._update_score_display()
-        self.update()
+        self.render.touch(self)
 
     def _update_score_display(self):
         """Updates the score text in the top corner."""
-        self.score_display.current.value = f"Question {self.current_q_index + 1}/{len(self.questions)} | Score: {self.score}"
+        session = self.session
+        self.score_display.current.value = f"Question {session.pos + 1}/{len(session.questions)} | Score: {session.score}"
         
     def _check_answer_clicked(self, e):
         """Handles the 'Check Answer' button click."""
@@ -205,21 +226,21 @@ class McqQuiz(ft.Control):
         if not self.radio_options.value:
             self.feedback_message.current.value = "Please select an option first."
             self.feedback_message.current.color = ft.Colors.AMBER_600
-            self.update()
+            self.render.touch(self.feedback_message.current)
             return
             
         # FIX: Access value directly via the instance: self.radio_options.value
-        selected_key = self.radio_options.value
-        correct_answer_key = self.questions[self.current_q_index]["answer"]
-        
-        is_correct = selected_key == correct_answer_key
-        
+        current_q = self.session.current
+        self.session.select(self.radio_options.value)
+        is_correct = self.session.check()
+        if is_correct is None:
+            return
+
         if is_correct:
-            self.score += 1
             self.feedback_message.current.value = "✅ Correct! Well done."
             self.feedback_message.current.color = ft.Colors.GREEN_700
         else:
-            correct_option_text = self.questions[self.current_q_index]["options"][correct_answer_key]
+            correct_option_text = current_q.correct_text
             self.feedback_message.current.value = f"❌ Incorrect. The correct answer was: {correct_option_text}"
             self.feedback_message.current.color = ft.Colors.RED_700
             
@@ -229,23 +250,21 @@ class McqQuiz(ft.Control):
         self.check_button.current.icon = ft.Icons.ARROW_FORWARD
         self.check_button.current.on_click = self._next_question_clicked
         self._disable_options() # Prevent changing the answer after checking
-        self.update()
+        self.render.touch(self.feedback_message.current, self.check_button.current, self.radio_options)
 
     def _disable_options(self):
         """Disables all radio buttons after checking the answer."""
-        # FIX: Access content directly via the instance: self.radio_options.content.controls
-        for radio in self.radio_options.content.controls:
-            radio.disabled = True
+        # disabled is inherited, so one flag on the group covers all four radios
+        self.radio_options.disabled = True
         
     def _next_question_clicked(self, e):
         """Handles the 'Next Question' button click."""
-        self.current_q_index += 1
-        self._update_ui()
+        if self.session.next() is not None:
+            self._update_ui()
 
     def _restart_quiz(self, e):
         """Resets the quiz state and starts from the beginning."""
-        self.current_q_index = 0
-        self.score = 0
+        self.session.restart()
         # Re-initialize action buttons for the restart
         self.actions.controls = [
             ft.ElevatedButton(
@@ -270,7 +289,13 @@ def main(page: ft.Page):
 
     # Load questions (try to replace 'quiz.xlsx' with your actual file path)
     # If the file path is provided, it attempts to load it. Otherwise, it uses mock data.
-    questions = load_questions_from_excel(filepath=FILE_PATH) 
+    # With MCQ_STORE set, a bank imported with `python -m mcq.store import` is
+    # read from the database page by page instead.
+    questions = None
+    if store.ENABLED:
+        questions = store.shared_store().bank(os.path.splitext(os.path.basename(FILE_PATH))[0])
+    if questions is None:
+        questions = load_questions_from_excel(filepath=FILE_PATH) 
     print(questions)
 
     if not questions:
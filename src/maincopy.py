@@ -6,6 +6,12 @@ import pandas as pd
 import io
 import requests
 import gspread
+import os
+import sys
+
+# The repo root holds the shared `mcq` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mcq.question_bank import QuestionBank
 FILE_PATH = "src/MCQ/mcq_algae.ods"
 
 # --- 1. MOCK DATA & DATA LOADING ---
@@ -93,7 +99,7 @@ def load_questions_from_excel(filepath=None):
         }
         questions.append(q)
         
-    return questions
+    return QuestionBank.from_questions(questions)
 
 # --- 2. MAIN APPLICATION FUNCTION (Functional Style) ---
 
@@ -134,7 +140,7 @@ def main(page: ft.Page):
         option_widgets = []
         
         # The key (e.g., 'option A') is the `value` of the Radio button
-        for key, text in current_q["options"].items():
+        for key, text in current_q.option_items():
             option_widgets.append(
                 ft.Radio(
                     value=key, 
@@ -166,7 +172,7 @@ def main(page: ft.Page):
             return
             
         selected_key = radio_options.value
-        correct_answer_key = questions[current_q_index]["answer"]
+        correct_answer_key = questions[current_q_index].answer
         
         is_correct = selected_key == correct_answer_key
         
@@ -175,7 +181,7 @@ def main(page: ft.Page):
             feedback_message.current.value = "✅ Correct! Well done."
             feedback_message.current.color = ft.Colors.GREEN_700
         else:
-            correct_option_text = questions[current_q_index]["options"][correct_answer_key]
+            correct_option_text = questions[current_q_index].correct_text
             feedback_message.current.value = f"❌ Incorrect. The correct answer was: {correct_option_text}"
             feedback_message.current.color = ft.Colors.RED_700
             
@@ -203,7 +209,7 @@ def main(page: ft.Page):
     def _update_ui():
         """Updates all displayed elements for the current question or finishes the quiz."""
         if current_q_index < len(questions):
-            question_text.current.value = questions[current_q_index]["question"]
+            question_text.current.value = questions[current_q_index].text
             _update_options_content()
             feedback_message.current.value = ""
             
@@ -242,7 +248,7 @@ def main(page: ft.Page):
     
     # Initial control creation
     initial_question_text = ft.Text(
-        questions[0]["question"], 
+        questions[0].text, 
         size=20, 
         weight=ft.FontWeight.BOLD,
         text_align=ft.TextAlign.CENTER,
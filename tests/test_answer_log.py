@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+import pytest
+
+from mcq import answer_log
+from mcq.stub_server import StubBankServer
+
+
+@pytest.fixture
+def server():
+    with StubBankServer() as server:
+        yield server
+
+
+def _log(tmp_path, server, **kwargs):
+    kwargs.setdefault("flush_seconds", 3600)
+    kwargs.setdefault("timeout", (2, 5))
+    return answer_log.AnswerLog(str(tmp_path / "answers.jsonl"), "device-1", server.url, **kwargs)
+
+
+def _record(log, qns):
+    for qn in qns:
+        log.record("Fungi", qn, "option A", qn % 2 == 0, 1500.0)
+
+
+def _posts(server):
+    return [r for r in server.requests if r["params"].get("action") == "answers"]
+
+
+def _wait_for(condition, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_uploads_in_batches_and_truncates(tmp_path, server):
+    log = _log(tmp_path, server, batch_size=3)
+    _record(log, range(1, 8))
+    log.flush()
+    assert log.upload_pending() == 7
+    assert len(_posts(server)) == 3
+    assert [a["qn"] for a in server.answers] == list(range(1, 8))
+    assert os.path.getsize(log.path) == 0 and log._read_cursor() == 0
+
+
+def test_worker_retries_with_backoff_while_the_server_is_down(tmp_path, server, monkeypatch):
+    monkeypatch.setattr(answer_log, "BACKOFF_BASE", 0.05)
+    server.fail_posts = 3
+    log = _log(tmp_path, server, flush_seconds=0.01)
+    _record(log, [1, 2])
+    before = time.monotonic()
+    log.start()
+    _wait_for(lambda: len(server.answers) == 2)
+    log.stop()
+    assert log.stats["upload_failures"] == 3 and log.stats["uploads"] == 1
+    # 0.05 * (1 + 2 + 4) s of backoff, each cut by at most half for jitter
+    assert time.monotonic() - before >= 0.05 * 7 / 2
+    assert log._failures == 0
+
+
+def test_backoff_doubles_per_failure(tmp_path, server):
+    server.fail_posts = 2
+    log = _log(tmp_path, server)
+    _record(log, [1])
+    log.flush()
+    waits = []
+    for _ in range(2):
+        assert log.upload_pending() == 0
+        waits.append(log._retry_at - time.monotonic())
+    assert answer_log.BACKOFF_BASE / 2 - 0.1 <= waits[0] <= answer_log.BACKOFF_BASE
+    assert answer_log.BACKOFF_BASE - 0.1 <= waits[1] <= answer_log.BACKOFF_BASE * 2
+    assert log.upload_pending() == 1
+
+
+def test_restart_resumes_from_the_journal(tmp_path, server, monkeypatch):
+    accept = server.accept_answers
+    calls = []
+
+    def one_then_down(params, body):
+        calls.append(1)
+        return accept(params, body) if len(calls) == 1 else (503, {"error": "unavailable"})
+
+    monkeypatch.setattr(server, "accept_answers", one_then_down)
+    first = _log(tmp_path, server, batch_size=2)
+    _record(first, range(1, 6))
+    first.stop()
+    assert first.upload_pending() == 2
+    assert first._read_cursor() > 0
+
+    monkeypatch.setattr(server, "accept_answers", accept)
+    restarted = _log(tmp_path, server, batch_size=2)
+    assert restarted.upload_pending() == 3
+    assert [a["qn"] for a in server.answers] == [1, 2, 3, 4, 5]
+
+
+def test_no_duplicates_when_the_cursor_write_is_lost(tmp_path, server, monkeypatch):
+    log = _log(tmp_path, server, batch_size=2)
+    _record(log, range(1, 5))
+    log.flush()
+    write_cursor = log._write_cursor
+    lost = []
+
+    def crash_once(offset):
+        if not lost:
+            lost.append(offset)
+            raise OSError("disk full")
+        write_cursor(offset)
+
+    monkeypatch.setattr(log, "_write_cursor", crash_once)
+    with pytest.raises(OSError):
+        log.upload_pending()
+    assert log._read_cursor() == 0
+    assert log.upload_pending() == 4
+    ids = [a["id"] for a in server.answers]
+    assert len(ids) == len(set(ids)) == 4
+    assert len(_posts(server)) == 3   # the first batch went twice
+
+
+@pytest.mark.parametrize("answer", [
+    (200, {"ok": False, "error": "quota"}),
+    (200, b"<!DOCTYPE html><html><body>Script error</body></html>"),
+    (200, ["ok"]),
+])
+def test_only_an_ok_body_counts_as_accepted(tmp_path, server, monkeypatch, answer):
+    monkeypatch.setattr(server, "accept_answers", lambda params, body: answer)
+    log = _log(tmp_path, server)
+    _record(log, [1, 2])
+    log.flush()
+    assert log.upload_pending() == 0
+    assert log.stats == {"uploads": 0, "upload_failures": 1, "records_uploaded": 0}
+    assert log._read_cursor() == 0 and log._failures == 1
+
+
+def test_flush_waits_for_the_drained_check(tmp_path, server):
+    log = _log(tmp_path, server)
+    _record(log, [1])
+    log.flush()
+    log.upload_pending()
+    _record(log, [2])
+    with log._file_lock:
+        # a flush now would land between the size check and the truncate
+        flusher = threading.Thread(target=log.flush)
+        flusher.start()
+        flusher.join(0.05)
+        assert flusher.is_alive()
+    flusher.join()
+    log.upload_pending()
+    assert [a["qn"] for a in server.answers] == [1, 2]
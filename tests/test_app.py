@@ -0,0 +1,73 @@
+import contextlib
+import io
+import time
+
+import pytest
+
+from mcq import bank_cache, exam_timer, instrument, item_stats, render, ui_metrics
+from mcq.registry import REGISTRY
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(bank_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "get_system_uuid", lambda: "test-device")
+    monkeypatch.setattr(item_stats, "ENABLED", False)
+    monkeypatch.setattr(REGISTRY, "refresh_in_background", lambda *args, **kwargs: None)
+    monkeypatch.setattr(REGISTRY, "schedule_refresh", lambda *args, **kwargs: None)
+    return main
+
+
+def _start(app):
+    page = ui_metrics.headless_page()
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.main(page)
+    column = page.controls[0].content
+    return page, column.controls[1].controls[0], column.controls[5]
+
+
+def _wait_for(condition, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_timed_out_question_moves_on_right_after_a_click(app, monkeypatch):
+    monkeypatch.setattr(exam_timer, "ENABLED", True)
+    monkeypatch.setattr(exam_timer, "QUESTION_SECONDS", 0.2)
+    monkeypatch.setattr(exam_timer, "FEEDBACK_SECONDS", 0.1)
+    # any click in the last 10 s would drop a debounced "next"
+    monkeypatch.setattr(render, "DEBOUNCE_SECONDS", 10.0)
+    page, question, actions = _start(app)
+    first = question.value
+
+    _wait_for(lambda: actions.controls[0].text.startswith("Next"))
+    actions.controls[0].on_click(None)   # the user moves on from the timed-out question
+    second = question.value
+    assert second != first
+
+    # the second question times out too; the clock moves on without a click
+    _wait_for(lambda: question.value not in (first, second))
+    page.on_close(None)
+
+
+def test_timings_overlay_is_sent_with_each_update(app, monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "OVERLAY", True)
+    monkeypatch.setattr(instrument, "_histograms", {})
+    monkeypatch.setattr(instrument, "_counters", {})
+    page, question, actions = _start(app)
+    overlay = page.overlay[-1].content
+    sent = []
+    send = page.connection.send_commands
+    monkeypatch.setattr(page.connection, "send_commands",
+                        lambda session_id, commands: sent.extend(commands) or send(session_id, commands))
+
+    actions.controls[0].on_click(None)   # "Check" with nothing selected: only the feedback changes
+    values = [cmd.attrs["value"] for cmd in sent
+              if cmd.name == "set" and overlay.uid in cmd.values and "value" in cmd.attrs]
+    assert values and "ui.check" in values[-1]
+    page.on_close(None)
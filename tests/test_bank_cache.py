@@ -0,0 +1,43 @@
+import os
+import threading
+
+from mcq import answer_log, bank_cache, item_stats, scheduler, search, sync
+
+
+def test_debounced_saver_coalesces_a_burst():
+    saved = threading.Event()
+    calls = []
+
+    def save():
+        calls.append(1)
+        saved.set()
+
+    saver = bank_cache.DebouncedSaver(save)
+    for _ in range(50):
+        saver.soon(0.05)
+    assert saved.wait(5)
+    assert calls == [1]
+    saved.clear()
+    saver.soon(0.01)
+    assert saved.wait(5) and calls == [1, 1]
+
+
+def test_review_state_saves_after_a_grade(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "SAVE_DELAY", 0.01)
+    path = str(tmp_path / "review.bank")
+    state = scheduler.ReviewState("Fungi", path)
+    saved = threading.Event()
+    save = state.save
+    state._saver = bank_cache.DebouncedSaver(lambda: (save(), saved.set()))
+    state.grade(7, True, now=1000.0)
+    assert saved.wait(5)
+    assert scheduler.ReviewState.load("Fungi", path).row_of(7) == 0
+
+
+def test_state_files_share_one_safe_name(tmp_path):
+    assert bank_cache.safe_name("Algae / Fungi: 2.ods") == "Algae___Fungi__2_ods"
+    assert bank_cache.safe_name(42) == "42"
+    names = [os.path.basename(fn("Algae/1", str(tmp_path))) for fn in (
+        sync.copy_path_for, search.index_path_for, answer_log.log_path_for,
+        item_stats.stats_path_for, scheduler.state_path_for)]
+    assert all("Algae_1" in name and "/" not in name for name in names)
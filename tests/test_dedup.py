@@ -0,0 +1,44 @@
+from mcq import dedup, loaders
+
+HEADER = ["QN", "Question", "A", "B", "C", "D", "Answer"]
+QUESTIONS = {
+    1: ("Which pigment gives red algae their red colour in deep water?",
+        ["phycoerythrin", "chlorophyll b", "fucoxanthin", "carotene"]),
+    2: ("Which structure anchors a kelp to the rocky sea floor?",
+        ["holdfast", "stipe", "blade", "air bladder"]),
+    # QN 1 with its options shuffled
+    3: ("Which pigment gives red algae their red colour in deep water?",
+        ["carotene", "fucoxanthin", "phycoerythrin", "chlorophyll b"]),
+    4: ("What do fungi store their excess carbohydrate as?",
+        ["glycogen", "starch", "cellulose", "sucrose"]),
+    # QN 1 reworded a little
+    5: ("Which pigment gives red algae their red color in deep water?",
+        ["phycoerythrin", "chlorophyll b", "fucoxanthin", "carotene"]),
+}
+
+
+def _bank(qns):
+    return loaders.questions_from_payload(
+        [HEADER] + [[qn, QUESTIONS[qn][0], *QUESTIONS[qn][1], "A"] for qn in qns]
+    )
+
+
+def test_finds_near_duplicates_across_banks():
+    clusters = dedup.find_duplicates([("one", _bank([1, 2, 3])), ("two", _bank([4, 5, 2]))])
+    members = [c["members"] for c in clusters]
+    assert members == [
+        [("one", 0, 1), ("one", 2, 3), ("two", 1, 5)],
+        [("one", 1, 2), ("two", 2, 2)],
+    ]
+    assert 0.8 <= clusters[0]["similarity"] < 1.0
+    assert clusters[1]["similarity"] == 1.0
+
+
+def test_drop_duplicates_keeps_the_first_question():
+    bank = _bank([4, 1, 2, 3, 5])
+    kept, clusters = dedup.drop_duplicates(bank)
+    assert kept.qns() == [4, 1, 2]
+    assert len(clusters) == 1
+
+    distinct = _bank([1, 2, 4])
+    assert dedup.drop_duplicates(distinct) == (distinct, [])
@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+import pytest
+
+from mcq import grading, loaders, simulator
+from mcq.grading import BLANK, INVALID, AnswerSheets
+from mcq.quiz_session import QuizSession
+
+HEADER = ["QN", "Question", "A", "B", "C", "D", "Answer"]
+
+
+@pytest.fixture
+def bank():
+    # QN 1-4 answered B, C, D, A
+    return loaders.questions_from_payload(
+        [HEADER] + [[qn, f"Question {qn}?", "a", "b", "c", "d", "ABCD"[qn % 4]] for qn in range(1, 5)]
+    )
+
+
+def test_sheets_are_encoded_in_bank_order(bank):
+    text = "Student,3,1,99,2\ns1,d,option B,A,\ns2,AB,E\n"
+    sheets = AnswerSheets.from_csv(bank, text)
+    assert sheets.students == ["s1", "s2"]
+    assert sheets.unknown_qns == ["99"]
+    assert sheets.responses.tolist() == [
+        [1, BLANK, 3, BLANK],
+        [INVALID, BLANK, INVALID, BLANK],
+    ]
+
+    as_json = AnswerSheets.from_json(bank, {"s1": {"3": "d", "1": "option B", "99": "A"}, "s2": "  AB"})
+    assert as_json.responses.tolist() == [
+        [1, BLANK, 3, BLANK],
+        [BLANK, BLANK, 0, 1],
+    ]
+
+
+def test_key_and_credit_table(bank):
+    assert grading.encode_key(bank).tolist() == [1, 2, 3, 0]
+    table = grading.credit_table(bank, wrong=-0.25, blank=0.0, partial={"2": {"b": 0.5}})
+    assert table.shape == (4, 6)
+    assert table[0].tolist() == [-0.25, 1.0, -0.25, -0.25, 0.0, -0.25]
+    assert table[1].tolist() == [-0.25, 0.5, 1.0, -0.25, 0.0, -0.25]
+    with pytest.raises(ValueError):
+        grading.credit_table(bank, partial={"99": {"A": 1}})
+
+
+def test_negative_marking_and_partial_credit(bank):
+    sheets = AnswerSheets.from_json(bank, {
+        "all right": "BCDA",
+        "two wrong": "BBDB",    # QN 2 gets half marks for B
+        "blank": "",
+        "invalid": {"1": "AB", "2": "C"},
+    })
+    results = grading.grade(bank, sheets, wrong=-0.25, partial={"2": {"B": 0.5}})
+    assert results["raw"].tolist() == [4, 2, 0, 1]
+    assert results["scores"].tolist() == [4.0, 2.25, 0.0, 0.75]
+    assert results["answered"].tolist() == [4, 4, 0, 2]
+    assert results["p_correct"].tolist() == [0.5, 0.5, 0.5, 0.25]
+    assert results["choices"][1].tolist() == [0, 1, 2, 0, 1, 0]
+    assert results["choices"][0].tolist() == [0, 2, 0, 0, 1, 1]
+
+
+def test_agrees_with_grading_one_answer_at_a_time():
+    bank = simulator.synthetic_bank(40)
+    rng = random.Random(3)
+    letters = {f"s{i}": "".join(rng.choice("ABCD ") for _ in range(len(bank))) for i in range(25)}
+    results = grading.grade(bank, AnswerSheets.from_json(bank, letters))
+
+    for student, raw, right in zip(results["students"], results["raw"], results["correct"]):
+        session = QuizSession(bank)
+        session.start()
+        checked = []
+        for letter in letters[student]:
+            session.select("ABCD".index(letter) if letter != " " else None)
+            checked.append(session.check(timed_out=True))
+            session.next()
+        assert session.score == raw
+        assert checked == right.tolist()
+    assert np.array_equal(results["scores"], results["raw"])
@@ -0,0 +1,87 @@
+import math
+import random
+
+import pytest
+
+from mcq import bank_cache, item_stats
+from mcq.item_stats import ItemStats
+
+
+def _answers(stats, qn, answers):
+    """`answers` is a list of (choice, ability); "A" is the right answer."""
+    for choice, ability in answers:
+        stats.observe(qn, choice, choice == "A", ability)
+
+
+def test_p_value_and_point_biserial():
+    stats = ItemStats("Fungi")
+    _answers(stats, 1, [("B", 0.2), ("C", 0.4), ("A", 0.6), ("A", 0.8)])
+    item = stats.item(1)
+    assert item["attempts"] == 4 and item["p_value"] == 0.5 and item["answer"] == "A"
+    # right answers average 0.7, wrong ones 0.3; abilities have variance 0.05
+    assert item["discrimination"] == pytest.approx(0.4 / math.sqrt(0.05) * 0.5)
+    assert item["options"]["A"] == {"picks": 2, "share": 0.5, "mean_ability": pytest.approx(0.7)}
+    assert item["options"]["D"] == {"picks": 0, "share": 0.0, "mean_ability": None}
+    assert item["flags"] == []   # too few attempts
+    assert stats.item(2) is None
+
+    _answers(stats, 2, [("A", 0.5), ("B", 0.5)])
+    assert stats.item(2)["discrimination"] is None   # every answerer equally able
+
+
+def test_flags_need_enough_attempts(monkeypatch):
+    monkeypatch.setattr(item_stats, "MIN_ATTEMPTS", 10)
+    stats = ItemStats("Fungi")
+    # 10 of 10 right: too easy, and no discrimination to speak of
+    _answers(stats, 1, [("A", 0.1 * i) for i in range(10)])
+    # 2 of 10 right, by the weakest students
+    _answers(stats, 2, [("A", 0.1), ("A", 0.2)] + [("C", 0.5 + 0.05 * i) for i in range(8)])
+    # answered right by the strong half, the weak half spread over B-D
+    _answers(stats, 3, [("A", 0.6 + 0.05 * i) for i in range(5)] + [("BCDBC"[i], 0.1 * i) for i in range(5)])
+    # B is picked more than the keyed answer and most wrong answers go to it
+    _answers(stats, 4, [("A", 0.9), ("A", 0.8), ("A", 0.7), ("A", 0.6)] + [("B", 0.2)] * 5 + [("C", 0.3), ("D", 0.4)])
+
+    assert stats.item(1)["flags"] == ["too easy"]
+    assert stats.item(2)["flags"] == ["too hard", "low discrimination", "misleading distractor C"]
+    assert stats.item(3)["flags"] == []
+    assert stats.item(4)["flags"] == ["misleading distractor B"]
+    assert [i["qn"] for i in stats.report(flagged_only=True)] == [1, 2, 4]
+
+
+def test_merge_is_the_same_as_observing_everything_in_one_place():
+    rng = random.Random(5)
+    answers = [(rng.randrange(1, 6), rng.choice("ABCD "), rng.random()) for _ in range(300)]
+    whole, first, second = ItemStats("Fungi"), ItemStats("Fungi"), ItemStats("Fungi")
+    for i, (qn, choice, ability) in enumerate(answers):
+        for stats in (whole, first if i % 3 else second):
+            stats.observe(qn, choice.strip(), choice == "A", ability)
+
+    merged = first.merge(second)
+    for qn in range(1, 6):
+        a, b = merged.item(qn), whole.item(qn)
+        assert (a["attempts"], a["answer"]) == (b["attempts"], b["answer"])
+        assert a["p_value"] == b["p_value"] and a["flags"] == b["flags"]
+        assert a["discrimination"] == pytest.approx(b["discrimination"])
+        for letter in item_stats.OPTIONS:
+            assert a["options"][letter]["picks"] == b["options"][letter]["picks"]
+            assert a["options"][letter]["mean_ability"] == pytest.approx(b["options"][letter]["mean_ability"])
+
+
+def test_saved_stats_load_back_and_bad_files_start_empty(tmp_path):
+    path = str(tmp_path / "items.Fungi.bank")
+    stats = ItemStats("Fungi", path)
+    _answers(stats, 7, [("B", 0.2), ("A", 0.6), ("A", 0.8)])
+    _answers(stats, 9, [("C", 0.5)])
+    assert stats.save() == 2
+
+    loaded = ItemStats.load("Fungi", path)
+    assert loaded.report() == stats.report()
+    assert len(ItemStats.load("Algae", path)) == 0          # another bank's file
+
+    # right key, but the arrays don't line up with the qns
+    bank_cache.write_cache(path, stats._key(), ([7, 9], b"\0" * 4))
+    assert len(ItemStats.load("Fungi", path)) == 0
+    with open(path, "wb") as f:
+        f.write(b"not a stats file")
+    assert len(ItemStats.load("Fungi", path)) == 0
+    assert len(ItemStats.load("Fungi", str(tmp_path / "missing.bank"))) == 0
@@ -0,0 +1,132 @@
+from mcq import quiz, scheduler, simulator, store
+from mcq.question_bank import OPTION_KEYS
+from mcq.quiz_session import ANSWERED, FINISHED, QUESTION, QuizSession
+
+
+def _bank(n=10):
+    return simulator.synthetic_bank(n)
+
+
+def test_round_scores_and_finishes():
+    bank = _bank()
+    session = QuizSession(bank)
+    events = []
+    session.subscribe(lambda event, s: events.append(event))
+    session.start()
+    for pos, right in enumerate(bank.answer_indices()):
+        assert session.phase == QUESTION and session.pos == pos
+        session.select(right if pos % 2 == 0 else (right + 1) % 4)
+        assert session.check() is (pos % 2 == 0)
+        assert session.phase == ANSWERED
+        session.next()
+    assert session.phase == FINISHED
+    assert session.score == 5
+    assert events.count("checked") == 10 and events[-1] == "finished"
+
+
+def test_check_needs_a_choice_unless_timed_out():
+    session = QuizSession(_bank())
+    session.start()
+    assert session.check() is None
+    assert session.phase == QUESTION
+    assert session.check(timed_out=True) is False
+    assert session.choice(0) is None
+    assert session.next() == 1
+
+
+def test_radio_values_and_given_key_agree():
+    questions = quiz.generate(_bank(200), 20, seed=3)
+    with_key = QuizSession(questions, key=questions.answer_indices())
+    without = QuizSession(questions)
+    for session in (with_key, without):
+        session.start()
+        while not session.finished:
+            session.select(OPTION_KEYS[session.pos % 4])
+            session.check()
+            session.next()
+    assert with_key.score == without.score
+    assert with_key.chosen() == without.chosen()
+
+
+def test_state_round_trips():
+    bank = _bank()
+    session = QuizSession(bank)
+    session.start()
+    session.select(2)
+    session.check()
+    saved = session.state()
+    other = QuizSession(bank)
+    other.restore(saved)
+    assert other.state() == saved
+    assert other.choice(0) == 2
+
+
+def test_replace_bank_keeps_answers_by_qn():
+    bank = _bank()
+    session = QuizSession(bank)
+    session.start()
+    session.select(1)
+    session.check()
+    reversed_bank = bank.take(range(len(bank) - 1, -1, -1))
+    session.next(reversed_bank, 3)
+    assert session.pos == 3
+    assert session.choice(len(bank) - 1) == 1
+
+
+def test_session_on_a_large_store_does_not_read_the_table(tmp_path):
+    n = 20_000
+    db = store.QuestionStore(str(tmp_path / "questions.db"))
+    db.upsert_bank("big", _bank(n))
+    stored = db.bank("big")
+    queries = []
+    db._conn.set_trace_callback(queries.append)
+
+    session = QuizSession(stored)
+    session.start()
+    session.select(0)
+    session.check()
+    session.next()
+    # a page of PAGE_ROWS questions at most, never the whole table
+    assert len(queries) <= 2
+
+    queries.clear()
+    assert stored.answer_indices() == _bank(n).answer_indices()
+    assert len(queries) == 1
+    db.close()
+
+
+def test_upcoming_is_the_question_next_shows():
+    questions = quiz.generate(_bank(200), 5, seed=1)
+    session = QuizSession(questions)
+    session.start()
+    assert session.upcoming() == 1
+    session.jump(4)
+    assert session.upcoming() is None
+
+    order = scheduler.Scheduler(scheduler.ReviewState("sim"), questions)
+    spaced = QuizSession(questions, order=order)
+    spaced.start()
+    assert spaced.upcoming() is None   # a wrong answer could bring this question back
+    spaced.select((spaced.current.answer_index + 1) % 4)
+    spaced.check()
+    upcoming = spaced.upcoming()
+    assert upcoming is not None
+    assert spaced.next() == upcoming
+
+
+def test_sessions_sharing_a_state_keep_each_others_grades():
+    questions = _bank(3)
+    state = scheduler.ReviewState("sim")
+    mine, other = scheduler.Scheduler(state, questions), scheduler.Scheduler(state, questions)
+    now = 1000.0
+    mine.grade(0, False, now)
+    # the other session re-grades it, then answers one this session has not seen
+    other.grade(0, True, now)
+    other.grade(1, False, now)
+    later = now + 2 * scheduler.DAY
+    assert mine.next_position(later) == 1
+    mine.grade(1, True, later)
+    assert mine.next_position(later) == 0
+    mine.grade(0, True, later)
+    assert mine.next_position(later) == 2
+    assert len(mine._heap) == 2
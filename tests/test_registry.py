@@ -0,0 +1,30 @@
+from mcq import registry
+from mcq.registry import BankRegistry
+
+
+def test_failed_fetch_backs_off_before_new_sessions_retry(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(registry.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(registry, "REFRESH_SECONDS", 900.0)
+    reg = BankRegistry()
+    results = [None, None, "bank"]
+
+    def fetch():
+        return results.pop(0)
+
+    def session_arrives():
+        thread = reg.refresh_in_background("b", fetch)
+        if thread is not None:
+            thread.join()
+        return thread is not None
+
+    assert session_arrives()            # fails
+    assert not session_arrives()        # backing off
+    clock[0] += registry.FAILURE_BACKOFF
+    assert session_arrives()            # fails again: the wait doubles
+    clock[0] += registry.FAILURE_BACKOFF
+    assert not session_arrives()
+    clock[0] += registry.FAILURE_BACKOFF
+    assert session_arrives()
+    assert reg.peek("b") == "bank" and not reg.is_backing_off("b")
+    assert reg.counts[("fetch", "b")] == 3
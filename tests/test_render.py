@@ -0,0 +1,50 @@
+import types
+
+from mcq import render, simulator
+from mcq.review_list import ReviewList
+
+
+def _clicks(renderer, label, log):
+    return renderer.click(label)(lambda e: log.append(label))
+
+
+def test_double_click_on_one_button_is_dropped():
+    renderer = render.RenderScheduler(debounce=10.0)
+    log = []
+    check, next_ = _clicks(renderer, "check", log), _clicks(renderer, "next", log)
+    button = types.SimpleNamespace(control=object())
+    check(button)
+    next_(button)   # the same button, relabelled "Next Question"
+    assert log == ["check"]
+    assert renderer.stats["next"]["dropped"] == 1
+
+
+def test_other_buttons_are_not_held_up():
+    renderer = render.RenderScheduler(debounce=10.0)
+    log = []
+    check, search = _clicks(renderer, "check", log), _clicks(renderer, "search", log)
+    check(types.SimpleNamespace(control=object()))
+    search(types.SimpleNamespace(control=object()))
+    search(None)    # called without an event: keyed by its label
+    check(None)
+    assert log == ["check", "search", "search", "check"]
+
+
+def test_stale_click_times_are_forgotten():
+    renderer = render.RenderScheduler(debounce=0.0)
+    click = renderer.click("x")(lambda e: None)
+    for _ in range(render._MAX_CLICK_KEYS * 3):
+        click(types.SimpleNamespace(control=object()))
+    assert len(renderer._last_click) <= render._MAX_CLICK_KEYS + 1
+    assert not renderer._clicking
+
+
+def test_review_page_turn_goes_through_the_renderer():
+    touched = []
+    renderer = types.SimpleNamespace(touch=lambda *controls: touched.append(controls))
+    review = ReviewList(page_rows=5, renderer=renderer)
+    review.list_view.scroll_to = lambda **kwargs: None
+    review.show(simulator.synthetic_bank(12), {})
+    review.turn(1)
+    assert touched == [(review.control,)]
+    assert review.status.value == "6-10 of 12"
@@ -0,0 +1,101 @@
+from mcq import loaders, search
+
+HEADER = ["QN", "Question", "A", "B", "C", "D", "Answer"]
+
+
+def _bank(questions):
+    """`questions` maps qn -> (text, options)."""
+    return loaders.questions_from_payload(
+        [HEADER] + [[qn, text, *options, "A"] for qn, (text, options) in questions.items()]
+    )
+
+
+QUESTIONS = {
+    1: ("Where in the cell is chlorophyll found?", ["chloroplast", "nucleus", "vacuole", "cell wall"]),
+    2: ("Which pigment absorbs red light?", ["chlorophyll", "xanthophyll", "melanin", "keratin"]),
+    3: ("What do fungi store carbohydrate as?", ["glycogen", "starch", "cellulose", "sucrose"]),
+    4: ("What is the cell wall of fungi made of?", ["chitin", "cellulose", "pectin", "lignin"]),
+}
+
+
+def _qns(results):
+    return [qn for qn, _ in results]
+
+
+def test_tokenize_folds_case_and_splits_on_punctuation():
+    assert search.tokenize("Chlorophyll-a, CO2 & Straße!") == ["chlorophyll", "a", "co2", "straße".casefold()]
+    assert search.tokenize(" ?! ") == []
+
+
+def test_every_word_matches_and_the_last_one_as_a_prefix():
+    index = search.SearchIndex()
+    index.update(_bank(QUESTIONS))
+    assert _qns(index.search("fungi")) == [3, 4]
+    assert _qns(index.search("fungi cellulose")) == [3, 4]
+    assert _qns(index.search("fungi chitin")) == [4]
+    assert index.search("fungi melanin") == []
+    assert _qns(index.search("chloro")) == [1, 2]
+    # too short for a prefix, or ended with a space: whole words only
+    assert index.search("ch") == []
+    assert index.search("chloro ") == []
+    assert index.search("") == [] and index.search("?") == []
+
+
+def test_question_words_outrank_option_words():
+    index = search.SearchIndex()
+    index.update(_bank(QUESTIONS))
+    # "chlorophyll" is in the question of 1 and an option of 2
+    (first, high), (second, low) = index.search("chlorophyll")
+    assert (first, second) == (1, 2) and high == 2 * low
+    # same weight in question 3, but the rarer word scores higher
+    assert dict(index.search("glycogen"))[3] > dict(index.search("cellulose"))[3]
+    assert _qns(index.search("fungi", limit=1)) == [3]   # a tie goes to the earlier question
+
+
+def test_update_only_reindexes_what_changed():
+    index = search.SearchIndex()
+    bank = _bank(QUESTIONS)
+    assert index.update(bank) == (4, 0)
+    assert index.update(bank) == (0, 0)
+
+    changed = dict(QUESTIONS)
+    changed[2] = ("Which pigment absorbs blue light?", QUESTIONS[2][1])
+    del changed[3]
+    changed[5] = ("What do diatoms build their shells from?", ["silica", "chitin", "calcite", "keratin"])
+    assert index.update(_bank(changed)) == (2, 1)
+    assert len(index) == 4
+    assert index.search("red") == [] and _qns(index.search("blue")) == [2]
+    assert _qns(index.search("glycogen")) == []
+    assert _qns(index.search("chitin")) == [4, 5]
+    assert index._dead == 0   # half the old documents were dead: compacted
+
+
+def test_saved_index_loads_without_reindexing(tmp_path):
+    path = str(tmp_path / "search.bank")
+    index = search.SearchIndex()
+    index.update(_bank(QUESTIONS))
+    index.save(path)
+
+    loaded = search.SearchIndex.load(path)
+    assert len(loaded) == 4
+    assert loaded.search("chloro") == index.search("chloro")
+    assert loaded.update(_bank(QUESTIONS)) == (0, 0)
+
+    with open(path, "r+b") as f:
+        f.seek(-4, 2)
+        f.write(b"\0\0\0\0")
+    assert len(search.SearchIndex.load(path)) == 0
+    assert len(search.SearchIndex.load(str(tmp_path / "missing.bank"))) == 0
+
+
+def test_background_updates_end_on_the_last_bank(tmp_path):
+    index = search.shared_index("Fungi", str(tmp_path))
+    first = search.update_in_background(index, _bank(QUESTIONS))
+    last = _bank({3: QUESTIONS[3]})
+    second = search.update_in_background(index, last)
+    for thread in (first, second):
+        if thread is not None:
+            thread.join()
+    assert index._indexed is last and len(index) == 1
+    assert len(search.SearchIndex.load(index.path)) == 1
+    assert search.update_in_background(index, last) is None
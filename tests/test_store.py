@@ -0,0 +1,67 @@
+import sqlite3
+
+from mcq import search, simulator, store
+
+
+def _store(tmp_path, n):
+    db = store.QuestionStore(str(tmp_path / "questions.db"))
+    db.upsert_bank("big", simulator.synthetic_bank(n))
+    return db
+
+
+def test_search_index_streams_a_stored_bank(tmp_path, monkeypatch):
+    n = 5_000
+    db = _store(tmp_path, n)
+    stored = db.bank("big")
+
+    def no_compact(self):
+        raise AssertionError("the whole bank was loaded")
+
+    monkeypatch.setattr(store.StoredBank, "compact", no_compact)
+    queries = []
+    db._conn.set_trace_callback(queries.append)
+    index = search.SearchIndex()
+    assert index.update(stored) == (n, 0)
+    assert all("LIMIT" in q for q in queries)
+    assert len(queries) == n // store.STREAM_ROWS + 1
+
+    in_memory = search.SearchIndex()
+    in_memory.update(simulator.synthetic_bank(n))
+    assert index.search("question 1234") == in_memory.search("question 1234")
+    db.close()
+
+
+def _sheet(levels):
+    header = ["QN", "Question", "A", "B", "C", "D", "Answer", "Difficulty"]
+    return header, [[str(i + 1), f"Q{i + 1}?", "a", "b", "c", "d", "A", level] for i, level in enumerate(levels)]
+
+
+def test_difficulty_is_kept_as_text(tmp_path):
+    db = store.QuestionStore(str(tmp_path / "questions.db"))
+    db.import_rows("sheet", *_sheet(["Hard", "3", "03", "Easy"]))
+    stored = db.bank("sheet")
+    assert db._query("SELECT qn, difficulty FROM questions ORDER BY qn") == [
+        (1, "Hard"), (2, "3"), (3, "03"), (4, "Easy")]
+    assert [q.qn for q in db.random_unseen(stored, 10, difficulty="Hard")] == [1]
+    assert [q.qn for q in db.random_unseen(stored, 10, difficulty="3")] == [2]
+    assert db.count("sheet", difficulty=3) == 1
+    db.close()
+
+
+def test_version_1_file_is_migrated(tmp_path):
+    path = str(tmp_path / "questions.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(store._SCHEMA.replace("difficulty TEXT", "difficulty INTEGER"))
+    conn.execute("INSERT INTO questions VALUES ('old', 1, 0, 'Q?', 'a', 'b', 'c', 'd', 2, '', 't', 3, 5.0)")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    db = store.QuestionStore(path)
+    columns = {r[1]: r[2] for r in db._query("PRAGMA table_info(questions)")}
+    assert columns["difficulty"] == "TEXT"
+    assert db._query("SELECT qn, topic, difficulty, last_seen FROM questions") == [(1, "t", "3", 5.0)]
+    assert db.bank("old")[0].answer_index == 2
+    assert {r[1] for r in db._query("PRAGMA index_list(questions)")} >= {
+        "questions_pos", "questions_topic", "questions_difficulty", "questions_unseen"}
+    db.close()
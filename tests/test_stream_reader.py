@@ -0,0 +1,82 @@
+import threading
+from xml.etree.ElementTree import iterparse
+
+import pytest
+
+from benchmarks.synthetic import make_rows, write_ods, write_xlsx
+from mcq import bank_cache, loaders, stream_reader
+from mcq.registry import BankRegistry
+
+WRITERS = {"ods": write_ods, "xlsx": write_xlsx}
+
+
+@pytest.fixture(params=sorted(WRITERS))
+def sheet(request, tmp_path):
+    rows = make_rows(2000)
+    path = str(tmp_path / f"bank.{request.param}")
+    WRITERS[request.param](path, rows)
+    return path, rows
+
+
+def test_rows_are_detached_once_read(sheet, monkeypatch):
+    path, rows = sheet
+    row_tag = stream_reader._ODS_TABLE + "table-row" if path.endswith(".ods") else stream_reader._XLSX_MAIN + "row"
+    roots, ended = [], set()
+
+    def capturing(source, events=None):
+        for i, (event, elem) in enumerate(iterparse(source, events)):
+            if i == 0 and event == "start":
+                roots.append(elem)
+            if event == "end" and elem.tag == row_tag:
+                ended.add(elem)
+            yield event, elem
+
+    monkeypatch.setattr(stream_reader, "iterparse", capturing)
+    read, left_behind = [], 0
+    for row in stream_reader.iter_rows(path):
+        read.append([str(v) for v in row])
+        # only rows the parser read ahead may be in the tree, none already handed out
+        left_behind += sum(1 for e in roots[-1].iter(row_tag) if e in ended)
+    assert read == [[str(v) for v in r] for r in rows]
+    assert left_behind == 0
+
+
+def test_progressive_load_returns_the_first_questions(sheet, tmp_path):
+    path, rows = sheet
+    done = threading.Event()
+    whole = []
+
+    def on_complete(bank):
+        whole.append(bank)
+        done.set()
+
+    first = loaders.load_spreadsheet_progressively(path, on_complete, str(tmp_path))
+    assert loaders.FIRST_QUESTIONS <= len(first) < len(rows) - 1
+    assert done.wait(10)
+    assert whole[0].compact() == stream_reader.read_questions(path).compact()
+    assert first.qns() == whole[0].qns()[:len(first)]
+
+    # the whole bank was cached: the next load is complete at once
+    again = loaders.load_spreadsheet_progressively(path, pytest.fail, str(tmp_path))
+    assert again.compact() == whole[0].compact()
+    assert bank_cache.is_fresh(path, str(tmp_path))
+
+
+def test_a_short_sheet_is_read_in_one_go(tmp_path):
+    path = str(tmp_path / "short.ods")
+    write_ods(path, make_rows(5))
+    assert len(loaders.load_spreadsheet_progressively(path, pytest.fail, str(tmp_path))) == 5
+    assert bank_cache.is_fresh(path, str(tmp_path))
+
+
+def test_complete_never_replaces_a_fetched_bank():
+    registry = BankRegistry()
+    seen = []
+    registry.subscribe("b", seen.append)
+    assert registry.get("b", lambda: "first") == "first"
+    assert registry.complete("b", "whole")
+    assert registry.peek("b") == "whole" and registry.is_stale("b")
+    registry.publish("b", "fetched")
+    assert not registry.complete("b", "whole again")
+    assert registry.peek("b") == "fetched"
+    assert seen == ["whole", "fetched"]
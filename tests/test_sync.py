@@ -0,0 +1,88 @@
+import pytest
+
+from mcq import loaders, sync
+from mcq.stub_server import StubBankServer
+
+HEADER = ["QN", "Question", "A", "B", "C", "D", "Answer"]
+TIMEOUT = (2, 5)
+
+
+def _rows(qns):
+    return [HEADER] + [[qn, f"Question {qn}?", "a", "b", "c", "d", "ABCD"[qn % 4]] for qn in qns]
+
+
+def _bank(rows):
+    return loaders.questions_from_payload(rows).compact()
+
+
+@pytest.fixture
+def server():
+    with StubBankServer({"Fungi": _rows(range(1, 6))}) as server:
+        yield server
+
+
+def _sync(server, tmp_path):
+    questions, status = sync.sync_bank("me", "Fungi", server.url, TIMEOUT, cache_dir=str(tmp_path))
+    return (questions.compact() if questions is not None else None), status
+
+
+def test_not_modified_body_and_304(server, tmp_path):
+    assert _sync(server, tmp_path) == (_bank(server.rows("Fungi")), "full")
+    assert _sync(server, tmp_path) == (_bank(server.rows("Fungi")), "not-modified")
+    assert server.requests[-1]["status"] == 200
+
+    server.use_304 = True
+    assert _sync(server, tmp_path) == (_bank(server.rows("Fungi")), "not-modified")
+    assert server.requests[-1]["status"] == 304 and server.requests[-1]["bytes"] == 0
+    assert len(server.requests) == 3
+
+
+def test_delta_updates_the_local_copy(server, tmp_path):
+    _sync(server, tmp_path)
+    rows = _rows([1, 2, 4, 5, 6])
+    rows[2][1] = "Question 2, reworded?"
+    server.set_rows("Fungi", rows)
+
+    assert _sync(server, tmp_path) == (_bank(rows), "delta")
+    assert len(server.requests) == 2
+    assert server.requests[-1]["params"]["version"] == "1"
+    copy = sync.load_local_copy("Fungi", str(tmp_path))
+    assert copy["version"] == 2 and copy["rows"] == rows
+
+
+def test_delta_with_wrong_hash_falls_back_to_full_download(server, tmp_path):
+    _sync(server, tmp_path)
+    rows = _rows(range(1, 8))
+    server.set_rows("Fungi", rows)
+    respond = server.respond
+
+    def corrupt(params):
+        status, body = respond(params)
+        if "delta" in body:
+            body["hash"] = "0" * 64
+        return status, body
+
+    server.respond = corrupt
+    assert _sync(server, tmp_path) == (_bank(rows), "full")
+    delta, full = server.requests[1:]
+    assert "version" in delta["params"] and "version" not in full["params"]
+    assert sync.load_local_copy("Fungi", str(tmp_path))["rows"] == rows
+
+
+@pytest.mark.parametrize("legacy", [True, "list"])
+def test_legacy_server_always_sends_the_whole_bank(server, tmp_path, legacy):
+    server.legacy = legacy
+    assert _sync(server, tmp_path) == (_bank(server.rows("Fungi")), "full")
+    assert _sync(server, tmp_path) == (_bank(server.rows("Fungi")), "full")
+    copy = sync.load_local_copy("Fungi", str(tmp_path))
+    assert copy["version"] is None and copy["rows"] == server.rows("Fungi")
+
+
+def test_network_failure_keeps_the_local_copy(server, tmp_path):
+    _sync(server, tmp_path)
+    before = sync.load_local_copy("Fungi", str(tmp_path))
+    server.stop()
+
+    assert _sync(server, tmp_path) == (None, "failed")
+    assert sync.load_local_copy("Fungi", str(tmp_path)) == before
+    assert sync.load_local_questions("Fungi", str(tmp_path)).compact() == _bank(before["rows"])